@@ -0,0 +1,120 @@
+"""
+Microbenchmark for define_tool per-call overhead.
+
+Measures how long a define_tool handler takes to turn an invocation into a call
+of the tool function, for 0-, 1- and 2-parameter tools. The "legacy" rows use a
+copy of the previous handler, which re-checked the parameter type and called
+model_validate() on every call; the other rows use each validation mode of the
+current implementation. Tools run inline so executor overhead is excluded.
+
+Usage:
+    python benchmarks/bench_tool_invocation.py [--calls N]
+"""
+
+import argparse
+import asyncio
+import inspect
+import os
+import sys
+import time
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from copilot import ToolInvocation, define_tool  # noqa: E402
+from copilot.tools import _is_pydantic_model, _normalize_result  # noqa: E402
+
+
+class Params(BaseModel):
+    query: str
+    limit: int = 10
+
+
+class LargeParams(BaseModel):
+    items: list[dict[str, int]]
+
+
+def zero_params() -> str:
+    return "ok"
+
+
+def one_param(params: Params) -> str:
+    return "ok"
+
+
+def two_params(params: Params, invocation: ToolInvocation) -> str:
+    return "ok"
+
+
+def large_param(params: LargeParams) -> str:
+    return "ok"
+
+
+def legacy_handler(fn: Callable[..., Any]) -> Callable[[ToolInvocation], Any]:
+    """The per-call argument handling used before invokers were precompiled."""
+    param_names = list(inspect.signature(fn).parameters)
+    takes_params = len(param_names) >= 1
+    takes_invocation = len(param_names) >= 2
+    ptype = (LargeParams if fn is large_param else Params) if takes_params else None
+
+    async def wrapped_handler(invocation: ToolInvocation) -> Any:
+        call_args = []
+        if takes_params:
+            args = invocation["arguments"] or {}
+            if ptype is not None and _is_pydantic_model(ptype):
+                call_args.append(ptype.model_validate(args))
+            else:
+                call_args.append(args)
+        if takes_invocation:
+            call_args.append(invocation)
+        result = fn(*call_args)
+        if inspect.isawaitable(result):
+            result = await result
+        return _normalize_result(result)
+
+    return wrapped_handler
+
+
+async def measure(
+    handler: Callable[[ToolInvocation], Any], arguments: dict[str, Any], calls: int
+) -> float:
+    invocation: ToolInvocation = {
+        "session_id": "session",
+        "tool_call_id": "call",
+        "tool_name": "bench",
+        "arguments": arguments,
+    }
+    for _ in range(1000):
+        await handler(invocation)
+    started = time.perf_counter()
+    for _ in range(calls):
+        await handler(invocation)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+async def main(calls: int) -> None:
+    small = {"query": "copilot", "limit": 5}
+    large = {"items": [{"id": i, "score": i * 2} for i in range(500)]}
+    cases = (
+        ("0 params", zero_params, small, calls),
+        ("1 param", one_param, small, calls),
+        ("2 params", two_params, small, calls),
+        ("1 large", large_param, large, max(1, calls // 100)),
+    )
+    print(f"{'tool':<12}{'variant':<10}{'us/call':>10}")
+    for label, fn, arguments, count in cases:
+        variants = {"legacy": legacy_handler(fn)}
+        for mode in ("fast", "strict", "none"):
+            tool = define_tool("bench", description="", executor="inline", validate=mode)(fn)
+            variants[mode] = tool.handler
+        for variant, handler in variants.items():
+            elapsed = await measure(handler, arguments, count)
+            print(f"{label:<12}{variant:<10}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=100_000)
+    asyncio.run(main(parser.parse_args().calls))
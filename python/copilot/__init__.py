@@ -4,8 +4,32 @@ Copilot SDK - Python Client for GitHub Copilot CLI
 JSON-RPC based SDK for programmatic control of GitHub Copilot CLI
 """
 
+from .batch import SessionBatchResult
+from .broadcast import PromptMap, PromptMapStats, PromptResult
+from .cancellation import ToolCancellationToken, ToolCancelledError
 from .client import CopilotClient
+from .eviction import SessionGauges
+from .fleet import FleetCounts, FleetRun, Subagent
+from .journal import EventJournal
+from .metrics import (
+    MetricsSink,
+    OpenTelemetrySink,
+    ToolCallSample,
+    ToolExecutionStats,
+    ToolMetrics,
+    ToolMetricsSnapshot,
+)
+from .pool import SessionPool, SessionPoolStats
+from .rpc_cache import CachedSessionRpc, RpcCacheStats
+from .scheduling import ToolQueueStats
+from .server_cache import ServerCacheStats
 from .session import CopilotSession
+from .session_index import SessionIndex, SessionIndexStats
+from .streaming import MessageAssembler
+from .templates import SessionTemplate
+from .tool_cache import ToolCacheStats
+from .tool_progress import ToolProgress
+from .tool_registry import ToolRegistry, ToolSet
 from .tools import define_tool
 from .types import (
     AzureProviderOptions,
@@ -27,6 +51,7 @@ from .types import (
     PingResponse,
     ProviderConfig,
     ResumeSessionConfig,
+    ServerCacheOptions,
     SessionConfig,
     SessionContext,
     SessionEvent,
@@ -34,44 +59,91 @@ from .types import (
     SessionMetadata,
     StopError,
     Tool,
+    ToolCachePolicy,
+    ToolExecutor,
     ToolHandler,
     ToolInvocation,
     ToolResult,
+    ToolResultPolicy,
+    WorkerPoolOptions,
 )
+from .workers import WorkerPool, WorkerPoolStats
+from .workspace import SessionWorkspace, WorkspaceChunk, WorkspaceSyncResult
 
 __version__ = "0.1.0"
 
 __all__ = [
     "AzureProviderOptions",
+    "CachedSessionRpc",
     "CopilotClient",
     "CopilotSession",
     "ConnectionState",
     "CustomAgentConfig",
+    "EventJournal",
+    "FleetCounts",
+    "FleetRun",
     "GetAuthStatusResponse",
     "GetStatusResponse",
     "MCPLocalServerConfig",
     "MCPRemoteServerConfig",
     "MCPServerConfig",
+    "MessageAssembler",
     "MessageOptions",
+    "MetricsSink",
     "ModelBilling",
     "ModelCapabilities",
     "ModelInfo",
     "ModelPolicy",
+    "OpenTelemetrySink",
     "PermissionHandler",
     "PermissionRequest",
     "PermissionRequestResult",
     "PingResponse",
+    "PromptMap",
+    "PromptMapStats",
+    "PromptResult",
     "ProviderConfig",
     "ResumeSessionConfig",
+    "RpcCacheStats",
+    "ServerCacheOptions",
+    "ServerCacheStats",
+    "SessionBatchResult",
     "SessionConfig",
     "SessionContext",
     "SessionEvent",
+    "SessionGauges",
+    "SessionIndex",
+    "SessionIndexStats",
     "SessionListFilter",
     "SessionMetadata",
+    "SessionPool",
+    "SessionPoolStats",
+    "SessionTemplate",
+    "SessionWorkspace",
     "StopError",
+    "Subagent",
     "Tool",
+    "ToolCachePolicy",
+    "ToolCacheStats",
+    "ToolCallSample",
+    "ToolCancellationToken",
+    "ToolCancelledError",
+    "ToolExecutionStats",
+    "ToolExecutor",
     "ToolHandler",
     "ToolInvocation",
+    "ToolMetrics",
+    "ToolMetricsSnapshot",
+    "ToolProgress",
+    "ToolQueueStats",
+    "ToolRegistry",
     "ToolResult",
+    "ToolResultPolicy",
+    "ToolSet",
+    "WorkerPool",
+    "WorkerPoolOptions",
+    "WorkerPoolStats",
+    "WorkspaceChunk",
+    "WorkspaceSyncResult",
     "define_tool",
 ]
@@ -0,0 +1,62 @@
+"""
+Bulk session operations for the Copilot SDK.
+
+This module provides :class:`SessionBatchResult`, the per-item result of
+:meth:`CopilotClient.create_sessions`, :meth:`CopilotClient.resume_sessions`
+and :meth:`CopilotClient.delete_sessions`. Those methods pipeline their
+requests over the client's single connection, so a batch takes about as long
+as its slowest request rather than the sum of all of them.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Sequence
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
+from .session import CopilotSession
+
+T = TypeVar("T")
+
+
+@dataclass
+class SessionBatchResult:
+    """The outcome of one item of a bulk session operation."""
+
+    index: int  # Position of the item in the request
+    session_id: Optional[str]  # None if a created session failed before getting an ID
+    session: Optional[CopilotSession] = None  # The created or resumed session
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item succeeded."""
+        return self.error is None
+
+
+async def run_batch(
+    items: Sequence[T],
+    operation: Callable[[T], Awaitable[Optional[CopilotSession]]],
+    item_session_id: Callable[[T], Optional[str]],
+    concurrency: int,
+) -> list[SessionBatchResult]:
+    """
+    Run ``operation`` on every item with at most ``concurrency`` in flight.
+
+    Returns:
+        One result per item, in the order of ``items``. Errors are captured per
+        item rather than raised.
+    """
+    if concurrency <= 0:
+        raise ValueError("concurrency must be positive")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(index: int, item: T) -> SessionBatchResult:
+        async with semaphore:
+            try:
+                session = await operation(item)
+            except Exception as e:
+                return SessionBatchResult(index, item_session_id(item), error=e)
+        session_id = session.session_id if session is not None else item_session_id(item)
+        return SessionBatchResult(index, session_id, session)
+
+    return list(await asyncio.gather(*(run(i, item) for i, item in enumerate(items))))
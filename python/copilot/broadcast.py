@@ -0,0 +1,274 @@
+"""
+Sending one prompt to many sessions.
+
+This module provides :class:`PromptMap`, returned by
+:meth:`CopilotClient.map_prompt`. It sends a prompt to a list of sessions, or
+to sessions it creates from configurations, with bounded concurrency, per-item
+timeouts and an overall deadline, and yields each answer as soon as it arrives.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from .generated.session_events import SessionEvent, SessionEventType
+from .metrics import TIME_BUCKETS, Histogram
+from .session import CopilotSession
+from .templates import SessionTemplate
+from .types import MessageOptions, SessionConfig
+
+if TYPE_CHECKING:
+    from .client import CopilotClient
+
+PromptTarget = Union[CopilotSession, SessionConfig, SessionTemplate]
+
+
+@dataclass
+class PromptResult:
+    """The answer of one session to a mapped prompt."""
+
+    index: int  # Position of the target in the list passed to map_prompt
+    session_id: Optional[str]  # None if the session could not be created
+    message: Optional[SessionEvent] = None  # The last assistant.message event
+    error: Optional[Exception] = None
+    timed_out: bool = False
+    elapsed: float = 0.0  # Seconds from sending the prompt to the answer
+
+    @property
+    def content(self) -> Optional[str]:
+        """The text of the last assistant message."""
+        return self.message.data.content if self.message is not None else None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the session answered without error or timeout."""
+        return self.error is None
+
+
+@dataclass
+class PromptMapStats:
+    """Counters and latency figures for a :class:`PromptMap`."""
+
+    items: int = 0
+    completed: int = 0
+    failed: int = 0  # Items that raised or reported a session error
+    timed_out: int = 0  # Items that exceeded item_timeout or the deadline
+    sessions_created: int = 0
+    elapsed: float = 0.0  # Seconds since iteration started, until it ended
+    latency: Histogram = field(default_factory=lambda: Histogram(TIME_BUCKETS))
+
+    @property
+    def throughput(self) -> float:
+        """Answers received per second."""
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+
+class PromptMap:
+    """
+    A prompt sent to many sessions, iterated as the answers arrive.
+
+    Iterating starts the work; results are yielded in completion order. Leaving
+    the iteration early stops sending and aborts the prompts still running.
+
+    Example:
+        >>> configs = [{"model": "gpt-5", "working_directory": repo} for repo in repos]
+        >>> async for result in client.map_prompt(configs, "Summarize recent changes",
+        ...                                       concurrency=16, item_timeout=300):
+        ...     print(repos[result.index], result.content if result.ok else result.error)
+    """
+
+    def __init__(
+        self,
+        client: "CopilotClient",
+        targets: Sequence[PromptTarget],
+        prompt: Union[str, MessageOptions],
+        concurrency: int = 8,
+        deadline: Optional[float] = None,
+        item_timeout: Optional[float] = None,
+        destroy_created: bool = True,
+    ):
+        """
+        Prepare the prompt map. Nothing is sent until iteration starts.
+
+        Args:
+            client: The client that creates sessions for configuration targets.
+            targets: Sessions, or configurations of sessions to create.
+            prompt: The prompt, or the full message options.
+            concurrency: Items processed at the same time.
+            deadline: Seconds from the start after which items still running or
+                not started are reported as timed out.
+            item_timeout: Seconds each session may take to answer.
+            destroy_created: Destroy the sessions created from configurations
+                once they have answered.
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self._client = client
+        self._targets = list(targets)
+        self._options: MessageOptions = {"prompt": prompt} if isinstance(prompt, str) else prompt
+        self._concurrency = concurrency
+        self._deadline = deadline
+        self._item_timeout = item_timeout
+        self._destroy_created = destroy_created
+        self._stats = PromptMapStats(items=len(self._targets))
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def stats(self) -> PromptMapStats:
+        """Get a snapshot of the counters."""
+        stats = self._stats
+        elapsed = 0.0
+        if self._started is not None:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+        return PromptMapStats(
+            stats.items,
+            stats.completed,
+            stats.failed,
+            stats.timed_out,
+            stats.sessions_created,
+            elapsed,
+            stats.latency.copy(),
+        )
+
+    async def collect(self) -> list[PromptResult]:
+        """Wait for every item and return the results in the order of the targets."""
+        results = [result async for result in self]
+        return sorted(results, key=lambda result: result.index)
+
+    def __aiter__(self) -> AsyncIterator[PromptResult]:
+        return self._run()
+
+    async def _run(self) -> AsyncIterator[PromptResult]:
+        self._started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        deadline_at = None if self._deadline is None else loop.time() + self._deadline
+        pending = iter(range(len(self._targets)))
+        # Results, or an exception that stopped a worker, re-raised by the iteration
+        results: asyncio.Queue[Union[PromptResult, BaseException]] = asyncio.Queue()
+
+        async def worker() -> None:
+            try:
+                for index in pending:
+                    try:
+                        result = await self._process(index, deadline_at)
+                    except Exception as e:
+                        target = self._targets[index]
+                        result = self._finish(PromptResult(index, _session_id(target), error=e))
+                    results.put_nowait(result)
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:
+                results.put_nowait(e)
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(self._concurrency, len(self._targets)))
+        ]
+        try:
+            for _ in range(len(self._targets)):
+                item = await results.get()
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._finished = time.perf_counter()
+
+    async def _process(self, index: int, deadline_at: Optional[float]) -> PromptResult:
+        target = self._targets[index]
+        loop = asyncio.get_running_loop()
+        if deadline_at is not None and loop.time() >= deadline_at:
+            return self._finish(PromptResult(index, _session_id(target)), timed_out=True)
+
+        created = not isinstance(target, CopilotSession)
+        if isinstance(target, CopilotSession) and target._busy:
+            # Its next session.idle would end the turn already running, not this prompt's
+            error = RuntimeError(f"Session {target.session_id} is already processing a message")
+            return self._finish(PromptResult(index, target.session_id, error=error))
+        try:
+            if isinstance(target, CopilotSession):
+                session = target
+            else:
+                session = await self._client.create_session(target)
+                self._stats.sessions_created += 1
+        except Exception as e:
+            return self._finish(PromptResult(index, None, error=e))
+
+        result = PromptResult(index, session.session_id)
+        timeout = self._item_timeout
+        if deadline_at is not None:
+            remaining = max(0.0, deadline_at - loop.time())
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        waiter = _AnswerWaiter(loop.create_future())
+        unsubscribe = session.on(waiter)
+        sent = time.perf_counter()
+        timed_out = False
+        try:
+            await session.send(self._options)
+            result.message = await asyncio.wait_for(waiter.answer, timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            result.error = asyncio.TimeoutError(f"No answer from session within {timeout:g}s")
+            await _quietly(session.abort())
+        except asyncio.CancelledError:
+            await _quietly(session.abort())
+            raise
+        except Exception as e:
+            result.error = e
+        finally:
+            result.elapsed = time.perf_counter() - sent
+            unsubscribe()
+            if created and self._destroy_created:
+                await _quietly(session.destroy())
+                self._client._forget_session(session.session_id)
+        return self._finish(result, timed_out)
+
+    def _finish(self, result: PromptResult, timed_out: bool = False) -> PromptResult:
+        if timed_out:
+            result.timed_out = True
+            if result.error is None:
+                result.error = asyncio.TimeoutError("Deadline exceeded before the prompt was sent")
+            self._stats.timed_out += 1
+        elif result.error is not None:
+            self._stats.failed += 1
+        else:
+            self._stats.completed += 1
+            self._stats.latency.observe(result.elapsed)
+        return result
+
+
+class _AnswerWaiter:
+    """Session event handler resolving with the last assistant message once idle."""
+
+    __slots__ = ("answer", "message")
+
+    def __init__(self, answer: "asyncio.Future[Optional[SessionEvent]]"):
+        self.answer = answer
+        self.message: Optional[SessionEvent] = None
+
+    def __call__(self, event: SessionEvent) -> None:
+        if self.answer.done():
+            return
+        if event.type == SessionEventType.ASSISTANT_MESSAGE:
+            self.message = event
+        elif event.type == SessionEventType.SESSION_IDLE:
+            self.answer.set_result(self.message)
+        elif event.type == SessionEventType.SESSION_ERROR:
+            self.answer.set_exception(
+                Exception(f"Session error: {getattr(event.data, 'message', str(event.data))}")
+            )
+
+
+def _session_id(target: PromptTarget) -> Optional[str]:
+    return target.session_id if isinstance(target, CopilotSession) else None
+
+
+async def _quietly(coro: Any) -> None:
+    try:
+        await coro
+    except Exception:
+        pass  # Best effort: the session may already be gone
@@ -0,0 +1,73 @@
+"""
+Cooperative cancellation for tool calls.
+
+This module provides :class:`ToolCancellationToken`, which tells a running tool
+handler that its call timed out or was abandoned. Async handlers are cancelled
+directly; handlers running in a worker thread cannot be interrupted and should
+check the token instead.
+"""
+
+import threading
+from typing import Any, Optional
+
+
+class ToolCancelledError(Exception):
+    """Raised by :meth:`ToolCancellationToken.raise_if_cancelled` once the call is cancelled."""
+
+
+class ToolCancellationToken:
+    """
+    Signals that a tool call should stop.
+
+    Handlers receive a token through the ``cancellation`` key of the invocation,
+    or by declaring a parameter annotated with ``ToolCancellationToken`` when
+    using :func:`define_tool`. The token is thread-safe.
+
+    Example:
+        >>> @define_tool(description="Scan files", executor="thread", timeout=30)
+        ... def scan(params: ScanParams, cancellation: ToolCancellationToken) -> str:
+        ...     for path in params.paths:
+        ...         cancellation.raise_if_cancelled()
+        ...         scan_file(path)
+        ...     return "ok"
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the call has been cancelled."""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Mark the call as cancelled."""
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raise if the call has been cancelled.
+
+        Raises:
+            ToolCancelledError: If the call has been cancelled.
+        """
+        if self._event.is_set():
+            raise ToolCancelledError("Tool call was cancelled")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the call is cancelled or ``timeout`` seconds pass.
+
+        Useful as an interruptible ``time.sleep`` in thread-pool handlers.
+
+        Returns:
+            True if the call was cancelled.
+        """
+        return self._event.wait(timeout)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Cancellation cannot reach a worker process; it receives a detached token
+        return {}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._event = threading.Event()
@@ -13,30 +13,51 @@ Example:
 """
 
 import asyncio
+import hashlib
+import heapq
 import inspect
 import os
 import re
+import shutil
 import subprocess
 import sys
 import threading
+import time
+import weakref
+from collections.abc import Mapping, Sequence
 from dataclasses import asdict, is_dataclass
 from pathlib import Path
-from typing import Any, Callable, Optional, cast
-
-from .generated.rpc import ServerRpc
+from typing import Any, Callable, Optional, Union, cast
+
+from .batch import SessionBatchResult, run_batch
+from .broadcast import PromptMap, PromptTarget
+from .cancellation import ToolCancellationToken
+from .eviction import SessionGauges, estimate_session_size
+from .executors import ToolExecutors, _current_call, _ToolCall
+from .generated.rpc import AccountGetQuotaResult, ServerRpc
 from .generated.session_events import session_event_from_dict
+from .journal import EventJournal
 from .jsonrpc import JsonRpcClient, ProcessExitedError
+from .metrics import MetricsSink, ToolCallSample, ToolExecutionStats, ToolMetrics
+from .scheduling import ToolQueueFullError, ToolQueueStats, ToolScheduler
 from .sdk_protocol_version import get_sdk_protocol_version
+from .server_cache import ServerCacheStats, _ServerCache
 from .session import CopilotSession
+from .session_index import SessionIndex
+from .templates import SessionTemplate
+from .tool_cache import ToolCacheStats, ToolResultCache
+from .tool_progress import ToolProgress
+from .tool_registry import ToolRegistry
+from .tool_results import apply_result_policy, result_size
+from .tools import _collect_streamed_output
 from .types import (
     ConnectionState,
     CopilotClientOptions,
-    CustomAgentConfig,
     GetAuthStatusResponse,
     GetStatusResponse,
+    MessageOptions,
     ModelInfo,
     PingResponse,
-    ProviderConfig,
     ResumeSessionConfig,
     SessionConfig,
     SessionLifecycleEvent,
@@ -45,11 +66,16 @@ from .types import (
     SessionListFilter,
     SessionMetadata,
     StopError,
+    Tool,
+    ToolExecutor,
     ToolHandler,
     ToolInvocation,
     ToolResult,
 )
 
+# Environment variables the CLI reads a GitHub token from, in order of precedence
+_TOKEN_ENV_VARS = ("COPILOT_GITHUB_TOKEN", "GH_TOKEN", "GITHUB_TOKEN")
+
 
 def _get_bundled_cli_path() -> Optional[str]:
     """Get the path to the bundled CLI binary, if available."""
@@ -193,20 +219,61 @@ class CopilotClient:
             self.options["env"] = opts["env"]
         if github_token:
             self.options["github_token"] = github_token
+        if opts.get("journal_dir"):
+            self.options["journal_dir"] = opts["journal_dir"]
+        self.options["tool_executor"] = opts.get("tool_executor", "thread")
+        if opts.get("tool_max_workers"):
+            self.options["tool_max_workers"] = opts["tool_max_workers"]
+        if opts.get("tool_worker_pool"):
+            self.options["tool_worker_pool"] = opts["tool_worker_pool"]
+        if opts.get("tool_timeout"):
+            self.options["tool_timeout"] = opts["tool_timeout"]
+        if opts.get("tool_result_policy"):
+            self.options["tool_result_policy"] = opts["tool_result_policy"]
+        if opts.get("session_idle_ttl"):
+            self.options["session_idle_ttl"] = opts["session_idle_ttl"]
+        if opts.get("max_sessions"):
+            self.options["max_sessions"] = opts["max_sessions"]
+        if opts.get("destroy_evicted"):
+            self.options["destroy_evicted"] = opts["destroy_evicted"]
+        if opts.get("server_cache"):
+            self.options["server_cache"] = opts["server_cache"]
 
         self._process: Optional[subprocess.Popen] = None
         self._client: Optional[JsonRpcClient] = None
         self._state: ConnectionState = "disconnected"
         self._sessions: dict[str, CopilotSession] = {}
         self._sessions_lock = threading.Lock()
-        self._models_cache: Optional[list[ModelInfo]] = None
-        self._models_cache_lock = asyncio.Lock()
+        # Evicted sessions still referenced by the application, for re-hydration
+        self._evicted_sessions: weakref.WeakValueDictionary[str, CopilotSession] = (
+            weakref.WeakValueDictionary()
+        )
+        self._session_gauges = SessionGauges()
+        self._eviction_sweeper: Optional[asyncio.Task[None]] = None
+        self._session_index: Optional[SessionIndex] = None
+        server_cache = self.options.get("server_cache", {})
+        self._server_cache = _ServerCache(
+            server_cache, *(self._server_cache_keys() if server_cache.get("disk_dir") else ())
+        )
         self._lifecycle_handlers: list[SessionLifecycleHandler] = []
         self._typed_lifecycle_handlers: dict[
             SessionLifecycleEventType, list[SessionLifecycleHandler]
         ] = {}
         self._lifecycle_handlers_lock = threading.Lock()
         self._rpc: Optional[ServerRpc] = None
+        self._tool_executors = ToolExecutors(
+            self.options["tool_executor"],
+            self.options.get("tool_max_workers"),
+            self.options.get("tool_worker_pool"),
+        )
+        self._tool_scheduler = ToolScheduler()
+        self.tool_registry = ToolRegistry()
+        self.tool_metrics = ToolMetrics()
+        self._metrics_sinks: list[MetricsSink] = [
+            self.tool_metrics,
+            *opts.get("tool_metrics_sinks", []),
+        ]
+        self._tool_cache = ToolResultCache()
 
     @property
     def rpc(self) -> ServerRpc:
@@ -311,15 +378,32 @@ class CopilotClient:
                         ) from e
             raise
 
-    async def stop(self) -> list["StopError"]:
+    async def stop(
+        self,
+        *,
+        timeout: Optional[float] = None,
+        concurrency: int = 16,
+        destroy_sessions: bool = True,
+    ) -> list["StopError"]:
         """
         Stop the CLI server and close all active sessions.
 
         This method performs graceful cleanup:
-        1. Destroys all active sessions
+        1. Destroys all active sessions, up to ``concurrency`` at a time
         2. Closes the JSON-RPC connection
         3. Terminates the CLI server process (if spawned by this client)
 
+        If ``timeout`` expires before cleanup finishes, the remaining steps are
+        skipped and :meth:`force_stop` is used instead; sessions that were not
+        destroyed in time are reported as errors.
+
+        Args:
+            timeout: Seconds the whole shutdown may take (default: no limit).
+            concurrency: Sessions destroyed at the same time.
+            destroy_sessions: Destroy sessions on the server. Set to False when the
+                server is about to be terminated anyway; local session state is
+                still released.
+
         Returns:
             A list of StopError objects containing error messages that occurred
             during cleanup. An empty list indicates all cleanup succeeded.
@@ -329,49 +413,107 @@ class CopilotClient:
             >>> if errors:
             ...     for error in errors:
             ...         print(f"Cleanup error: {error.message}")
+            >>>
+            >>> # Within a container's termination grace period
+            >>> errors = await client.stop(timeout=20, concurrency=64)
         """
         errors: list[StopError] = []
+        loop = asyncio.get_running_loop()
+        deadline_at = None if timeout is None else loop.time() + timeout
+
+        def remaining() -> Optional[float]:
+            return None if deadline_at is None else max(0.0, deadline_at - loop.time())
+
+        self._stop_eviction_sweeper()
+        self._close_session_index()
 
         # Atomically take ownership of all sessions and clear the dict
         # so no other thread can access them
         with self._sessions_lock:
             sessions_to_destroy = list(self._sessions.values())
             self._sessions.clear()
+            self._evicted_sessions.clear()
 
-        for session in sessions_to_destroy:
-            try:
-                await session.destroy()
-            except Exception as e:
-                errors.append(
-                    StopError(message=f"Failed to destroy session {session.session_id}: {e}")
-                )
+        if destroy_sessions:
+            errors.extend(
+                await self._destroy_sessions(sessions_to_destroy, concurrency, remaining())
+            )
+        else:
+            await asyncio.gather(*(session._close_journal() for session in sessions_to_destroy))
+
+        if remaining() == 0:
+            errors.append(StopError(message=f"Shutdown did not finish within {timeout:g}s"))
+            await self.force_stop()
+            return errors
 
         # Close client
         if self._client:
-            await self._client.stop()
+            try:
+                await asyncio.wait_for(self._client.stop(), remaining())
+            except asyncio.TimeoutError:
+                errors.append(StopError(message="Timed out closing the connection"))
+                await self.force_stop()
+                return errors
             self._client = None
         self._rpc = None
 
-        # Clear models cache
-        async with self._models_cache_lock:
-            self._models_cache = None
+        # Clear the in-memory server read cache; the on-disk cache is kept
+        self._server_cache.clear()
 
         # Kill CLI process
         # Kill CLI process (only if we spawned it)
         if self._process and not self._is_external_server:
             self._process.terminate()
+            grace = remaining()
             try:
-                self._process.wait(timeout=5)
+                self._process.wait(timeout=5 if grace is None else min(5, grace))
             except subprocess.TimeoutExpired:
                 self._process.kill()
             self._process = None
 
+        self._tool_executors.shutdown()
+
         self._state = "disconnected"
         if not self._is_external_server:
             self._actual_port = None
 
         return errors
 
+    async def _destroy_sessions(
+        self, sessions: list[CopilotSession], concurrency: int, timeout: Optional[float]
+    ) -> list["StopError"]:
+        """
+        Destroy sessions concurrently, giving up on those not done within ``timeout``.
+
+        Note:
+            This method is internal.
+        """
+        errors: list[StopError] = []
+        if not sessions:
+            return errors
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def destroy(session: CopilotSession) -> None:
+            async with semaphore:
+                try:
+                    await session.destroy()
+                except Exception as e:
+                    errors.append(
+                        StopError(message=f"Failed to destroy session {session.session_id}: {e}")
+                    )
+
+        tasks = {asyncio.ensure_future(destroy(session)): session for session in sessions}
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+            errors.append(
+                StopError(message=f"Timed out destroying session {tasks[task].session_id}")
+            )
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            await asyncio.gather(*(tasks[task]._close_journal() for task in pending))
+        return errors
+
     async def force_stop(self) -> None:
         """
         Forcefully stop the CLI server without graceful cleanup.
@@ -388,9 +530,14 @@ class CopilotClient:
             ... except asyncio.TimeoutError:
             ...     await client.force_stop()
         """
+        self._stop_eviction_sweeper()
+        self._close_session_index()
+
         # Clear sessions immediately without trying to destroy them
         with self._sessions_lock:
+            sessions = list(self._sessions.values())
             self._sessions.clear()
+        await asyncio.gather(*(session._close_journal() for session in sessions))
 
         # Force close connection
         if self._client:
@@ -401,20 +548,23 @@ class CopilotClient:
             self._client = None
         self._rpc = None
 
-        # Clear models cache
-        async with self._models_cache_lock:
-            self._models_cache = None
+        # Clear the in-memory server read cache; the on-disk cache is kept
+        self._server_cache.clear()
 
         # Kill CLI process immediately
         if self._process and not self._is_external_server:
             self._process.kill()
             self._process = None
 
+        self._tool_executors.shutdown()
+
         self._state = "disconnected"
         if not self._is_external_server:
             self._actual_port = None
 
-    async def create_session(self, config: Optional[SessionConfig] = None) -> CopilotSession:
+    async def create_session(
+        self, config: Optional[Union[SessionConfig, SessionTemplate]] = None
+    ) -> CopilotSession:
         """
         Create a new conversation session with the Copilot CLI.
 
@@ -424,7 +574,8 @@ class CopilotClient:
 
         Args:
             config: Optional configuration for the session, including model selection,
-                custom tools, system messages, and more.
+                custom tools, system messages, and more. A :class:`SessionTemplate`
+                may be passed instead to reuse a precompiled configuration.
 
         Returns:
             A :class:`CopilotSession` instance for the new session.
@@ -442,145 +593,24 @@ class CopilotClient:
             ...     "streaming": True
             ... })
         """
-        if not self._client:
-            if self.options["auto_start"]:
-                await self.start()
-            else:
-                raise RuntimeError("Client not connected. Call start() first.")
-
-        cfg = config or {}
-
-        tool_defs = []
-        tools = cfg.get("tools")
-        if tools:
-            for tool in tools:
-                definition = {
-                    "name": tool.name,
-                    "description": tool.description,
-                }
-                if tool.parameters:
-                    definition["parameters"] = tool.parameters
-                tool_defs.append(definition)
-
-        payload: dict[str, Any] = {}
-        if cfg.get("model"):
-            payload["model"] = cfg["model"]
-        if cfg.get("session_id"):
-            payload["sessionId"] = cfg["session_id"]
-        if cfg.get("client_name"):
-            payload["clientName"] = cfg["client_name"]
-        if cfg.get("reasoning_effort"):
-            payload["reasoningEffort"] = cfg["reasoning_effort"]
-        if tool_defs:
-            payload["tools"] = tool_defs
-
-        # Add system message configuration if provided
-        system_message = cfg.get("system_message")
-        if system_message:
-            payload["systemMessage"] = system_message
-
-        # Add tool filtering options
-        available_tools = cfg.get("available_tools")
-        if available_tools is not None:
-            payload["availableTools"] = available_tools
-        excluded_tools = cfg.get("excluded_tools")
-        if excluded_tools:
-            payload["excludedTools"] = excluded_tools
-
-        # Always enable permission request callback (deny by default if no handler provided)
-        on_permission_request = cfg.get("on_permission_request")
-        payload["requestPermission"] = True
-
-        # Enable user input request callback if handler provided
-        on_user_input_request = cfg.get("on_user_input_request")
-        if on_user_input_request:
-            payload["requestUserInput"] = True
-
-        # Enable hooks callback if any hook handler provided
-        hooks = cfg.get("hooks")
-        if hooks and any(hooks.values()):
-            payload["hooks"] = True
-
-        # Add working directory if provided
-        working_directory = cfg.get("working_directory")
-        if working_directory:
-            payload["workingDirectory"] = working_directory
-
-        # Add streaming option if provided
-        streaming = cfg.get("streaming")
-        if streaming is not None:
-            payload["streaming"] = streaming
-
-        # Add provider configuration if provided
-        provider = cfg.get("provider")
-        if provider:
-            payload["provider"] = self._convert_provider_to_wire_format(provider)
-
-        # Add MCP servers configuration if provided
-        mcp_servers = cfg.get("mcp_servers")
-        if mcp_servers:
-            payload["mcpServers"] = mcp_servers
-        payload["envValueMode"] = "direct"
-
-        # Add custom agents configuration if provided
-        custom_agents = cfg.get("custom_agents")
-        if custom_agents:
-            payload["customAgents"] = [
-                self._convert_custom_agent_to_wire_format(agent) for agent in custom_agents
-            ]
+        await self._ensure_started()
 
-        # Add config directory override if provided
-        config_dir = cfg.get("config_dir")
-        if config_dir:
-            payload["configDir"] = config_dir
-
-        # Add skill directories configuration if provided
-        skill_directories = cfg.get("skill_directories")
-        if skill_directories:
-            payload["skillDirectories"] = skill_directories
-
-        # Add disabled skills configuration if provided
-        disabled_skills = cfg.get("disabled_skills")
-        if disabled_skills:
-            payload["disabledSkills"] = disabled_skills
-
-        # Add infinite sessions configuration if provided
-        infinite_sessions = cfg.get("infinite_sessions")
-        if infinite_sessions:
-            wire_config: dict[str, Any] = {}
-            if "enabled" in infinite_sessions:
-                wire_config["enabled"] = infinite_sessions["enabled"]
-            if "background_compaction_threshold" in infinite_sessions:
-                wire_config["backgroundCompactionThreshold"] = infinite_sessions[
-                    "background_compaction_threshold"
-                ]
-            if "buffer_exhaustion_threshold" in infinite_sessions:
-                wire_config["bufferExhaustionThreshold"] = infinite_sessions[
-                    "buffer_exhaustion_threshold"
-                ]
-            payload["infiniteSessions"] = wire_config
+        template = config if isinstance(config, SessionTemplate) else SessionTemplate(config)
+        payload = template._create_payload()
+        shared_tools = self._apply_tool_sets(template, payload)
 
         if not self._client:
             raise RuntimeError("Client not connected")
         response = await self._client.request("session.create", payload)
 
-        session_id = response["sessionId"]
-        workspace_path = response.get("workspacePath")
-        session = CopilotSession(session_id, self._client, workspace_path)
-        session._register_tools(tools)
-        if on_permission_request:
-            session._register_permission_handler(on_permission_request)
-        if on_user_input_request:
-            session._register_user_input_handler(on_user_input_request)
-        if hooks:
-            session._register_hooks(hooks)
-        with self._sessions_lock:
-            self._sessions[session_id] = session
-
-        return session
+        return await self._setup_session(
+            response["sessionId"], response.get("workspacePath"), template, shared_tools
+        )
 
     async def resume_session(
-        self, session_id: str, config: Optional[ResumeSessionConfig] = None
+        self,
+        session_id: str,
+        config: Optional[Union[ResumeSessionConfig, SessionTemplate]] = None,
     ) -> CopilotSession:
         """
         Resume an existing conversation session by its ID.
@@ -591,7 +621,8 @@ class CopilotClient:
 
         Args:
             session_id: The ID of the session to resume.
-            config: Optional configuration for the resumed session.
+            config: Optional configuration for the resumed session, or a
+                :class:`SessionTemplate` to reuse a precompiled configuration.
 
         Returns:
             A :class:`CopilotSession` instance for the resumed session.
@@ -608,153 +639,350 @@ class CopilotClient:
             ...     "tools": [my_new_tool]
             ... })
         """
-        if not self._client:
-            if self.options["auto_start"]:
-                await self.start()
-            else:
-                raise RuntimeError("Client not connected. Call start() first.")
+        await self._ensure_started()
 
-        cfg = config or {}
+        template = config if isinstance(config, SessionTemplate) else SessionTemplate(config)
+        payload = template._resume_payload(session_id)
+        shared_tools = self._apply_tool_sets(template, payload)
 
-        tool_defs = []
-        tools = cfg.get("tools")
-        if tools:
-            for tool in tools:
-                definition = {
-                    "name": tool.name,
-                    "description": tool.description,
-                }
-                if tool.parameters:
-                    definition["parameters"] = tool.parameters
-                tool_defs.append(definition)
-
-        payload: dict[str, Any] = {"sessionId": session_id}
-
-        # Add client name if provided
-        client_name = cfg.get("client_name")
-        if client_name:
-            payload["clientName"] = client_name
-
-        # Add model if provided
-        model = cfg.get("model")
-        if model:
-            payload["model"] = model
-
-        if cfg.get("reasoning_effort"):
-            payload["reasoningEffort"] = cfg["reasoning_effort"]
-        if tool_defs:
-            payload["tools"] = tool_defs
-
-        # Add system message configuration if provided
-        system_message = cfg.get("system_message")
-        if system_message:
-            payload["systemMessage"] = system_message
-
-        # Add available/excluded tools if provided
-        available_tools = cfg.get("available_tools")
-        if available_tools is not None:
-            payload["availableTools"] = available_tools
-
-        excluded_tools = cfg.get("excluded_tools")
-        if excluded_tools:
-            payload["excludedTools"] = excluded_tools
-
-        provider = cfg.get("provider")
-        if provider:
-            payload["provider"] = self._convert_provider_to_wire_format(provider)
-
-        # Add streaming option if provided
-        streaming = cfg.get("streaming")
-        if streaming is not None:
-            payload["streaming"] = streaming
-
-        # Always enable permission request callback (deny by default if no handler provided)
-        on_permission_request = cfg.get("on_permission_request")
-        payload["requestPermission"] = True
+        if not self._client:
+            raise RuntimeError("Client not connected")
+        response = await self._client.request("session.resume", payload)
 
-        # Enable user input request callback if handler provided
-        on_user_input_request = cfg.get("on_user_input_request")
-        if on_user_input_request:
-            payload["requestUserInput"] = True
+        return await self._setup_session(
+            response["sessionId"], response.get("workspacePath"), template, shared_tools
+        )
 
-        # Enable hooks callback if any hook handler provided
-        hooks = cfg.get("hooks")
-        if hooks and any(hooks.values()):
-            payload["hooks"] = True
-
-        # Add working directory if provided
-        working_directory = cfg.get("working_directory")
-        if working_directory:
-            payload["workingDirectory"] = working_directory
-
-        # Add config directory if provided
-        config_dir = cfg.get("config_dir")
-        if config_dir:
-            payload["configDir"] = config_dir
-
-        # Add disable resume flag if provided
-        disable_resume = cfg.get("disable_resume")
-        if disable_resume:
-            payload["disableResume"] = True
+    def _apply_tool_sets(
+        self, template: SessionTemplate, payload: dict[str, Any]
+    ) -> Optional[Mapping[str, Tool]]:
+        """
+        Add the definitions of the template's tool sets to a request payload.
 
-        # Add MCP servers configuration if provided
-        mcp_servers = cfg.get("mcp_servers")
-        if mcp_servers:
-            payload["mcpServers"] = mcp_servers
-        payload["envValueMode"] = "direct"
-
-        # Add custom agents configuration if provided
-        custom_agents = cfg.get("custom_agents")
-        if custom_agents:
-            payload["customAgents"] = [
-                self._convert_custom_agent_to_wire_format(agent) for agent in custom_agents
-            ]
+        Note:
+            This method is internal.
 
-        # Add skill directories configuration if provided
-        skill_directories = cfg.get("skill_directories")
-        if skill_directories:
-            payload["skillDirectories"] = skill_directories
-
-        # Add disabled skills configuration if provided
-        disabled_skills = cfg.get("disabled_skills")
-        if disabled_skills:
-            payload["disabledSkills"] = disabled_skills
-
-        # Add infinite sessions configuration if provided
-        infinite_sessions = cfg.get("infinite_sessions")
-        if infinite_sessions:
-            wire_config: dict[str, Any] = {}
-            if "enabled" in infinite_sessions:
-                wire_config["enabled"] = infinite_sessions["enabled"]
-            if "background_compaction_threshold" in infinite_sessions:
-                wire_config["backgroundCompactionThreshold"] = infinite_sessions[
-                    "background_compaction_threshold"
-                ]
-            if "buffer_exhaustion_threshold" in infinite_sessions:
-                wire_config["bufferExhaustionThreshold"] = infinite_sessions[
-                    "buffer_exhaustion_threshold"
-                ]
-            payload["infiniteSessions"] = wire_config
+        Returns:
+            The shared handler map of the tool sets, or None if none are used.
 
-        if not self._client:
-            raise RuntimeError("Client not connected")
-        response = await self._client.request("session.resume", payload)
+        Raises:
+            ValueError: If a tool set is not registered.
+        """
+        if not template._tool_sets:
+            return None
+        definitions, shared_tools = self.tool_registry._resolve(template._tool_sets)
+        own = payload.get("tools")
+        if own:
+            names = {definition["name"] for definition in own}
+            definitions = own + [d for d in definitions if d["name"] not in names]
+        payload["tools"] = definitions
+        return shared_tools
+
+    async def _setup_session(
+        self,
+        session_id: str,
+        workspace_path: Optional[str],
+        template: SessionTemplate,
+        shared_tools: Optional[Mapping[str, Tool]] = None,
+    ) -> CopilotSession:
+        """
+        Create and register the local session object for a created or resumed session.
 
-        resumed_session_id = response["sessionId"]
-        workspace_path = response.get("workspacePath")
-        session = CopilotSession(resumed_session_id, self._client, workspace_path)
-        session._register_tools(cfg.get("tools"))
+        Note:
+            This method is internal.
+        """
+        assert self._client is not None
+        cfg = template._config
+        session = CopilotSession(session_id, self._client, workspace_path)
+        session._register_tool_map(template._tools_by_name)
+        if shared_tools is not None:
+            session._register_shared_tools(shared_tools)
+        on_permission_request = cfg.get("on_permission_request")
         if on_permission_request:
             session._register_permission_handler(on_permission_request)
+        on_user_input_request = cfg.get("on_user_input_request")
         if on_user_input_request:
             session._register_user_input_handler(on_user_input_request)
+        hooks = cfg.get("hooks")
         if hooks:
             session._register_hooks(hooks)
+        if cfg.get("history_cache"):
+            session._enable_history_cache()
+        if cfg.get("rpc_cache"):
+            session._enable_rpc_cache()
+        journal_dir = self.options.get("journal_dir")
+        if journal_dir:
+            session._attach_journal(await EventJournal.open(os.path.join(journal_dir, session_id)))
+        session._template = template
+        session._rehydrate = self._rehydrate_session
+        session._forget = self._forget_session
+        with self._sessions_lock:
+            self._sessions[session_id] = session
+            self._evicted_sessions.pop(session_id, None)
+        self._after_session_attached()
+
+        return session
+
+    def evict_idle_sessions(self, idle_for: Optional[float] = None) -> list[str]:
+        """
+        Evict sessions that have had no events or sends for a while.
+
+        Evicted sessions are removed from the client, along with their journals
+        and cached history. With the ``destroy_evicted`` option they are also
+        destroyed on the server. An evicted session object that is still in use
+        is attached again, and resumed if it was destroyed, on its next ``send``
+        or when the server sends it an event or request. Sessions with a message
+        in progress are never evicted.
+
+        The client runs this periodically when ``session_idle_ttl`` is set.
+
+        Args:
+            idle_for: Seconds of inactivity after which a session is evicted
+                (default: the ``session_idle_ttl`` option).
+
+        Returns:
+            The IDs of the evicted sessions.
+
+        Raises:
+            ValueError: If no idle time is given and ``session_idle_ttl`` is not set.
+        """
+        ttl = idle_for if idle_for is not None else self.options.get("session_idle_ttl")
+        if ttl is None:
+            raise ValueError("idle_for is required when session_idle_ttl is not set")
+        cutoff = time.monotonic() - ttl
+        with self._sessions_lock:
+            idle = [
+                session
+                for session in self._sessions.values()
+                if not session._busy and session._last_active <= cutoff
+            ]
+        return self._evict_sessions(idle)
+
+    def get_session_gauges(self) -> SessionGauges:
+        """
+        Get the number of live sessions and an estimate of the memory they hold.
+
+        Returns:
+            A :class:`SessionGauges` snapshot.
+        """
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+            gauges = self._session_gauges
+            return SessionGauges(
+                live=len(sessions),
+                evicted=gauges.evicted,
+                rehydrated=gauges.rehydrated,
+                estimated_bytes=sum(estimate_session_size(s) for s in sessions),
+            )
+
+    def _after_session_attached(self) -> None:
+        """
+        Apply the session cap and make sure the idle sweeper is running.
+
+        Note:
+            This method is internal.
+        """
+        max_sessions = self.options.get("max_sessions")
+        if max_sessions:
+            with self._sessions_lock:
+                excess = len(self._sessions) - max_sessions
+                candidates = (
+                    heapq.nsmallest(
+                        excess,
+                        (s for s in self._sessions.values() if not s._busy),
+                        key=lambda s: s._last_active,
+                    )
+                    if excess > 0
+                    else []
+                )
+            self._evict_sessions(candidates)
+        ttl = self.options.get("session_idle_ttl")
+        if ttl and (self._eviction_sweeper is None or self._eviction_sweeper.done()):
+            self._eviction_sweeper = asyncio.ensure_future(self._sweep_idle_sessions(ttl))
+
+    def _evict_sessions(self, sessions: list[CopilotSession]) -> list[str]:
+        """
+        Detach sessions from the client, destroying them if configured.
+
+        Note:
+            This method is internal.
+        """
+        destroy = bool(self.options.get("destroy_evicted"))
+        evicted: list[str] = []
+        for session in sessions:
+            with self._sessions_lock:
+                if self._sessions.get(session.session_id) is not session:
+                    continue
+                del self._sessions[session.session_id]
+                self._evicted_sessions[session.session_id] = session
+                self._session_gauges.evicted += 1
+            session._detach(destroyed=destroy)
+            if destroy and self._client is not None:
+                session._evicting = asyncio.ensure_future(
+                    self._destroy_evicted_session(session.session_id)
+                )
+            evicted.append(session.session_id)
+        return evicted
+
+    async def _destroy_evicted_session(self, session_id: str) -> None:
+        if not self._client:
+            return
+        try:
+            await self._client.request("session.destroy", {"sessionId": session_id})
+        except Exception:
+            pass  # The session may already be gone server-side
+
+    async def _rehydrate_session(self, session: CopilotSession) -> None:
+        """
+        Attach an evicted session again, resuming it if it was destroyed.
+
+        Note:
+            This method is internal. It is called on the next use of an evicted session.
+        """
+        if session._evicting is not None:
+            await asyncio.shield(session._evicting)
+            session._evicting = None
+        if session._evicted == "destroyed":
+            if not self._client:
+                raise RuntimeError("Client not connected")
+            template = session._template
+            assert template is not None
+            payload = template._resume_payload(session.session_id)
+            payload["disableResume"] = True
+            self._apply_tool_sets(template, payload)
+            await self._client.request("session.resume", payload)
+        journal = None
+        journal_dir = self.options.get("journal_dir")
+        if journal_dir:
+            journal = await EventJournal.open(os.path.join(journal_dir, session.session_id))
+        self._attach_evicted_session(session, journal)
+
+    def _attach_evicted_session(
+        self, session: CopilotSession, journal: Optional[EventJournal] = None
+    ) -> None:
+        """
+        Register an evicted session with the client again.
+
+        Note:
+            This method is internal. Without an opened ``journal``, the
+            session's journal is opened in the background, since the caller
+            cannot wait for the disk.
+        """
         with self._sessions_lock:
-            self._sessions[resumed_session_id] = session
+            attached = session._evicted is not None  # Else re-hydrated concurrently
+            if attached:
+                session._evicted = None
+                session._last_active = time.monotonic()
+                self._sessions[session.session_id] = session
+                self._evicted_sessions.pop(session.session_id, None)
+                self._session_gauges.rehydrated += 1
+        if not attached:
+            if journal is not None:
+                journal.aclose()
+            return
+        if journal is not None:
+            session._attach_journal(journal)
+        elif self.options.get("journal_dir"):
+            session._journal_opening = asyncio.ensure_future(self._open_session_journal(session))
+        self._after_session_attached()
+
+    async def _open_session_journal(self, session: CopilotSession) -> None:
+        journal_dir = self.options.get("journal_dir")
+        assert journal_dir
+        try:
+            journal = await EventJournal.open(os.path.join(journal_dir, session.session_id))
+        except Exception as e:
+            print(f"Error opening session journal: {e}")
+            return
+        if session._evicted is not None or session._journal is not None:
+            await journal.aclose()  # Evicted or destroyed while opening
+            return
+        session._attach_journal(journal)
+
+    async def _sweep_idle_sessions(self, ttl: float) -> None:
+        interval = min(max(ttl / 4, 0.01), 60.0)
+        while True:
+            await asyncio.sleep(interval)
+            with self._sessions_lock:
+                if not self._sessions:
+                    return  # Restarted when the next session is attached
+            self.evict_idle_sessions(ttl)
+
+    def _stop_eviction_sweeper(self) -> None:
+        if self._eviction_sweeper is not None:
+            self._eviction_sweeper.cancel()
+            self._eviction_sweeper = None
+
+    def _lookup_session(self, session_id: str) -> Optional[CopilotSession]:
+        """
+        Find the session an incoming event or request is for.
+
+        An evicted session that was only detached, and is still referenced by the
+        application, is attached again.
 
+        Note:
+            This method is internal.
+        """
+        with self._sessions_lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                return session
+            session = self._evicted_sessions.get(session_id)
+        if session is None or session._evicted != "detached":
+            return None
+        self._attach_evicted_session(session)
         return session
 
+    def map_prompt(
+        self,
+        targets: Sequence[PromptTarget],
+        prompt: Union[str, MessageOptions],
+        *,
+        concurrency: int = 8,
+        deadline: Optional[float] = None,
+        item_timeout: Optional[float] = None,
+        destroy_created: bool = True,
+    ) -> PromptMap:
+        """
+        Send one prompt to many sessions and stream back their answers.
+
+        Targets may be existing sessions or session configurations; sessions are
+        created for configurations as their turn comes and destroyed once they
+        have answered. At most ``concurrency`` items are in flight at a time, and
+        every item yields a :class:`PromptResult`, including items that failed or
+        timed out.
+
+        Args:
+            targets: Sessions, session configurations or session templates.
+            prompt: The prompt, or the full message options.
+            concurrency: Items processed at the same time.
+            deadline: Seconds after which items still running or not started are
+                reported as timed out.
+            item_timeout: Seconds each session may take to answer.
+            destroy_created: Destroy sessions created from configurations after
+                they answer.
+
+        Returns:
+            A :class:`PromptMap`. Iterate it with ``async for`` to receive results
+            as they complete, or await its ``collect()`` method.
+
+        Example:
+            >>> configs = [{"working_directory": repo} for repo in repos]
+            >>> prompts = client.map_prompt(configs, "List the open TODOs", concurrency=16)
+            >>> async for result in prompts:
+            ...     print(repos[result.index], result.content)
+            >>> print(prompts.stats().throughput)
+        """
+        return PromptMap(
+            self,
+            targets,
+            prompt,
+            concurrency=concurrency,
+            deadline=deadline,
+            item_timeout=item_timeout,
+            destroy_created=destroy_created,
+        )
+
     def get_state(self) -> ConnectionState:
         """
         Get the current connection state of the client.
@@ -796,6 +1024,9 @@ class CopilotClient:
         """
         Get CLI status including version and protocol information.
 
+        The result is cached for ``status_ttl`` seconds of the ``server_cache``
+        client option (default: not cached).
+
         Returns:
             A GetStatusResponse object containing version and protocolVersion.
 
@@ -809,7 +1040,7 @@ class CopilotClient:
         if not self._client:
             raise RuntimeError("Client not connected")
 
-        result = await self._client.request("status.get", {})
+        result = await self._server_cache.get("status.get", self._client)
         return GetStatusResponse.from_dict(result)
 
     async def get_auth_status(self) -> "GetAuthStatusResponse":
@@ -837,8 +1068,9 @@ class CopilotClient:
         """
         List available models with their metadata.
 
-        Results are cached after the first successful call to avoid rate limiting.
-        The cache is cleared when the client disconnects.
+        Results are cached after the first successful call to avoid rate limiting,
+        until the client disconnects or for ``models_ttl`` seconds of the
+        ``server_cache`` client option.
 
         Returns:
             A list of ModelInfo objects with model details.
@@ -855,21 +1087,78 @@ class CopilotClient:
         if not self._client:
             raise RuntimeError("Client not connected")
 
-        # Use asyncio lock to prevent race condition with concurrent calls
-        async with self._models_cache_lock:
-            # Check cache (already inside lock)
-            if self._models_cache is not None:
-                return list(self._models_cache)  # Return a copy to prevent cache mutation
+        # Concurrent misses share one request; results are parsed anew on every
+        # call so callers cannot mutate the cache
+        response = await self._server_cache.get("models.list", self._client)
+        models_data = response.get("models", [])
+        return [ModelInfo.from_dict(model) for model in models_data]
+
+    async def get_quota(self) -> AccountGetQuotaResult:
+        """
+        Get the quota snapshots of the authenticated account.
+
+        The result is cached for ``quota_ttl`` seconds of the ``server_cache``
+        client option (default: not cached).
 
-            # Cache miss - fetch from backend while holding lock
-            response = await self._client.request("models.list", {})
-            models_data = response.get("models", [])
-            models = [ModelInfo.from_dict(model) for model in models_data]
+        Returns:
+            An AccountGetQuotaResult with one snapshot per quota type.
 
-            # Update cache before releasing lock
-            self._models_cache = models
+        Raises:
+            RuntimeError: If the client is not connected.
 
-            return list(models)  # Return a copy to prevent cache mutation
+        Example:
+            >>> quota = await client.get_quota()
+            >>> for name, snapshot in quota.quota_snapshots.items():
+            ...     print(f"{name}: {snapshot.remaining_percentage}% left")
+        """
+        if not self._client:
+            raise RuntimeError("Client not connected")
+
+        result = await self._server_cache.get("account.getQuota", self._client)
+        return AccountGetQuotaResult.from_dict(result)
+
+    def _server_cache_keys(self) -> tuple[Optional[str], Optional[str]]:
+        """
+        Derive the auth identity and CLI build that the on-disk server cache is keyed by.
+
+        Both come from the client options and the CLI binary, so a starting
+        process picks its cache file without a request. The identity is only
+        known when the CLI authenticates with a token; a stored ``copilot login``
+        can change behind the client's back, so it is never assumed.
+
+        Note:
+            This method is internal. Either value is None when it cannot be
+            determined, in which case nothing is shared on disk unless the
+            ``identity`` option is set.
+        """
+        protocol = f"protocol {get_sdk_protocol_version()}"
+        if self._is_external_server:
+            # The server manages its own auth, so only its address is known
+            return None, f"server:{self.options['cli_url']} {protocol}"
+
+        token = self.options.get("github_token")
+        if not token:
+            env = self.options.get("env") or os.environ
+            token = next((env[name] for name in _TOKEN_ENV_VARS if env.get(name)), None)
+        identity: Optional[str] = None
+        if token:
+            identity = "token:" + hashlib.sha256(token.encode("utf-8")).hexdigest()
+        cli_path = os.path.abspath(self.options["cli_path"])
+        try:
+            stat = os.stat(cli_path)
+        except OSError:
+            return identity, None
+        return identity, f"{cli_path} {stat.st_size} {stat.st_mtime_ns} {protocol}"
+
+    def get_server_cache_stats(self) -> ServerCacheStats:
+        """
+        Get the counters of the cache behind list_models, get_status and get_quota.
+
+        Example:
+            >>> stats = client.get_server_cache_stats()
+            >>> print(f"{stats.hit_rate:.0%} served from cache, {stats.disk_loads} from disk")
+        """
+        return self._server_cache.stats()
 
     async def list_sessions(
         self, filter: "SessionListFilter | None" = None
@@ -878,6 +1167,9 @@ class CopilotClient:
         List all available sessions known to the server.
 
         Returns metadata about each session including ID, timestamps, and summary.
+        When the session index is enabled (see :meth:`enable_session_index`), the
+        list is served from the index without contacting the server, except for
+        filtered listings while the index may be stale (see :meth:`SessionIndex.query`).
 
         Args:
             filter: Optional filter to narrow down the list of sessions by cwd, git root,
@@ -897,6 +1189,19 @@ class CopilotClient:
             >>> from copilot import SessionListFilter
             >>> filtered = await client.list_sessions(SessionListFilter(repository="owner/repo"))
         """
+        if self._session_index is not None:
+            return await self._session_index.query(filter)
+        return await self._fetch_sessions(filter)
+
+    async def _fetch_sessions(
+        self, filter: "SessionListFilter | None" = None
+    ) -> list["SessionMetadata"]:
+        """
+        List sessions with a ``session.list`` request.
+
+        Note:
+            This method is internal.
+        """
         if not self._client:
             raise RuntimeError("Client not connected")
 
@@ -908,6 +1213,65 @@ class CopilotClient:
         sessions_data = response.get("sessions", [])
         return [SessionMetadata.from_dict(session) for session in sessions_data]
 
+    async def enable_session_index(
+        self,
+        reconcile_interval: Optional[float] = 300.0,
+        refresh_interval: float = 30.0,
+        max_staleness: float = 0.0,
+    ) -> SessionIndex:
+        """
+        Keep a local index of session metadata and serve :meth:`list_sessions` from it.
+
+        The index is seeded with one ``session.list`` request, then updated from
+        ``session.lifecycle`` notifications and reconciled with the server
+        periodically. Filtered listings use secondary indexes on working
+        directory, git root, repository and branch.
+
+        Args:
+            reconcile_interval: Seconds between full reconciliations with the
+                server (None to disable).
+            refresh_interval: Minimum seconds between the reconciliations that
+                fetch the context of newly created sessions.
+            max_staleness: Seconds filtered listings may lag behind session
+                creations and updates. Beyond this, they are sent to the server
+                until the next reconciliation (default: never lag).
+
+        Returns:
+            The :class:`SessionIndex`. Calling this again returns the same index.
+
+        Raises:
+            RuntimeError: If the client is not connected.
+
+        Example:
+            >>> index = await client.enable_session_index()
+            >>> sessions = await client.list_sessions(SessionListFilter(branch="main"))
+        """
+        if self._session_index is not None:
+            return self._session_index
+        index = SessionIndex(
+            self,
+            reconcile_interval=reconcile_interval,
+            refresh_interval=refresh_interval,
+            max_staleness=max_staleness,
+        )
+        try:
+            await index.start()
+        except BaseException:
+            index.close()
+            raise
+        self._session_index = index
+        return index
+
+    @property
+    def session_index(self) -> Optional[SessionIndex]:
+        """The session index, if :meth:`enable_session_index` was called."""
+        return self._session_index
+
+    def _close_session_index(self) -> None:
+        if self._session_index is not None:
+            self._session_index.close()
+            self._session_index = None
+
     async def delete_session(self, session_id: str) -> None:
         """
         Delete a session permanently.
@@ -936,8 +1300,198 @@ class CopilotClient:
 
         # Remove from local sessions map if present
         with self._sessions_lock:
-            if session_id in self._sessions:
-                del self._sessions[session_id]
+            session = self._sessions.pop(session_id, None)
+            self._evicted_sessions.pop(session_id, None)
+        if session:
+            await session._close_journal()
+        self.tool_metrics.drop_session(session_id)
+
+        # A deleted session cannot be resumed, so its journal is no longer useful
+        journal_dir = self.options.get("journal_dir")
+        if journal_dir:
+            shutil.rmtree(os.path.join(journal_dir, session_id), ignore_errors=True)
+
+    async def create_sessions(
+        self,
+        configs: Sequence[Optional[Union[SessionConfig, SessionTemplate]]],
+        *,
+        concurrency: int = 32,
+    ) -> list[SessionBatchResult]:
+        """
+        Create many sessions, with their requests pipelined over the connection.
+
+        Each distinct configuration is compiled once, so passing the same dict or
+        :class:`SessionTemplate` many times costs no more than passing it once.
+
+        Args:
+            configs: One configuration per session to create.
+            concurrency: Requests in flight at the same time.
+
+        Returns:
+            One :class:`SessionBatchResult` per configuration, in order. Failures
+            are reported in the result's ``error`` instead of being raised.
+
+        Raises:
+            RuntimeError: If the client is not connected and auto_start is disabled.
+
+        Example:
+            >>> template = SessionTemplate({"model": "gpt-5", "tools": tools})
+            >>> results = await client.create_sessions([template] * 500)
+            >>> sessions = [r.session for r in results if r.ok]
+        """
+        await self._ensure_started()
+        templates: dict[int, SessionTemplate] = {}
+        for config in configs:
+            if id(config) not in templates:
+                templates[id(config)] = (
+                    config if isinstance(config, SessionTemplate) else SessionTemplate(config)
+                )
+        return await run_batch(
+            configs,
+            lambda config: self.create_session(templates[id(config)]),
+            lambda config: templates[id(config)].session_id,
+            concurrency,
+        )
+
+    async def resume_sessions(
+        self,
+        session_ids: Sequence[str],
+        config: Optional[Union[ResumeSessionConfig, SessionTemplate]] = None,
+        *,
+        concurrency: int = 32,
+    ) -> list[SessionBatchResult]:
+        """
+        Resume many sessions with the same configuration, pipelining the requests.
+
+        Args:
+            session_ids: The IDs of the sessions to resume.
+            config: Configuration applied to every resumed session.
+            concurrency: Requests in flight at the same time.
+
+        Returns:
+            One :class:`SessionBatchResult` per session ID, in order.
+
+        Raises:
+            RuntimeError: If the client is not connected and auto_start is disabled.
+
+        Example:
+            >>> results = await client.resume_sessions(ids, {"tools": tools})
+            >>> failed = [r.session_id for r in results if not r.ok]
+        """
+        await self._ensure_started()
+        template = config if isinstance(config, SessionTemplate) else SessionTemplate(config)
+        return await run_batch(
+            session_ids,
+            lambda session_id: self.resume_session(session_id, template),
+            lambda session_id: session_id,
+            concurrency,
+        )
+
+    async def delete_sessions(
+        self, session_ids: Sequence[str], *, concurrency: int = 32
+    ) -> list[SessionBatchResult]:
+        """
+        Delete many sessions permanently, pipelining the requests.
+
+        Args:
+            session_ids: The IDs of the sessions to delete.
+            concurrency: Requests in flight at the same time.
+
+        Returns:
+            One :class:`SessionBatchResult` per session ID, in order.
+
+        Raises:
+            RuntimeError: If the client is not connected.
+
+        Example:
+            >>> stale = [s.sessionId for s in await client.list_sessions() if is_stale(s)]
+            >>> results = await client.delete_sessions(stale, concurrency=64)
+        """
+        if not self._client:
+            raise RuntimeError("Client not connected")
+
+        async def delete(session_id: str) -> None:
+            await self.delete_session(session_id)
+
+        return await run_batch(session_ids, delete, lambda session_id: session_id, concurrency)
+
+    async def _ensure_started(self) -> None:
+        """
+        Start the client if it is not connected and ``auto_start`` is enabled.
+
+        Note:
+            This method is internal.
+        """
+        if not self._client:
+            if self.options["auto_start"]:
+                await self.start()
+            else:
+                raise RuntimeError("Client not connected. Call start() first.")
+
+    def _forget_session(self, session_id: str) -> None:
+        """
+        Drop a session from the local sessions map without any server call.
+
+        Args:
+            session_id: The ID of the session to forget.
+        """
+        with self._sessions_lock:
+            self._sessions.pop(session_id, None)
+            self._evicted_sessions.pop(session_id, None)
+
+    def get_tool_stats(self) -> dict[str, ToolExecutionStats]:
+        """
+        Get queue, run time and result size figures for the tools this client has executed.
+
+        Queue time runs from receiving a call to starting its handler: the wait
+        for a concurrency slot and, for synchronous handlers, for a thread or
+        process pool worker. Run time is the rest of the call. Result sizes are
+        measured before the tool's result size policy is applied. The figures are
+        the totals of the samples recorded in :attr:`tool_metrics`.
+
+        Returns:
+            A snapshot of the figures, keyed by tool name.
+
+        Example:
+            >>> for name, stats in client.get_tool_stats().items():
+            ...     print(name, stats.calls, stats.queue_time_avg, stats.run_time_avg)
+        """
+        return self.tool_metrics.totals()
+
+    def get_tool_queue_stats(self) -> dict[str, ToolQueueStats]:
+        """
+        Get queueing figures for tools declared with concurrency limits.
+
+        Returns:
+            A snapshot of the figures, keyed by tool name.
+
+        Example:
+            >>> stats = client.get_tool_queue_stats()["run_build"]
+            >>> print(stats.queued, stats.rejected, stats.wait_time_avg)
+        """
+        return self._tool_scheduler.stats()
+
+    def get_tool_cache_stats(self) -> dict[str, ToolCacheStats]:
+        """
+        Get hit and miss figures for tools declared with a cache policy.
+
+        Returns:
+            A snapshot of the figures, keyed by tool name.
+
+        Example:
+            >>> stats = client.get_tool_cache_stats()["lookup_issue"]
+            >>> print(stats.hit_rate, stats.entries, stats.bytes)
+        """
+        return self._tool_cache.stats()
+
+    def clear_tool_cache(self, tool_name: Optional[str] = None) -> None:
+        """
+        Drop cached tool results.
+
+        Args:
+            tool_name: Only drop the results of this tool; all tools when None.
+        """
+        self._tool_cache.clear(tool_name)
 
     async def get_foreground_session_id(self) -> Optional[str]:
         """
@@ -1092,61 +1646,6 @@ class CopilotClient:
                 f"Please update your SDK or server to ensure compatibility."
             )
 
-    def _convert_provider_to_wire_format(
-        self, provider: ProviderConfig | dict[str, Any]
-    ) -> dict[str, Any]:
-        """
-        Convert provider config from snake_case to camelCase wire format.
-
-        Args:
-            provider: The provider configuration in snake_case format.
-
-        Returns:
-            The provider configuration in camelCase wire format.
-        """
-        wire_provider: dict[str, Any] = {"type": provider.get("type")}
-        if "base_url" in provider:
-            wire_provider["baseUrl"] = provider["base_url"]
-        if "api_key" in provider:
-            wire_provider["apiKey"] = provider["api_key"]
-        if "wire_api" in provider:
-            wire_provider["wireApi"] = provider["wire_api"]
-        if "bearer_token" in provider:
-            wire_provider["bearerToken"] = provider["bearer_token"]
-        if "azure" in provider:
-            azure = provider["azure"]
-            wire_azure: dict[str, Any] = {}
-            if "api_version" in azure:
-                wire_azure["apiVersion"] = azure["api_version"]
-            if wire_azure:
-                wire_provider["azure"] = wire_azure
-        return wire_provider
-
-    def _convert_custom_agent_to_wire_format(
-        self, agent: CustomAgentConfig | dict[str, Any]
-    ) -> dict[str, Any]:
-        """
-        Convert custom agent config from snake_case to camelCase wire format.
-
-        Args:
-            agent: The custom agent configuration in snake_case format.
-
-        Returns:
-            The custom agent configuration in camelCase wire format.
-        """
-        wire_agent: dict[str, Any] = {"name": agent.get("name"), "prompt": agent.get("prompt")}
-        if "display_name" in agent:
-            wire_agent["displayName"] = agent["display_name"]
-        if "description" in agent:
-            wire_agent["description"] = agent["description"]
-        if "tools" in agent:
-            wire_agent["tools"] = agent["tools"]
-        if "mcp_servers" in agent:
-            wire_agent["mcpServers"] = agent["mcp_servers"]
-        if "infer" in agent:
-            wire_agent["infer"] = agent["infer"]
-        return wire_agent
-
     async def _start_cli_server(self) -> None:
         """
         Start the CLI server process.
@@ -1291,8 +1790,7 @@ class CopilotClient:
                 event_dict = params["event"]
                 # Convert dict to SessionEvent object
                 event = session_event_from_dict(event_dict)
-                with self._sessions_lock:
-                    session = self._sessions.get(session_id)
+                session = self._lookup_session(session_id)
                 if session:
                     session._dispatch_event(event)
             elif method == "session.lifecycle":
@@ -1373,7 +1871,7 @@ class CopilotClient:
                 event_dict = params["event"]
                 # Convert dict to SessionEvent object
                 event = session_event_from_dict(event_dict)
-                session = self._sessions.get(session_id)
+                session = self._lookup_session(session_id)
                 if session:
                     session._dispatch_event(event)
             elif method == "session.lifecycle":
@@ -1410,8 +1908,7 @@ class CopilotClient:
         if not session_id or not permission_request:
             raise ValueError("invalid permission request payload")
 
-        with self._sessions_lock:
-            session = self._sessions.get(session_id)
+        session = self._lookup_session(session_id)
         if not session:
             raise ValueError(f"unknown session {session_id}")
 
@@ -1445,8 +1942,7 @@ class CopilotClient:
         if not session_id or not question:
             raise ValueError("invalid user input request payload")
 
-        with self._sessions_lock:
-            session = self._sessions.get(session_id)
+        session = self._lookup_session(session_id)
         if not session:
             raise ValueError(f"unknown session {session_id}")
 
@@ -1473,8 +1969,7 @@ class CopilotClient:
         if not session_id or not hook_type:
             raise ValueError("invalid hooks invoke payload")
 
-        with self._sessions_lock:
-            session = self._sessions.get(session_id)
+        session = self._lookup_session(session_id)
         if not session:
             raise ValueError(f"unknown session {session_id}")
 
@@ -1494,6 +1989,7 @@ class CopilotClient:
         Raises:
             ValueError: If the request payload is invalid or session is unknown.
         """
+        received = time.perf_counter()
         session_id = params.get("sessionId")
         tool_call_id = params.get("toolCallId")
         tool_name = params.get("toolName")
@@ -1501,26 +1997,122 @@ class CopilotClient:
         if not session_id or not tool_call_id or not tool_name:
             raise ValueError("invalid tool call payload")
 
-        with self._sessions_lock:
-            session = self._sessions.get(session_id)
+        session = self._lookup_session(session_id)
         if not session:
             raise ValueError(f"unknown session {session_id}")
 
-        handler = session._get_tool_handler(tool_name)
-        if not handler:
+        tool = session._get_tool(tool_name)
+        if not tool:
             return {"result": self._build_unsupported_tool_result(tool_name)}
 
         arguments = params.get("arguments")
-        result = await self._execute_tool_call(
-            session_id,
-            tool_call_id,
-            tool_name,
-            arguments,
-            handler,
+        call = _ToolCall(
+            self._tool_executors,
+            tool.executor if tool.executor is not None else self._tool_executors.default,
         )
+        policy = tool.result_policy or self.options.get("tool_result_policy")
+        call.result_policy = policy
+        size: Optional[int] = None  # Before the size policy; unknown for cache hits
+        action: Optional[str] = None
+
+        async def run() -> ToolResult:
+            nonlocal size, action
+            result = await self._run_tool_call(session_id, tool_call_id, tool, arguments, call)
+            size = result_size(result)
+            if policy is not None:
+                # Applied before caching, so the cache keeps the reduced result
+                result, action = await apply_result_policy(
+                    result, policy, tool.name, tool_call_id, session.rpc.workspace
+                )
+            return result
+
+        if tool.cache is not None:
+            result = await self._tool_cache.get_or_call(
+                tool,
+                session_id,
+                arguments,
+                run,
+                # Offloaded results point to a file in the calling session's workspace
+                per_session=policy is not None and policy.strategy == "offload",
+            )
+        else:
+            result = await run()
+
+        if size is None:
+            size = result_size(result)
+        self._record_tool_call(tool.name, session_id, call, received, result, size, action)
 
         return {"result": result}
 
+    def _record_tool_call(
+        self,
+        tool_name: str,
+        session_id: str,
+        call: _ToolCall,
+        received: float,
+        result: Any,
+        size: int,
+        action: Optional[str],
+    ) -> None:
+        """
+        Record the sample of a handled tool call, whatever its outcome.
+
+        Note:
+            This method is internal.
+        """
+        if call.started is None:
+            # Rejected by the scheduler, or served from the tool result cache
+            outcome = call.outcome or "cached"
+            queue_time = time.perf_counter() - received if outcome == "rejected" else 0.0
+            run_time = 0.0
+        else:
+            outcome = call.outcome or (
+                result.get("resultType", "success") if isinstance(result, dict) else "success"
+            )
+            queue_time = call.started - received + call.queue_time
+            run_time = max(0.0, (call.finished or call.started) - call.started - call.queue_time)
+        self._record_tool_metrics(
+            ToolCallSample(tool_name, session_id, queue_time, run_time, size, outcome, action)
+        )
+
+    async def _run_tool_call(
+        self,
+        session_id: str,
+        tool_call_id: str,
+        tool: Tool,
+        arguments: Any,
+        call: Optional[_ToolCall] = None,
+    ) -> ToolResult:
+        """
+        Execute a tool call within the tool's concurrency limits.
+
+        Args:
+            session_id: The session ID making the tool call.
+            tool_call_id: The unique ID for this tool call.
+            tool: The tool being called.
+            arguments: The arguments to pass to the tool handler.
+            call: Receives the timing and outcome of the call.
+
+        Returns:
+            The tool result, or a "rejected" result if the tool's queue is full.
+        """
+        try:
+            async with self._tool_scheduler.slot(tool, session_id):
+                return await self._execute_tool_call(
+                    session_id,
+                    tool_call_id,
+                    tool.name,
+                    arguments,
+                    tool.handler,
+                    tool.executor,
+                    tool.timeout,
+                    call,
+                )
+        except ToolQueueFullError:
+            if call is not None:
+                call.outcome = "rejected"
+            return self._build_rejected_tool_result(tool.name)
+
     async def _execute_tool_call(
         self,
         session_id: str,
@@ -1528,34 +2120,76 @@ class CopilotClient:
         tool_name: str,
         arguments: Any,
         handler: ToolHandler,
+        executor: Optional[ToolExecutor] = None,
+        timeout: Optional[float] = None,
+        call: Optional[_ToolCall] = None,
     ) -> ToolResult:
         """
         Execute a tool call with the given handler.
 
+        Synchronous handlers run on ``executor`` (or the client's ``tool_executor``
+        option) so they do not block the event loop. The handler's start and end
+        times and the time it waited for a worker are stored in ``call`` for the
+        caller to record, see :meth:`get_tool_stats`.
+
+        A call that runs longer than ``timeout`` (or the client's ``tool_timeout``
+        option) is answered with a "failure" result. Async handlers are cancelled;
+        handlers in a worker thread cannot be interrupted, so the invocation's
+        cancellation token is set for them to stop cooperatively.
+
         Args:
             session_id: The session ID making the tool call.
             tool_call_id: The unique ID for this tool call.
             tool_name: The name of the tool being called.
             arguments: The arguments to pass to the tool handler.
             handler: The tool handler function to execute.
+            executor: The executor selected by the tool, if any.
+            timeout: The timeout in seconds selected by the tool, if any.
+            call: Receives the timing and outcome of the call.
 
         Returns:
             A ToolResult containing the execution result or error.
         """
+        with self._sessions_lock:
+            session = self._sessions.get(session_id)
+        progress = ToolProgress(
+            tool_call_id,
+            session._dispatch_event if session is not None else None,
+            asyncio.get_running_loop(),
+        )
         invocation: ToolInvocation = {
             "session_id": session_id,
             "tool_call_id": tool_call_id,
             "tool_name": tool_name,
             "arguments": arguments,
+            "progress": progress,
+            "cancellation": ToolCancellationToken(),
         }
+        if timeout is None:
+            timeout = self.options.get("tool_timeout")
 
+        if call is None:
+            call = _ToolCall(
+                self._tool_executors,
+                executor if executor is not None else self._tool_executors.default,
+            )
+        token = _current_call.set(call)
+        started = call.started = time.perf_counter()
         try:
-            result = handler(invocation)
-            if inspect.isawaitable(result):
-                result = await result
+            result = await asyncio.wait_for(self._invoke_tool_handler(handler, invocation), timeout)
+        except asyncio.TimeoutError:
+            invocation["cancellation"].cancel()
+            call.outcome = "timeout"
+            result = self._build_timed_out_tool_result(
+                tool_name, cast(float, timeout), time.perf_counter() - started
+            )
+        except asyncio.CancelledError:
+            invocation["cancellation"].cancel()
+            raise
         except Exception as exc:  # pylint: disable=broad-except
             # Don't expose detailed error information to the LLM for security reasons.
             # The actual error is stored in the 'error' field for debugging.
+            call.outcome = "error"
             result = ToolResult(
                 textResultForLlm="Invoking this tool produced an error. "
                 "Detailed information is not available.",
@@ -1564,6 +2198,10 @@ class CopilotClient:
                 toolTelemetry={},
             )
 
+        finally:
+            _current_call.reset(token)
+            call.finished = time.perf_counter()
+
         if result is None:
             result = ToolResult(
                 textResultForLlm="Tool returned no result.",
@@ -1574,6 +2212,37 @@ class CopilotClient:
 
         return self._normalize_tool_result(result)
 
+    def _record_tool_metrics(self, sample: ToolCallSample) -> None:
+        """
+        Pass a tool call sample to the metrics sinks.
+
+        Note:
+            This method is internal.
+        """
+        for sink in self._metrics_sinks:
+            try:
+                sink.record_tool_call(sample)
+            except Exception as e:
+                print(f"Error in tool metrics sink: {e}")
+
+    async def _invoke_tool_handler(self, handler: ToolHandler, invocation: ToolInvocation) -> Any:
+        """
+        Run a tool handler and resolve its awaitable or streamed result.
+
+        Note:
+            This method is internal.
+        """
+        if inspect.iscoroutinefunction(handler) or inspect.isasyncgenfunction(handler):
+            result = handler(invocation)
+        else:
+            result = await self._tool_executors.run(handler, (invocation,))
+        if inspect.isawaitable(result):
+            result = await result
+        elif inspect.isasyncgen(result):
+            text = await _collect_streamed_output(result, invocation.get("progress"))
+            result = ToolResult(textResultForLlm=text, resultType="success")
+        return result
+
     def _normalize_tool_result(self, result: ToolResult) -> ToolResult:
         """
         Normalize a tool result for transmission.
@@ -1590,6 +2259,49 @@ class CopilotClient:
             return asdict(result)  # type: ignore[arg-type]
         return result
 
+    def _build_rejected_tool_result(self, tool_name: str) -> ToolResult:
+        """
+        Build a result for a tool call rejected because the tool's queue is full.
+
+        Args:
+            tool_name: The name of the busy tool.
+
+        Returns:
+            A ToolResult with resultType "rejected".
+        """
+        return ToolResult(
+            textResultForLlm=f"Tool '{tool_name}' is busy with too many pending calls. "
+            "Try again later.",
+            resultType="rejected",
+            error=f"tool '{tool_name}' queue is full",
+            toolTelemetry={},
+        )
+
+    def _build_timed_out_tool_result(
+        self, tool_name: str, timeout: float, elapsed: float
+    ) -> ToolResult:
+        """
+        Build a failure result for a tool call that exceeded its timeout.
+
+        Args:
+            tool_name: The name of the tool that timed out.
+            timeout: The timeout in seconds.
+            elapsed: Seconds the call ran before it was abandoned.
+
+        Returns:
+            A ToolResult with resultType "failure" and the timing in toolTelemetry.
+        """
+        return ToolResult(
+            textResultForLlm=f"Tool '{tool_name}' did not finish within {timeout:g} seconds.",
+            resultType="failure",
+            error=f"tool '{tool_name}' timed out after {timeout:g}s",
+            toolTelemetry={
+                "timedOut": True,
+                "timeoutMs": round(timeout * 1000),
+                "durationMs": round(elapsed * 1000),
+            },
+        )
+
     def _build_unsupported_tool_result(self, tool_name: str) -> ToolResult:
         """
         Build a failure result for an unsupported tool.
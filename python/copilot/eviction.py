@@ -0,0 +1,51 @@
+"""
+Idle-session eviction for the Copilot SDK.
+
+This module provides :class:`SessionGauges`, the figures reported by
+:meth:`CopilotClient.get_session_gauges`, and the memory estimate used for
+them. The eviction policy itself is configured with the ``session_idle_ttl``,
+``max_sessions`` and ``destroy_evicted`` client options.
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .session import CopilotSession
+
+
+@dataclass
+class SessionGauges:
+    """Session counts and memory figures of a :class:`CopilotClient`."""
+
+    live: int = 0  # Sessions attached to the client
+    evicted: int = 0  # Sessions evicted since the client was created
+    rehydrated: int = 0  # Evicted sessions attached again on their next use
+    estimated_bytes: int = 0  # Rough memory held by the live sessions
+
+
+def estimate_session_size(session: "CopilotSession") -> int:
+    """
+    Estimate the memory held by a session object, in bytes.
+
+    Counts the session and its per-session containers, including cached history
+    events, but not objects shared with other sessions such as tool sets. The
+    figure is meant for trends and alerting rather than exact accounting.
+    """
+    size = sys.getsizeof(session) + sys.getsizeof(session.__dict__)
+    for value in (
+        session._event_handlers,
+        session._tools,
+        session._history,
+        session._history_index,
+        session._history_pending,
+    ):
+        if value is not None:
+            size += sys.getsizeof(value)
+    for event in session._history or ():
+        size += sys.getsizeof(event) + sys.getsizeof(event.data.__dict__)
+        content = event.data.content
+        if isinstance(content, str):
+            size += sys.getsizeof(content)
+    return size
@@ -0,0 +1,249 @@
+"""
+Executors for synchronous tool handlers.
+
+This module provides :class:`ToolExecutors`, which runs synchronous tool
+handlers off the event loop so that a blocking tool does not stall every
+session on the client, and measures how long each call waited for a worker.
+"""
+
+import asyncio
+import contextvars
+import functools
+import importlib
+import sys
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .types import ToolExecutor, ToolResultPolicy, WorkerPoolOptions
+from .workers import WorkerPool
+
+
+class ToolExecutors:
+    """
+    The thread and process pools a client runs synchronous tool handlers on.
+
+    Pools are created on first use and can be shut down and lazily recreated,
+    so a client can be stopped and started again. Executors supplied by the
+    caller are used as-is and never shut down.
+
+    Example:
+        >>> executors = ToolExecutors(default="thread", max_workers=8)
+        >>> result = await executors.run(read_file, (path,), "process")
+        >>> executors.shutdown()
+    """
+
+    def __init__(
+        self,
+        default: ToolExecutor = "thread",
+        max_workers: Optional[int] = None,
+        worker_pool: Optional[WorkerPoolOptions] = None,
+    ):
+        """
+        Initialize the executors.
+
+        Args:
+            default: Executor used when a tool does not select one.
+            max_workers: Maximum number of workers in each pool.
+            worker_pool: Options for the "isolated" worker pool, see
+                :class:`~copilot.workers.WorkerPool`.
+
+        Raises:
+            ValueError: If ``default`` is not a known executor.
+        """
+        _check_executor(default)
+        self.default: ToolExecutor = default
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._worker_pool_options: WorkerPoolOptions = worker_pool or {}
+        self._workers: Optional[WorkerPool] = None
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        args: tuple[Any, ...],
+        executor: Optional[ToolExecutor] = None,
+    ) -> Any:
+        """
+        Run a synchronous function on an executor.
+
+        When called while a tool call is being handled, the time the call waited
+        for a worker is reported to the client's tool statistics.
+
+        Args:
+            fn: The function to run. It must be picklable for ``"process"`` and
+                ``"isolated"``.
+            args: Positional arguments for ``fn``.
+            executor: Executor to use; defaults to the one selected for the
+                current tool call, then to :attr:`default`.
+
+        Returns:
+            The value returned by ``fn``.
+        """
+        call = _current_call.get()
+        if executor is None:
+            executor = call.executor if call is not None else self.default
+        if executor == "inline":
+            return fn(*args)
+
+        pool = self._resolve(executor)
+        if isinstance(pool, (ProcessPoolExecutor, WorkerPool)):
+            fn = _process_callable(fn)
+        submitted = time.time()
+        started, result = await asyncio.get_running_loop().run_in_executor(
+            pool, _timed_call, fn, args
+        )
+        if call is not None:
+            call.queue_time += max(0.0, started - submitted)
+        return result
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Shut down the pools created by this object.
+
+        Args:
+            wait: Whether to wait for running calls to finish.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, None
+            processes, self._processes = self._processes, None
+            workers, self._workers = self._workers, None
+        if threads is not None:
+            threads.shutdown(wait=wait)
+        if processes is not None:
+            processes.shutdown(wait=wait)
+        if workers is not None:
+            workers.shutdown(wait=wait)
+
+    def _resolve(self, executor: ToolExecutor) -> Executor:
+        if isinstance(executor, Executor):
+            return executor
+        with self._lock:
+            if executor == "thread":
+                if self._threads is None:
+                    self._threads = ThreadPoolExecutor(
+                        max_workers=self._max_workers, thread_name_prefix="copilot-tool"
+                    )
+                return self._threads
+            if executor == "process":
+                if self._processes is None:
+                    self._processes = ProcessPoolExecutor(max_workers=self._max_workers)
+                return self._processes
+            if executor == "isolated":
+                if self._workers is None:
+                    self._workers = WorkerPool(
+                        **{"workers": self._max_workers, **self._worker_pool_options}
+                    )
+                return self._workers
+        raise ValueError(f"Unknown tool executor: {executor!r}")
+
+
+class _ToolCall:
+    """Per-call state shared between the client and :meth:`ToolExecutors.run`."""
+
+    __slots__ = (
+        "executors",
+        "executor",
+        "result_policy",
+        "queue_time",
+        "started",
+        "finished",
+        "outcome",
+    )
+
+    def __init__(self, executors: ToolExecutors, executor: ToolExecutor):
+        self.executors = executors
+        self.executor = executor
+        # Applied to the result; streamed output is reduced while it is collected
+        self.result_policy: Optional[ToolResultPolicy] = None
+        self.queue_time = 0.0  # Seconds spent waiting for an executor worker
+        # perf_counter() readings around the handler, when it ran
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.outcome: Optional[str] = None  # Set when the call did not produce its own result
+
+
+_current_call: contextvars.ContextVar[Optional[_ToolCall]] = contextvars.ContextVar(
+    "copilot_tool_call", default=None
+)
+
+_shared_executors: Optional[ToolExecutors] = None
+_shared_executors_lock = threading.Lock()
+
+
+async def run_in_tool_executor(
+    fn: Callable[..., Any], args: tuple[Any, ...], executor: Optional[ToolExecutor] = None
+) -> Any:
+    """
+    Run a synchronous tool function on the executors of the client handling the call.
+
+    Outside of a client-dispatched tool call, a process-wide set of executors
+    is used.
+
+    Note:
+        This function is internal. It is used by :func:`define_tool` handlers.
+    """
+    call = _current_call.get()
+    executors = call.executors if call is not None else _get_shared_executors()
+    return await executors.run(fn, args, executor)
+
+
+def _get_shared_executors() -> ToolExecutors:
+    global _shared_executors
+    with _shared_executors_lock:
+        if _shared_executors is None:
+            _shared_executors = ToolExecutors()
+        return _shared_executors
+
+
+def _check_executor(executor: Any) -> None:
+    if not isinstance(executor, Executor) and executor not in (
+        "inline",
+        "thread",
+        "process",
+        "isolated",
+    ):
+        raise ValueError(f"Unknown tool executor: {executor!r}")
+
+
+def _process_callable(fn: Callable[..., Any]) -> Callable[..., Any]:
+    # Functions decorated with @define_tool are shadowed by their Tool in their module,
+    # so pickle cannot find them by name. Send a reference that the worker resolves.
+    if isinstance(fn, functools.partial):
+        return functools.partial(_process_callable(fn.func), *fn.args, **fn.keywords)
+    module = sys.modules.get(getattr(fn, "__module__", None) or "")
+    qualname = getattr(fn, "__qualname__", "")
+    if module is None or "<locals>" in qualname:
+        return fn
+    obj: Any = module
+    for part in qualname.split("."):
+        obj = getattr(obj, part, None)
+    if obj is fn:
+        return fn
+    return _FunctionRef(module.__name__, qualname)
+
+
+class _FunctionRef:
+    """Picklable reference to a module-level tool function."""
+
+    def __init__(self, module: str, qualname: str):
+        self.module = module
+        self.qualname = qualname
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        obj: Any = importlib.import_module(self.module)
+        for part in self.qualname.split("."):
+            obj = getattr(obj, part)
+        # A @define_tool function is found as its Tool; call the undecorated function
+        handler = getattr(obj, "handler", None)
+        fn = getattr(handler, "__wrapped__", obj)
+        return fn(*args, **kwargs)
+
+
+def _timed_call(fn: Callable[..., Any], args: tuple[Any, ...]) -> tuple[float, Any]:
+    # Runs in the worker; the start time lets the caller derive the queue time.
+    # time.time() is used because it is comparable across processes.
+    return time.time(), fn(*args)
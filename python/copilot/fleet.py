@@ -0,0 +1,277 @@
+"""
+Tracking of fleet runs.
+
+This module provides :class:`FleetRun`, returned by
+:meth:`CopilotSession.start_fleet`. It follows the ``subagent.*`` events of a
+session as they arrive, keeps every subagent indexed by its tool call ID with
+running counts, and routes the events each subagent emits to per-subagent
+streams, so progress of large fleets can be observed without rescanning the
+event history.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional
+
+from .generated.session_events import SessionEvent, SessionEventType
+
+if TYPE_CHECKING:
+    from .session import CopilotSession
+
+SubagentStatus = Literal["running", "completed", "failed"]
+
+
+@dataclass
+class Subagent:
+    """A subagent launched during a fleet run."""
+
+    tool_call_id: str
+    agent_name: Optional[str]
+    display_name: Optional[str]
+    started_at: datetime
+    status: SubagentStatus = "running"
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds from start to completion or failure, or None while running."""
+        if self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+
+@dataclass
+class FleetCounts:
+    """Counts of the subagents of a fleet run."""
+
+    started: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+
+
+class FleetRun:
+    """
+    A fleet run started with :meth:`CopilotSession.start_fleet`.
+
+    Subagents are indexed by tool call ID as ``subagent.started``,
+    ``subagent.completed`` and ``subagent.failed`` events arrive, and events
+    carrying a ``parentToolCallId`` are routed to the stream of the subagent that
+    emitted them. Each event is handled in constant time.
+
+    Example:
+        >>> fleet = await session.start_fleet("Fix every failing test")
+        >>> subagents = await fleet.wait(timeout=1800)
+        >>> for subagent in subagents:
+        ...     print(subagent.agent_name, subagent.status, subagent.duration)
+        >>> fleet.close()
+    """
+
+    def __init__(
+        self,
+        session: "CopilotSession",
+        stream_events: bool = False,
+        max_buffered_events: int = 1000,
+    ):
+        """
+        Start tracking the subagent events of a session.
+
+        Args:
+            session: The session running the fleet.
+            stream_events: Buffer the events of every subagent from the moment it
+                starts, so :meth:`stream` never misses events. Otherwise events
+                are only buffered for subagents with an open stream.
+            max_buffered_events: Events buffered per subagent stream. When a
+                consumer falls behind, the oldest events are dropped and counted
+                in :attr:`dropped_events`.
+        """
+        if max_buffered_events <= 0:
+            raise ValueError("max_buffered_events must be positive")
+        self._session = session
+        self._stream_events = stream_events
+        self._max_buffered = max_buffered_events
+        self._subagents: dict[str, Subagent] = {}
+        self._counts = FleetCounts()
+        self._selected: list[str] = []
+        self._streams: dict[str, asyncio.Queue[Optional[SessionEvent]]] = {}
+        self._reading: set[str] = set()  # Subagents with an open stream
+        self._dropped = 0
+        self._started_callbacks: list[Callable[[Subagent], None]] = []
+        self._done = asyncio.Event()
+        self._idle = False
+        self._error: Optional[Exception] = None
+        self._unsubscribe: Optional[Callable[[], None]] = session.on(self._handle_event)
+
+    def get(self, tool_call_id: str) -> Optional[Subagent]:
+        """Get a subagent by the ID of the tool call that launched it."""
+        return self._subagents.get(tool_call_id)
+
+    def subagents(self) -> list[Subagent]:
+        """Get the subagents seen so far, in the order they started."""
+        return list(self._subagents.values())
+
+    def counts(self) -> FleetCounts:
+        """Get the current subagent counts."""
+        counts = self._counts
+        return FleetCounts(counts.started, counts.running, counts.completed, counts.failed)
+
+    @property
+    def selected_agents(self) -> list[str]:
+        """Names of the custom agents selected during the run."""
+        return list(self._selected)
+
+    @property
+    def dropped_events(self) -> int:
+        """Events dropped because a subagent stream's buffer was full."""
+        return self._dropped
+
+    @property
+    def done(self) -> bool:
+        """Whether the session went idle with no subagents running."""
+        return self._done.is_set()
+
+    def on_subagent_started(self, callback: Callable[[Subagent], None]) -> None:
+        """Register a callback invoked when a subagent starts."""
+        self._started_callbacks.append(callback)
+
+    async def wait(self, timeout: Optional[float] = None) -> list[Subagent]:
+        """
+        Wait until the session is idle and no subagents are running.
+
+        Args:
+            timeout: Seconds to wait (default: no limit).
+
+        Returns:
+            All subagents of the run.
+
+        Raises:
+            asyncio.TimeoutError: If the run does not finish within the timeout.
+            Exception: If the session reports an error.
+        """
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(
+                f"Timeout after {timeout}s waiting for the fleet to finish"
+            ) from None
+        if self._error is not None:
+            raise self._error
+        return self.subagents()
+
+    async def stream(self, tool_call_id: str) -> AsyncIterator[SessionEvent]:
+        """
+        Iterate over the events emitted by one subagent.
+
+        The iteration ends when the subagent completes or fails, or the run is
+        closed. Without ``stream_events``, only events received after the stream
+        was opened are yielded. The buffers of finished subagents nobody is
+        reading are released when the session goes idle, after which their
+        streams are empty.
+
+        Args:
+            tool_call_id: The tool call ID of the subagent.
+        """
+        queue = self._streams.get(tool_call_id)
+        if queue is None:
+            subagent = self._subagents.get(tool_call_id)
+            if self._unsubscribe is None or (subagent is not None and subagent.status != "running"):
+                return
+            queue = self._streams[tool_call_id] = asyncio.Queue(self._max_buffered)
+        self._reading.add(tool_call_id)
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    self._streams.pop(tool_call_id, None)
+                    return
+                yield event
+        finally:
+            self._reading.discard(tool_call_id)
+
+    def close(self) -> None:
+        """Stop tracking the session and end all open streams."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        for queue in self._streams.values():
+            self._offer(queue, None)
+
+    def _handle_event(self, event: SessionEvent) -> None:
+        data = event.data
+        if event.type == SessionEventType.SUBAGENT_STARTED and data.tool_call_id:
+            if data.tool_call_id in self._subagents:
+                return
+            subagent = Subagent(
+                data.tool_call_id, data.agent_name, data.agent_display_name, event.timestamp
+            )
+            self._subagents[subagent.tool_call_id] = subagent
+            self._counts.started += 1
+            self._counts.running += 1
+            self._idle = False
+            self._done.clear()
+            if self._stream_events:
+                self._streams.setdefault(subagent.tool_call_id, asyncio.Queue(self._max_buffered))
+            for callback in self._started_callbacks:
+                try:
+                    callback(subagent)
+                except Exception as e:
+                    print(f"Error in fleet subagent callback: {e}")
+        elif event.type in _FINISHED and data.tool_call_id:
+            subagent = self._subagents.get(data.tool_call_id)
+            if subagent is None or subagent.status != "running":
+                return
+            subagent.finished_at = event.timestamp
+            self._counts.running -= 1
+            if event.type == SessionEventType.SUBAGENT_COMPLETED:
+                subagent.status = "completed"
+                self._counts.completed += 1
+            else:
+                subagent.status = "failed"
+                error = data.error
+                subagent.error = error if isinstance(error, str) or error is None else error.message
+                self._counts.failed += 1
+            queue = self._streams.get(subagent.tool_call_id)
+            if queue is not None:
+                self._offer(queue, event)
+                self._offer(queue, None)
+            self._check_done()
+        elif event.type == SessionEventType.SUBAGENT_SELECTED:
+            if data.agent_name:
+                self._selected.append(data.agent_name)
+        elif event.type == SessionEventType.SESSION_IDLE:
+            self._idle = True
+            self._release_finished_streams()
+            self._check_done()
+        elif event.type == SessionEventType.SESSION_SHUTDOWN:
+            self.close()
+            self._streams.clear()
+        elif event.type == SessionEventType.SESSION_ERROR:
+            self._error = Exception(f"Session error: {getattr(data, 'message', str(data))}")
+            self._done.set()
+        elif data.parent_tool_call_id:
+            queue = self._streams.get(data.parent_tool_call_id)
+            if queue is not None:
+                self._offer(queue, event)
+
+    def _offer(self, queue: "asyncio.Queue[Optional[SessionEvent]]", item: Any) -> None:
+        if queue.full():
+            queue.get_nowait()  # Drop the oldest event rather than grow without bound
+            self._dropped += 1
+        queue.put_nowait(item)
+
+    def _release_finished_streams(self) -> None:
+        for tool_call_id in list(self._streams):
+            subagent = self._subagents.get(tool_call_id)
+            finished = subagent is None or subagent.status != "running"
+            if finished and tool_call_id not in self._reading:
+                del self._streams[tool_call_id]
+
+    def _check_done(self) -> None:
+        if self._idle and self._counts.running == 0:
+            self._done.set()
+
+
+_FINISHED = (SessionEventType.SUBAGENT_COMPLETED, SessionEventType.SUBAGENT_FAILED)
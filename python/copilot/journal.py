@@ -0,0 +1,361 @@
+"""
+Durable local event journal for Copilot sessions.
+
+This module provides the :class:`EventJournal` class, an append-only,
+segmented JSONL log of session events that lets a restarted process replay
+and query past events locally, without a connection to the CLI.
+"""
+
+import asyncio
+import functools
+import json
+import os
+import threading
+from typing import Any, BinaryIO, Optional
+
+from .generated.session_events import SessionEvent, session_event_from_dict
+
+_SEGMENT_PREFIX = "events-"
+_SEGMENT_SUFFIX = ".jsonl"
+
+
+class EventJournal:
+    """
+    Append-only on-disk journal of the events of a single session.
+
+    Events are written as one JSON object per line into numbered segment files
+    inside ``directory``. Writes from the dispatch path only touch the file
+    buffer; a background thread shared by all journals flushes and fsyncs
+    pending writes in batches.
+    On open, existing segments are scanned to rebuild the in-memory indexes by
+    event ID and event type, and a torn trailing record left by a crash is
+    discarded. From async code, use :meth:`open` to do this scan off the
+    event loop.
+
+    Example:
+        >>> journal = EventJournal("/var/lib/myapp/journal/session-123")
+        >>> journal.append(event)
+        >>> tool_events = journal.read(event_type="tool.execution_complete")
+        >>> journal.close()
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_max_bytes: int = 8 * 1024 * 1024,
+        fsync_interval: float = 1.0,
+        fsync_batch_size: int = 256,
+    ):
+        """
+        Open (or create) a journal.
+
+        Args:
+            directory: Directory holding the journal's segment files.
+            segment_max_bytes: Size after which a new segment file is started.
+            fsync_interval: Maximum number of seconds written events may stay
+                un-synced.
+            fsync_batch_size: Number of pending events that triggers an early sync.
+        """
+        self.directory = directory
+        self._segment_max_bytes = segment_max_bytes
+        self._fsync_interval = fsync_interval
+        self._fsync_batch_size = fsync_batch_size
+        self._lock = threading.Lock()
+        self._closed = False
+        self._pending = 0
+        # event ID -> (segment number, byte offset)
+        self._by_id: dict[str, tuple[int, int]] = {}
+        self._by_type: dict[str, list[str]] = {}
+        self._order: list[str] = []
+
+        os.makedirs(directory, exist_ok=True)
+        segments = self._list_segments()
+        for segment in segments:
+            self._load_segment(segment)
+        self._segment = segments[-1] if segments else 1
+        self._file = open(self._segment_path(self._segment), "ab")
+
+        _flusher.register(self)
+
+    @classmethod
+    async def open(cls, directory: str, **kwargs: Any) -> "EventJournal":
+        """
+        Open (or create) a journal without blocking the event loop.
+
+        Scanning the existing segments runs in the running loop's default
+        executor. Takes the same arguments as the constructor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(cls, directory, **kwargs))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._order)
+
+    def __contains__(self, event_id: object) -> bool:
+        with self._lock:
+            return event_id in self._by_id
+
+    @property
+    def tail_event_id(self) -> Optional[str]:
+        """ID of the most recently journaled event, or None if the journal is empty."""
+        with self._lock:
+            return self._order[-1] if self._order else None
+
+    def append(self, event: SessionEvent) -> bool:
+        """
+        Append an event to the journal.
+
+        Events already present (by ID) are skipped, so replaying a history that
+        overlaps the journal is safe.
+
+        Args:
+            event: The event to journal.
+
+        Returns:
+            True if the event was written, False if it was already journaled.
+        """
+        event_id = str(event.id)
+        record = json.dumps(event.to_dict(), separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Journal is closed")
+            if event_id in self._by_id:
+                return False
+            if self._file.tell() + len(record) > self._segment_max_bytes and self._file.tell():
+                self._rotate()
+            offset = self._file.tell()
+            self._file.write(record)
+            self._index(event_id, event.type.value, self._segment, offset)
+            self._pending += 1
+            batch_full = self._pending >= self._fsync_batch_size
+        if batch_full:
+            _flusher.wake()
+        return True
+
+    def read(
+        self, after_event_id: Optional[str] = None, event_type: Optional[str] = None
+    ) -> list[SessionEvent]:
+        """
+        Read journaled events in the order they were appended.
+
+        Args:
+            after_event_id: Only return events journaled after this event.
+            event_type: Only return events of this type (e.g. ``"assistant.message"``).
+
+        Returns:
+            The matching events.
+
+        Raises:
+            ValueError: If ``after_event_id`` is not in the journal.
+        """
+        with self._lock:
+            self._file.flush()
+            if event_type is not None:
+                event_ids = list(self._by_type.get(event_type, []))
+            else:
+                event_ids = list(self._order)
+            if after_event_id is not None:
+                location = self._by_id.get(after_event_id)
+                if location is None:
+                    raise ValueError(f"Event {after_event_id} is not in the journal")
+                event_ids = [i for i in event_ids if self._by_id[i] > location]
+            locations = [self._by_id[i] for i in event_ids]
+
+        return self._read_locations(locations)
+
+    def get(self, event_id: str) -> Optional[SessionEvent]:
+        """Read a single event by ID, or None if it is not in the journal."""
+        with self._lock:
+            location = self._by_id.get(event_id)
+            if location is None:
+                return None
+            self._file.flush()
+        return self._read_locations([location])[0]
+
+    def flush(self) -> None:
+        """Write buffered events to disk and fsync them."""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """Flush pending events, fsync them and close the journal."""
+        file = self._release()
+        if file is not None:
+            _sync_and_close(file)
+
+    def aclose(self) -> "asyncio.Future[None]":
+        """
+        Close the journal without blocking the event loop on the disk.
+
+        The journal stops accepting events and hands its buffered writes to the
+        operating system immediately; the final fsync runs in the running loop's
+        default executor. Await the result to wait for it.
+        """
+        loop = asyncio.get_running_loop()
+        file = self._release()
+        if file is None:
+            done: asyncio.Future[None] = loop.create_future()
+            done.set_result(None)
+            return done
+        return loop.run_in_executor(None, _sync_and_close, file)
+
+    def _release(self) -> Optional[BinaryIO]:
+        """Mark the journal closed and return its flushed file, or None if already closed."""
+        with self._lock:
+            if self._closed:
+                return None
+            self._closed = True
+            self._file.flush()
+            file = self._file
+        _flusher.unregister(self)
+        return file
+
+    def _sync(self) -> None:
+        if self._closed:
+            return
+        self._file.flush()
+        if self._pending:
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def _background_sync(self) -> None:
+        """
+        Fsync pending writes.
+
+        Note:
+            This method is internal. It is called from the shared flusher thread.
+        """
+        with self._lock:
+            if self._closed or not self._pending:
+                return
+            # Flush under the lock, but fsync a duplicate descriptor outside it
+            # so appends from the dispatch path are not blocked on the disk.
+            self._file.flush()
+            self._pending = 0
+            fd = os.dup(self._file.fileno())
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass  # Synced again by the next flush or close
+        finally:
+            os.close(fd)
+
+    def _rotate(self) -> None:
+        self._sync()
+        self._file.close()
+        self._segment += 1
+        self._file = open(self._segment_path(self._segment), "ab")
+
+    def _index(self, event_id: str, event_type: str, segment: int, offset: int) -> None:
+        self._by_id[event_id] = (segment, offset)
+        self._by_type.setdefault(event_type, []).append(event_id)
+        self._order.append(event_id)
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{_SEGMENT_PREFIX}{segment:06d}{_SEGMENT_SUFFIX}")
+
+    def _list_segments(self) -> list[int]:
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX):
+                number = name[len(_SEGMENT_PREFIX) : -len(_SEGMENT_SUFFIX)]
+                if number.isdigit():
+                    segments.append(int(number))
+        return sorted(segments)
+
+    def _load_segment(self, segment: int) -> None:
+        path = self._segment_path(segment)
+        valid_end = 0
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    event_id = record["id"]
+                    event_type = record["type"]
+                except (ValueError, KeyError, TypeError):
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                if event_id not in self._by_id:
+                    self._index(event_id, event_type, segment, offset)
+                offset += len(line)
+                valid_end = offset
+        if valid_end != os.path.getsize(path):
+            # Drop a torn record left behind by a crash mid-write
+            with open(path, "r+b") as f:
+                f.truncate(valid_end)
+
+    def _read_locations(self, locations: list[tuple[int, int]]) -> list[SessionEvent]:
+        events: list[SessionEvent] = []
+        handles: dict[int, BinaryIO] = {}
+        try:
+            for segment, offset in locations:
+                f = handles.get(segment)
+                if f is None:
+                    f = open(self._segment_path(segment), "rb")
+                    handles[segment] = f
+                f.seek(offset)
+                line = f.readline()
+                events.append(session_event_from_dict(json.loads(line)))
+        finally:
+            for f in handles.values():
+                f.close()
+        return events
+
+
+def _sync_and_close(file: BinaryIO) -> None:
+    try:
+        os.fsync(file.fileno())
+    except OSError:
+        pass  # The data was handed to the OS; only durability is lost
+    finally:
+        file.close()
+
+
+class _Flusher:
+    """
+    The single background thread that fsyncs the pending writes of all open journals.
+
+    It wakes every ``fsync_interval`` seconds (the shortest among the open
+    journals), or early when a journal's batch fills up, and exits when no
+    journal is open.
+    """
+
+    def __init__(self) -> None:
+        self._wakeup = threading.Condition()
+        self._journals: set[EventJournal] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, journal: EventJournal) -> None:
+        with self._wakeup:
+            self._journals.add(journal)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="copilot-journal-flusher", daemon=True
+                )
+                self._thread.start()
+
+    def unregister(self, journal: EventJournal) -> None:
+        with self._wakeup:
+            self._journals.discard(journal)
+
+    def wake(self) -> None:
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                if not self._journals:
+                    self._thread = None
+                    return
+                interval = min(journal._fsync_interval for journal in self._journals)
+                self._wakeup.wait(timeout=interval)
+                journals = list(self._journals)
+            for journal in journals:
+                journal._background_sync()
+
+
+_flusher = _Flusher()
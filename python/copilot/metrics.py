@@ -0,0 +1,370 @@
+"""
+Tool execution metrics.
+
+This module provides :class:`ToolMetrics`, which records the queue time, run
+time, result size and outcome of every tool call in fixed log-scale histograms,
+per tool and per session, and can render them in the Prometheus text format.
+The same samples feed the per-tool totals of :class:`ToolExecutionStats`.
+Samples can also be forwarded to other systems through a :class:`MetricsSink`,
+such as :class:`OpenTelemetrySink`.
+"""
+
+import bisect
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Optional, Protocol
+
+# Bucket upper bounds: 0.5ms doubling up to about 65s, and 64B quadrupling up to 64MiB
+TIME_BUCKETS: tuple[float, ...] = tuple(0.0005 * 2**i for i in range(18))
+SIZE_BUCKETS: tuple[float, ...] = tuple(float(64 * 4**i) for i in range(11))
+
+
+@dataclass(frozen=True)
+class ToolCallSample:
+    """The measurements of one tool call."""
+
+    tool_name: str
+    session_id: str
+    # Seconds from receiving the call to starting the handler: waiting for a
+    # concurrency slot and for an executor worker
+    queue_time: float
+    run_time: float  # Seconds spent running the handler
+    result_bytes: int  # Size of the result text returned by the handler
+    # The result type ("success", "failure", "rejected", "denied"), or "error" when
+    # the handler raised, "timeout" when the call exceeded its timeout and "cached"
+    # when the result was served from the tool result cache
+    outcome: str
+    # The size policy action taken on the result ("truncated", "offloaded"), if any
+    action: Optional[str] = None
+
+
+@dataclass
+class ToolExecutionStats:
+    """Totals of the calls of a single tool, derived from its :class:`ToolCallSample`s."""
+
+    calls: int = 0  # Calls received, including rejected and cached ones
+    failures: int = 0  # Calls answered with a failure result
+    timeouts: int = 0  # Calls abandoned after exceeding their timeout
+    rejected: int = 0  # Calls rejected because the tool's queue was full
+    cache_hits: int = 0  # Calls answered from the tool result cache
+    # Seconds spent waiting for a concurrency slot and an executor worker
+    queue_time_total: float = 0.0
+    queue_time_max: float = 0.0
+    run_time_total: float = 0.0  # Seconds spent running the handler
+    run_time_max: float = 0.0
+    results: int = 0  # Results returned, including cached ones
+    result_bytes_total: int = 0  # Size of the result text before any size policy
+    result_bytes_max: int = 0
+    oversized: int = 0  # Results over the tool's size policy limit
+    offloaded: int = 0  # Oversized results saved to the session workspace
+
+    @property
+    def queue_time_avg(self) -> float:
+        """Average seconds a call waited before its handler started."""
+        return self.queue_time_total / self.calls if self.calls else 0.0
+
+    @property
+    def run_time_avg(self) -> float:
+        """Average seconds a call spent running."""
+        return self.run_time_total / self.calls if self.calls else 0.0
+
+    @property
+    def result_bytes_avg(self) -> float:
+        """Average size in bytes of a result's text."""
+        return self.result_bytes_total / self.results if self.results else 0.0
+
+    def _record(self, sample: ToolCallSample) -> None:
+        self.calls += 1
+        if sample.outcome in _FAILED:
+            self.failures += 1
+        if sample.outcome == "timeout":
+            self.timeouts += 1
+        elif sample.outcome == "rejected":
+            self.rejected += 1
+        elif sample.outcome == "cached":
+            self.cache_hits += 1
+        self.queue_time_total += sample.queue_time
+        self.queue_time_max = max(self.queue_time_max, sample.queue_time)
+        self.run_time_total += sample.run_time
+        self.run_time_max = max(self.run_time_max, sample.run_time)
+        self.results += 1
+        self.result_bytes_total += sample.result_bytes
+        self.result_bytes_max = max(self.result_bytes_max, sample.result_bytes)
+        if sample.action is not None:
+            self.oversized += 1
+        if sample.action == "offloaded":
+            self.offloaded += 1
+
+
+# Outcomes answered with a "failure" result
+_FAILED = ("failure", "error", "timeout")
+
+
+class MetricsSink(Protocol):
+    """Receives a sample for every tool call the client executes."""
+
+    def record_tool_call(self, sample: ToolCallSample) -> None:
+        """Record one tool call. Called on the event loop; must not block."""
+        ...
+
+
+class Histogram:
+    """
+    A histogram with fixed bucket bounds.
+
+    Recording a value costs one binary search over the bounds, so histograms are
+    cheap enough to update on every call.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # The last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: "Histogram") -> None:
+        """Add the values recorded by another histogram with the same bounds."""
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile, e.g. ``0.99``, as the upper bound of its bucket.
+
+        Values above the last bound are reported as the last bound.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.bounds[min(i, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+    @property
+    def mean(self) -> float:
+        """The average recorded value."""
+        return self.sum / self.count if self.count else 0.0
+
+    def copy(self) -> "Histogram":
+        """Return an independent copy."""
+        clone = Histogram(self.bounds)
+        clone.merge(self)
+        return clone
+
+
+@dataclass
+class ToolMetricsSnapshot:
+    """Histograms and outcome counts for a tool, or for a tool within one session."""
+
+    queue_time: Histogram = field(default_factory=lambda: Histogram(TIME_BUCKETS))
+    run_time: Histogram = field(default_factory=lambda: Histogram(TIME_BUCKETS))
+    result_bytes: Histogram = field(default_factory=lambda: Histogram(SIZE_BUCKETS))
+    outcomes: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def calls(self) -> int:
+        """The number of recorded calls."""
+        return self.run_time.count
+
+    def _record(self, sample: ToolCallSample) -> None:
+        self.queue_time.observe(sample.queue_time)
+        self.run_time.observe(sample.run_time)
+        self.result_bytes.observe(sample.result_bytes)
+        self.outcomes[sample.outcome] = self.outcomes.get(sample.outcome, 0) + 1
+
+    def _copy(self) -> "ToolMetricsSnapshot":
+        return ToolMetricsSnapshot(
+            self.queue_time.copy(),
+            self.run_time.copy(),
+            self.result_bytes.copy(),
+            dict(self.outcomes),
+        )
+
+
+class ToolMetrics:
+    """
+    The client's built-in metrics sink.
+
+    Keeps histograms per tool, and per tool and session for the most recently
+    active sessions, and the per-tool totals reported by
+    :meth:`CopilotClient.get_tool_stats`.
+
+    Example:
+        >>> metrics = client.tool_metrics
+        >>> for name, tool in metrics.snapshot().items():
+        ...     print(name, tool.calls, tool.run_time.quantile(0.95), tool.outcomes)
+        >>> print(metrics.to_prometheus())
+    """
+
+    def __init__(self, max_sessions: int = 1000):
+        """
+        Initialize the metrics.
+
+        Args:
+            max_sessions: Sessions whose per-session figures are kept; figures of
+                the least recently active sessions are dropped beyond this.
+        """
+        self._lock = threading.Lock()
+        self._max_sessions = max_sessions
+        self._tools: dict[str, ToolMetricsSnapshot] = {}
+        self._totals: dict[str, ToolExecutionStats] = {}
+        self._sessions: OrderedDict[str, dict[str, ToolMetricsSnapshot]] = OrderedDict()
+
+    def record_tool_call(self, sample: ToolCallSample) -> None:
+        """Record one tool call."""
+        with self._lock:
+            tool = self._tools.get(sample.tool_name)
+            if tool is None:
+                tool = self._tools[sample.tool_name] = ToolMetricsSnapshot()
+            tool._record(sample)
+            totals = self._totals.get(sample.tool_name)
+            if totals is None:
+                totals = self._totals[sample.tool_name] = ToolExecutionStats()
+            totals._record(sample)
+
+            if self._max_sessions <= 0:
+                return
+            session = self._sessions.get(sample.session_id)
+            if session is None:
+                session = self._sessions[sample.session_id] = {}
+                if len(self._sessions) > self._max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(sample.session_id)
+            per_session = session.get(sample.tool_name)
+            if per_session is None:
+                per_session = session[sample.tool_name] = ToolMetricsSnapshot()
+            per_session._record(sample)
+
+    def snapshot(self, session_id: Optional[str] = None) -> dict[str, ToolMetricsSnapshot]:
+        """
+        Get a copy of the figures, keyed by tool name.
+
+        Args:
+            session_id: Only include calls from this session.
+        """
+        with self._lock:
+            tools = self._tools if session_id is None else self._sessions.get(session_id, {})
+            return {name: tool._copy() for name, tool in tools.items()}
+
+    def totals(self) -> dict[str, ToolExecutionStats]:
+        """Get a copy of the per-tool totals, keyed by tool name."""
+        with self._lock:
+            return {name: replace(totals) for name, totals in self._totals.items()}
+
+    def drop_session(self, session_id: str) -> None:
+        """Forget the per-session figures of a session."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def reset(self) -> None:
+        """Forget all recorded figures."""
+        with self._lock:
+            self._tools.clear()
+            self._totals.clear()
+            self._sessions.clear()
+
+    def to_prometheus(self, prefix: str = "copilot_tool") -> str:
+        """
+        Render the per-tool figures in the Prometheus text exposition format.
+
+        Args:
+            prefix: Prefix of the metric names.
+
+        Returns:
+            The exposition text, e.g. for an HTTP ``/metrics`` handler.
+        """
+        tools = self.snapshot()
+        lines: list[str] = []
+        for suffix, attr, help_text in (
+            ("queue_seconds", "queue_time", "Time tool calls waited before running."),
+            ("run_seconds", "run_time", "Time spent running tool handlers."),
+            ("result_bytes", "result_bytes", "Size of tool results."),
+        ):
+            name = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for tool_name, tool in sorted(tools.items()):
+                histogram: Histogram = getattr(tool, attr)
+                label = f'tool="{_escape(tool_name)}"'
+                cumulative = 0
+                for bound, count in zip(histogram.bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{label},le="{bound:g}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{label},le="+Inf"}} {histogram.count}')
+                lines.append(f"{name}_sum{{{label}}} {histogram.sum:g}")
+                lines.append(f"{name}_count{{{label}}} {histogram.count}")
+        name = f"{prefix}_calls_total"
+        lines.append(f"# HELP {name} Tool calls by outcome.")
+        lines.append(f"# TYPE {name} counter")
+        for tool_name, tool in sorted(tools.items()):
+            for outcome, count in sorted(tool.outcomes.items()):
+                lines.append(
+                    f'{name}{{tool="{_escape(tool_name)}",outcome="{_escape(outcome)}"}} {count}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetrySink:
+    """
+    Forwards tool call samples to OpenTelemetry histograms.
+
+    Requires the ``opentelemetry-api`` package.
+
+    Example:
+        >>> client = CopilotClient({"tool_metrics_sinks": [OpenTelemetrySink()]})
+    """
+
+    def __init__(self, meter: Optional[Any] = None, prefix: str = "copilot.tool"):
+        """
+        Create the instruments.
+
+        Args:
+            meter: The OpenTelemetry meter (default: one named "copilot").
+            prefix: Prefix of the instrument names.
+
+        Raises:
+            ImportError: If OpenTelemetry is not installed.
+        """
+        if meter is None:
+            try:
+                from opentelemetry import metrics
+            except ImportError as exc:
+                raise ImportError(
+                    "OpenTelemetrySink requires the opentelemetry-api package"
+                ) from exc
+            meter = metrics.get_meter("copilot")
+        self._queue_time = meter.create_histogram(
+            f"{prefix}.queue_time", unit="s", description="Time tool calls waited before running"
+        )
+        self._run_time = meter.create_histogram(
+            f"{prefix}.run_time", unit="s", description="Time spent running tool handlers"
+        )
+        self._result_size = meter.create_histogram(
+            f"{prefix}.result_size", unit="By", description="Size of tool results"
+        )
+
+    def record_tool_call(self, sample: ToolCallSample) -> None:
+        """Record one tool call."""
+        attributes = {"tool": sample.tool_name, "outcome": sample.outcome}
+        self._queue_time.record(sample.queue_time, attributes)
+        self._run_time.record(sample.run_time, attributes)
+        self._result_size.record(sample.result_bytes, attributes)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
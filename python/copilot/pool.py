@@ -0,0 +1,267 @@
+"""
+Pre-warmed session pool for the Copilot SDK.
+
+This module provides the :class:`SessionPool` class, which keeps a number of
+sessions created ahead of time so that short-lived requests do not wait on a
+``session.create`` round-trip.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Optional, Union
+
+from .session import CopilotSession
+from .templates import SessionTemplate
+from .types import SessionConfig
+
+
+@dataclass
+class SessionPoolStats:
+    """Counters and latency figures for a :class:`SessionPool`."""
+
+    hits: int = 0  # Acquisitions served from a pre-created session
+    misses: int = 0  # Acquisitions that had to create a session on demand
+    created: int = 0  # Sessions created by the pool (refills and misses)
+    destroyed: int = 0  # Sessions destroyed by the pool
+    refill_failures: int = 0  # Background creations that raised
+    refills: int = 0  # Successful background creations
+    refill_latency_total: float = 0.0  # Seconds spent in successful background creations
+    refill_latency_max: float = 0.0  # Slowest successful background creation, in seconds
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of acquisitions served from the pool (0.0 when nothing was acquired)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def refill_latency_avg(self) -> float:
+        """Average background creation latency in seconds."""
+        return self.refill_latency_total / self.refills if self.refills else 0.0
+
+
+class SessionPool:
+    """
+    Keeps sessions pre-created from a single configuration.
+
+    :meth:`acquire` hands out a ready session immediately when one is available
+    and a background task creates replacements. With ``isolate=True`` (the
+    default) released sessions are destroyed instead of being handed out again,
+    so no conversation state leaks between users.
+
+    Example:
+        >>> pool = SessionPool(client, {"model": "gpt-5"}, size=8)
+        >>> await pool.start()
+        >>> async with pool.session() as session:
+        ...     await session.send_and_wait({"prompt": "Hello"})
+        >>> print(pool.stats().hit_rate)
+        >>> await pool.close()
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        config: Optional[Union[SessionConfig, SessionTemplate]] = None,
+        size: int = 4,
+        isolate: bool = True,
+    ):
+        """
+        Initialize a new SessionPool.
+
+        Args:
+            client: The :class:`CopilotClient` used to create and destroy sessions.
+            config: The configuration every pooled session is created with, or a
+                :class:`SessionTemplate`. It must not set ``session_id``. A plain
+                configuration is compiled into a template once, up front.
+            size: Number of idle sessions to keep ready.
+            isolate: When True, released sessions are destroyed rather than reused.
+
+        Raises:
+            ValueError: If ``size`` is negative or ``config`` sets ``session_id``.
+        """
+        if size < 0:
+            raise ValueError("size must be non-negative")
+        template = config if isinstance(config, SessionTemplate) else SessionTemplate(config)
+        if template.session_id:
+            raise ValueError("Pooled session configs must not set session_id")
+        self._client = client
+        self._template = template
+        self._size = size
+        self._isolate = isolate
+        self._idle: list[CopilotSession] = []
+        self._creating = 0
+        self._stats = SessionPoolStats()
+        self._closed = False
+        self._refill_wakeup: Optional[asyncio.Event] = None
+        self._refill_task: Optional[asyncio.Task] = None
+        self._background: set[asyncio.Task] = set()
+
+    @property
+    def idle_count(self) -> int:
+        """Number of pre-created sessions ready to be acquired."""
+        return len(self._idle)
+
+    def stats(self) -> SessionPoolStats:
+        """Get a snapshot of the pool's counters."""
+        return replace(self._stats)
+
+    async def start(self) -> None:
+        """
+        Fill the pool and start refilling it in the background.
+
+        Waits until the initial sessions have been created.
+        """
+        if self._refill_task is not None:
+            return
+        self._refill_wakeup = asyncio.Event()
+        await self._refill()
+        self._refill_task = asyncio.create_task(self._refill_loop())
+
+    async def acquire(self) -> CopilotSession:
+        """
+        Take a session from the pool.
+
+        Returns a pre-created session when one is available; otherwise creates
+        one on demand.
+
+        Returns:
+            A session owned by the caller until passed to :meth:`release`.
+
+        Raises:
+            RuntimeError: If the pool is closed.
+        """
+        if self._closed:
+            raise RuntimeError("Session pool is closed")
+        if self._idle:
+            session = self._idle.pop()
+            self._stats.hits += 1
+            self._wake_refill()
+            return session
+
+        self._stats.misses += 1
+        self._wake_refill()
+        session = await self._client.create_session(self._template)
+        self._stats.created += 1
+        return session
+
+    async def release(self, session: CopilotSession) -> None:
+        """
+        Return a session previously obtained from :meth:`acquire`.
+
+        With ``isolate=True``, or when the pool is already full, the session is
+        destroyed in the background.
+
+        Args:
+            session: The session to release.
+        """
+        if not self._isolate and not self._closed and len(self._idle) < self._size:
+            self._idle.append(session)
+            return
+        self._spawn(self._destroy(session))
+
+    def session(self) -> "_PooledSession":
+        """
+        Acquire a session for the duration of an ``async with`` block.
+
+        Example:
+            >>> async with pool.session() as session:
+            ...     await session.send_and_wait({"prompt": "Hi"})
+        """
+        return _PooledSession(self)
+
+    async def close(self) -> None:
+        """
+        Stop refilling and destroy all idle sessions.
+
+        Sessions currently acquired are not affected.
+        """
+        self._closed = True
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(self._destroy(session) for session in idle))
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+    async def __aenter__(self) -> "SessionPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _wake_refill(self) -> None:
+        if self._refill_wakeup is not None:
+            self._refill_wakeup.set()
+
+    async def _refill_loop(self) -> None:
+        assert self._refill_wakeup is not None
+        while not self._closed:
+            await self._refill_wakeup.wait()
+            self._refill_wakeup.clear()
+            await self._refill()
+
+    async def _refill(self) -> None:
+        deficit = self._size - len(self._idle) - self._creating
+        if deficit <= 0 or self._closed:
+            return
+        self._creating += deficit
+        try:
+            await asyncio.gather(*(self._create_one() for _ in range(deficit)))
+        finally:
+            self._creating -= deficit
+
+    async def _create_one(self) -> None:
+        started = time.perf_counter()
+        try:
+            session = await self._client.create_session(self._template)
+        except Exception:
+            self._stats.refill_failures += 1
+            return
+        elapsed = time.perf_counter() - started
+        self._stats.created += 1
+        self._stats.refills += 1
+        self._stats.refill_latency_total += elapsed
+        self._stats.refill_latency_max = max(self._stats.refill_latency_max, elapsed)
+        if self._closed:
+            await self._destroy(session)
+        else:
+            self._idle.append(session)
+
+    async def _destroy(self, session: CopilotSession) -> None:
+        try:
+            await session.destroy()
+        except Exception:
+            pass  # Session may already be gone server-side
+        else:
+            self._stats.destroyed += 1
+        self._client._forget_session(session.session_id)
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+
+class _PooledSession:
+    """Async context manager returned by :meth:`SessionPool.session`."""
+
+    def __init__(self, pool: SessionPool):
+        self._pool = pool
+        self._session: Optional[CopilotSession] = None
+
+    async def __aenter__(self) -> CopilotSession:
+        self._session = await self._pool.acquire()
+        return self._session
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._session is not None:
+            await self._pool.release(self._session)
+            self._session = None
@@ -0,0 +1,295 @@
+"""
+Event-invalidated caching of session RPC reads.
+
+This module provides :class:`CachedSessionRpc`, a drop-in :class:`SessionRpc`
+that serves ``plan.read``, ``mode.get``, ``model.get_current`` and
+``workspace.list_files`` from memory. Entries are filled on first read and then
+kept current from the session's ``plan_changed``, ``mode_changed``,
+``model_change`` and ``workspace_file_changed`` events and from the session's
+own writes, so repeated reads do not cost a round trip.
+"""
+
+import threading
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Optional, TypeVar
+
+from .generated.rpc import (
+    Mode,
+    ModeApi,
+    ModelApi,
+    PlanApi,
+    SessionModeGetResult,
+    SessionModelGetCurrentResult,
+    SessionModelSwitchToParams,
+    SessionModelSwitchToResult,
+    SessionModeSetParams,
+    SessionModeSetResult,
+    SessionPlanDeleteResult,
+    SessionPlanReadResult,
+    SessionPlanUpdateParams,
+    SessionPlanUpdateResult,
+    SessionRpc,
+    SessionWorkspaceCreateFileParams,
+    SessionWorkspaceCreateFileResult,
+    SessionWorkspaceListFilesResult,
+    WorkspaceApi,
+)
+from .generated.session_events import Operation, SessionEvent, SessionEventType
+
+T = TypeVar("T")
+
+
+@dataclass
+class RpcCacheStats:
+    """Counters for a :class:`CachedSessionRpc`."""
+
+    hits: int = 0
+    misses: int = 0  # Reads sent to the server
+    invalidations: int = 0  # Entries dropped because an event did not carry the new value
+    updates: int = 0  # Entries patched from events or the session's own writes
+    # Seconds since served entries were last fetched or patched
+    age_total: float = 0.0
+    age_max: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of reads served from the cache."""
+        reads = self.hits + self.misses
+        return self.hits / reads if reads else 0.0
+
+    @property
+    def age_avg(self) -> float:
+        """The average age of entries served from the cache."""
+        return self.age_total / self.hits if self.hits else 0.0
+
+
+class _RpcCache:
+    """
+    Cached results in wire format, keyed by method.
+
+    Every read returns a newly parsed result, so callers may modify what they get.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[float, dict[str, Any]]] = {}
+        # Bumped whenever an entry changes, so that a read started before the
+        # change does not store an outdated result
+        self._generations: dict[str, int] = {}
+        self._stats = RpcCacheStats()
+
+    async def get(
+        self,
+        key: str,
+        parse: Callable[[Any], T],
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> T:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.monotonic() - entry[0]
+                self._stats.hits += 1
+                self._stats.age_total += age
+                self._stats.age_max = max(self._stats.age_max, age)
+                return parse(entry[1])
+            self._stats.misses += 1
+            generation = self._generations.get(key, 0)
+        result = await fetch()
+        with self._lock:
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = (time.monotonic(), result.to_dict())
+        return result
+
+    def set(self, key: str, data: dict[str, Any]) -> None:
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries[key] = (time.monotonic(), data)
+            self._stats.updates += 1
+
+    def update(self, key: str, patch: Callable[[dict[str, Any]], dict[str, Any]]) -> None:
+        """Patch an entry if it is cached."""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (time.monotonic(), patch(entry[1]))
+                self._stats.updates += 1
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            keys = list(self._entries) if key is None else [key]
+            for k in keys:
+                self._generations[k] = self._generations.get(k, 0) + 1
+                if self._entries.pop(k, None) is not None:
+                    self._stats.invalidations += 1
+
+    def stats(self) -> RpcCacheStats:
+        with self._lock:
+            return replace(self._stats)
+
+
+class CachedModelApi(ModelApi):
+    """:class:`ModelApi` with a cached ``get_current``."""
+
+    def __init__(self, client: Any, session_id: str, cache: _RpcCache):
+        super().__init__(client, session_id)
+        self._cache = cache
+
+    async def get_current(self) -> SessionModelGetCurrentResult:
+        return await self._cache.get(
+            "model",
+            SessionModelGetCurrentResult.from_dict,
+            lambda: ModelApi.get_current(self),
+        )
+
+    async def switch_to(self, params: SessionModelSwitchToParams) -> SessionModelSwitchToResult:
+        result = await super().switch_to(params)
+        self._cache.set("model", {"modelId": result.model_id or params.model_id})
+        return result
+
+
+class CachedModeApi(ModeApi):
+    """:class:`ModeApi` with a cached ``get``."""
+
+    def __init__(self, client: Any, session_id: str, cache: _RpcCache):
+        super().__init__(client, session_id)
+        self._cache = cache
+
+    async def get(self) -> SessionModeGetResult:
+        return await self._cache.get(
+            "mode", SessionModeGetResult.from_dict, lambda: ModeApi.get(self)
+        )
+
+    async def set(self, params: SessionModeSetParams) -> SessionModeSetResult:
+        result = await super().set(params)
+        self._cache.set("mode", {"mode": result.mode.value})
+        return result
+
+
+class CachedPlanApi(PlanApi):
+    """:class:`PlanApi` with a cached ``read``."""
+
+    def __init__(self, client: Any, session_id: str, cache: _RpcCache):
+        super().__init__(client, session_id)
+        self._cache = cache
+
+    async def read(self) -> SessionPlanReadResult:
+        return await self._cache.get(
+            "plan", SessionPlanReadResult.from_dict, lambda: PlanApi.read(self)
+        )
+
+    async def update(self, params: SessionPlanUpdateParams) -> SessionPlanUpdateResult:
+        result = await super().update(params)
+        self._cache.set("plan", {"exists": True, "content": params.content})
+        return result
+
+    async def delete(self) -> SessionPlanDeleteResult:
+        result = await super().delete()
+        self._cache.set("plan", {"exists": False, "content": None})
+        return result
+
+
+class CachedWorkspaceApi(WorkspaceApi):
+    """:class:`WorkspaceApi` with a cached ``list_files``."""
+
+    def __init__(self, client: Any, session_id: str, cache: _RpcCache):
+        super().__init__(client, session_id)
+        self._cache = cache
+
+    async def list_files(self) -> SessionWorkspaceListFilesResult:
+        return await self._cache.get(
+            "files",
+            SessionWorkspaceListFilesResult.from_dict,
+            lambda: WorkspaceApi.list_files(self),
+        )
+
+    async def create_file(
+        self, params: SessionWorkspaceCreateFileParams
+    ) -> SessionWorkspaceCreateFileResult:
+        result = await super().create_file(params)
+        self._cache.update("files", lambda data: _with_file(data, params.path))
+        return result
+
+
+class CachedSessionRpc(SessionRpc):
+    """
+    Session RPC methods with cached plan, mode, model and workspace listings.
+
+    Enabled with the ``rpc_cache`` session option, after which ``session.rpc``
+    returns an instance of this class. Events that carry the new value, such as
+    ``session.model_change``, update the cache in place; events that do not,
+    such as ``session.plan_changed``, drop the entry so the next read fetches it.
+
+    Example:
+        >>> session = await client.create_session({"model": "gpt-5", "rpc_cache": True})
+        >>> plan = await session.rpc.plan.read()  # Fetched
+        >>> plan = await session.rpc.plan.read()  # Served from memory
+        >>> print(session.rpc.cache_stats().hit_rate)
+    """
+
+    def __init__(self, client: Any, session_id: str):
+        super().__init__(client, session_id)
+        self._cache = _RpcCache()
+        self.model = CachedModelApi(client, session_id, self._cache)
+        self.mode = CachedModeApi(client, session_id, self._cache)
+        self.plan = CachedPlanApi(client, session_id, self._cache)
+        self.workspace = CachedWorkspaceApi(client, session_id, self._cache)
+
+    def cache_stats(self) -> RpcCacheStats:
+        """Get a snapshot of the cache counters."""
+        return self._cache.stats()
+
+    def invalidate(self) -> None:
+        """Drop all cached results, e.g. after reconnecting and possibly missing events."""
+        self._cache.invalidate()
+
+    def _file_written(self, path: str) -> None:
+        """
+        Add a file written directly to the local workspace directory to the cached listing.
+
+        Note:
+            This method is internal. Such writes bypass the workspace RPC methods,
+            so no session.workspace_file_changed event reports them.
+        """
+        self._cache.update("files", lambda data: _with_file(data, path))
+
+    def _handle_event(self, event: SessionEvent) -> None:
+        """
+        Update the cache from a session event.
+
+        Note:
+            This method is internal. It is called for every event the session dispatches.
+        """
+        data = event.data
+        if event.type == SessionEventType.SESSION_MODEL_CHANGE:
+            if data.new_model:
+                self._cache.set("model", {"modelId": data.new_model})
+            else:
+                self._cache.invalidate("model")
+        elif event.type == SessionEventType.SESSION_MODE_CHANGED:
+            if data.new_mode in _MODES:
+                self._cache.set("mode", {"mode": data.new_mode})
+            else:
+                self._cache.invalidate("mode")
+        elif event.type == SessionEventType.SESSION_PLAN_CHANGED:
+            if data.operation == Operation.DELETE:
+                self._cache.set("plan", {"exists": False, "content": None})
+            else:
+                self._cache.invalidate("plan")
+        elif event.type == SessionEventType.SESSION_WORKSPACE_FILE_CHANGED:
+            # Updates to existing files leave the listing unchanged
+            if data.path and data.operation == Operation.CREATE:
+                path = data.path
+                self._cache.update("files", lambda files: _with_file(files, path))
+            elif data.operation != Operation.UPDATE:
+                self._cache.invalidate("files")
+
+
+_MODES = frozenset(mode.value for mode in Mode)
+
+
+def _with_file(data: dict[str, Any], path: str) -> dict[str, Any]:
+    files = data.get("files", [])
+    return data if path in files else {**data, "files": [*files, path]}
@@ -0,0 +1,208 @@
+"""
+Concurrency limits for tool calls.
+
+This module provides :class:`ToolScheduler`, which enforces the
+``max_concurrency``, ``per_session_max`` and ``max_queue`` limits declared on a
+:class:`Tool`. Calls over the limit wait in per-session queues that are served
+round-robin, so one busy session cannot starve the others.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
+from typing import Any
+
+from .types import Tool
+
+
+class ToolQueueFullError(Exception):
+    """Raised when a tool call is rejected because the tool's queue is full."""
+
+
+@dataclass
+class ToolQueueStats:
+    """Queueing figures for the calls of a single tool."""
+
+    admitted: int = 0  # Calls that got a concurrency slot
+    queued: int = 0  # Calls that had to wait for a slot
+    rejected: int = 0  # Calls rejected because the queue was full
+    wait_time_total: float = 0.0  # Seconds queued calls spent waiting
+    wait_time_max: float = 0.0
+    max_queue_depth: int = 0  # Largest number of calls waiting at once
+
+    @property
+    def wait_time_avg(self) -> float:
+        """Average seconds a queued call waited for a slot."""
+        return self.wait_time_total / self.queued if self.queued else 0.0
+
+
+class _ToolQueue:
+    """Slots and waiting calls of one tool."""
+
+    __slots__ = ("running", "running_by_session", "waiting", "depth", "stats")
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.running_by_session: dict[str, int] = {}
+        # session ID -> waiting futures, in round-robin order
+        self.waiting: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self.depth = 0
+        self.stats = ToolQueueStats()
+
+
+class ToolScheduler:
+    """
+    Admits tool calls according to each tool's concurrency limits.
+
+    Tools without limits are admitted immediately. For limited tools, a call
+    runs when the tool has fewer than ``max_concurrency`` calls running and the
+    calling session has fewer than ``per_session_max``. Otherwise the call waits
+    in its session's queue; when a slot frees up, sessions with waiting calls
+    are served in turn. If ``max_queue`` calls are already waiting, the call is
+    rejected with :class:`ToolQueueFullError`.
+
+    Example:
+        >>> scheduler = ToolScheduler()
+        >>> async with scheduler.slot(tool, session_id):
+        ...     result = await run_tool()
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._queues: dict[str, _ToolQueue] = {}
+
+    def slot(self, tool: Tool, session_id: str) -> "_ToolSlot":
+        """
+        Wait for a concurrency slot for a call of ``tool`` from ``session_id``.
+
+        Returns:
+            An async context manager holding the slot for the duration of the block.
+
+        Raises:
+            ToolQueueFullError: On entering the block, if the tool's queue is full.
+        """
+        return _ToolSlot(self, tool, session_id)
+
+    def stats(self) -> dict[str, ToolQueueStats]:
+        """Get a snapshot of the queueing figures, keyed by tool name."""
+        with self._lock:
+            return {name: replace(queue.stats) for name, queue in self._queues.items()}
+
+    async def _acquire(self, tool: Tool, session_id: str) -> bool:
+        if tool.max_concurrency is None and tool.per_session_max is None:
+            return False
+
+        with self._lock:
+            queue = self._queues.get(tool.name)
+            if queue is None:
+                queue = self._queues[tool.name] = _ToolQueue()
+            # Calls already waiting go first, so a new call never overtakes them
+            if not queue.depth and self._has_capacity(tool, queue, session_id):
+                self._admit(queue, session_id)
+                return True
+            if tool.max_queue is not None and queue.depth >= tool.max_queue:
+                queue.stats.rejected += 1
+                raise ToolQueueFullError(f"Queue for tool '{tool.name}' is full")
+            waiter: asyncio.Future = asyncio.get_running_loop().create_future()
+            queue.waiting.setdefault(session_id, deque()).append(waiter)
+            queue.depth += 1
+            queue.stats.queued += 1
+            queue.stats.max_queue_depth = max(queue.stats.max_queue_depth, queue.depth)
+            # Other sessions' waiting calls may be blocked only by their per-session
+            # limit, leaving a slot this call can take right away.
+            self._dispatch(tool, queue)
+
+        started = time.perf_counter()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.done() and not waiter.cancelled():
+                    # Admitted just before being cancelled: hand the slot on
+                    self._release_locked(tool, queue, session_id)
+                else:
+                    self._discard_waiter(queue, session_id, waiter)
+            raise
+        waited = time.perf_counter() - started
+        with self._lock:
+            queue.stats.wait_time_total += waited
+            queue.stats.wait_time_max = max(queue.stats.wait_time_max, waited)
+        return True
+
+    def _release(self, tool: Tool, session_id: str) -> None:
+        with self._lock:
+            self._release_locked(tool, self._queues[tool.name], session_id)
+
+    def _release_locked(self, tool: Tool, queue: _ToolQueue, session_id: str) -> None:
+        queue.running -= 1
+        remaining = queue.running_by_session[session_id] - 1
+        if remaining:
+            queue.running_by_session[session_id] = remaining
+        else:
+            del queue.running_by_session[session_id]
+        self._dispatch(tool, queue)
+
+    def _dispatch(self, tool: Tool, queue: _ToolQueue) -> None:
+        # Serve sessions in turn: admit the first eligible session's oldest call,
+        # then move that session to the back of the line.
+        progress = True
+        while progress and queue.depth:
+            progress = False
+            for session_id in list(queue.waiting):
+                if not self._has_capacity(tool, queue, session_id):
+                    continue
+                waiters = queue.waiting[session_id]
+                waiter = waiters.popleft()
+                queue.depth -= 1
+                if waiters:
+                    queue.waiting.move_to_end(session_id)
+                else:
+                    del queue.waiting[session_id]
+                progress = True
+                if not waiter.done():  # Skip calls cancelled while waiting
+                    self._admit(queue, session_id)
+                    waiter.set_result(None)
+                break
+
+    def _discard_waiter(self, queue: _ToolQueue, session_id: str, waiter: asyncio.Future) -> None:
+        waiters = queue.waiting.get(session_id)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            queue.depth -= 1
+            if not waiters:
+                del queue.waiting[session_id]
+
+    def _has_capacity(self, tool: Tool, queue: _ToolQueue, session_id: str) -> bool:
+        if tool.max_concurrency is not None and queue.running >= tool.max_concurrency:
+            return False
+        if (
+            tool.per_session_max is not None
+            and queue.running_by_session.get(session_id, 0) >= tool.per_session_max
+        ):
+            return False
+        return True
+
+    def _admit(self, queue: _ToolQueue, session_id: str) -> None:
+        queue.running += 1
+        queue.running_by_session[session_id] = queue.running_by_session.get(session_id, 0) + 1
+        queue.stats.admitted += 1
+
+
+class _ToolSlot:
+    """Async context manager returned by :meth:`ToolScheduler.slot`."""
+
+    def __init__(self, scheduler: ToolScheduler, tool: Tool, session_id: str):
+        self._scheduler = scheduler
+        self._tool = tool
+        self._session_id = session_id
+        self._held = False
+
+    async def __aenter__(self) -> None:
+        self._held = await self._scheduler._acquire(self._tool, self._session_id)
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._held:
+            self._held = False
+            self._scheduler._release(self._tool, self._session_id)
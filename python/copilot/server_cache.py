@@ -0,0 +1,253 @@
+"""
+Caching of server-scoped reads.
+
+This module provides the cache behind :meth:`CopilotClient.list_models`,
+:meth:`CopilotClient.get_status` and :meth:`CopilotClient.get_quota`,
+configured with the ``server_cache`` client option. Every method has its own
+TTL, entries past their TTL can be served while they are refreshed in the
+background, and results can be kept in an on-disk cache keyed by auth identity
+and CLI build, so short-lived processes sharing a login skip these requests when
+starting.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Optional
+
+from .types import ServerCacheOptions
+
+if TYPE_CHECKING:
+    from .jsonrpc import JsonRpcClient
+
+_DISK_FORMAT = 3
+
+
+@dataclass
+class ServerCacheStats:
+    """Counters for the server read cache of a :class:`CopilotClient`."""
+
+    hits: int = 0
+    stale_hits: int = 0  # Entries served past their TTL while being refreshed
+    misses: int = 0  # Reads the caller waited on the server for
+    refreshes: int = 0  # Background refreshes of stale entries
+    disk_loads: int = 0  # Entries read from the on-disk cache
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of reads served from the cache."""
+        served = self.hits + self.stale_hits
+        reads = served + self.misses
+        return served / reads if reads else 0.0
+
+
+class _ServerCache:
+    """
+    Results of ``models.list``, ``status.get`` and ``account.getQuota`` in wire format.
+
+    Entries are stamped with wall-clock time so that they keep their age when
+    shared through the on-disk cache. Every read returns the stored result, which
+    callers parse into new objects.
+
+    Only methods with a finite TTL use the on-disk cache. Each method has its
+    own file, which is only read when it was written for the same CLI build.
+    Files are replaced atomically, so processes writing concurrently never
+    lose each other's entries for other methods.
+    """
+
+    def __init__(
+        self,
+        options: ServerCacheOptions,
+        identity: Optional[str] = None,
+        build: Optional[str] = None,
+    ):
+        """
+        Args:
+            options: The ``server_cache`` client option.
+            identity: Identity derived from the client options, used unless the
+                ``identity`` option is set.
+            build: Identifies the CLI build; entries written for another build
+                are ignored.
+        """
+        self._ttls: dict[str, Optional[float]] = {
+            "models.list": options.get("models_ttl"),
+            "status.get": options.get("status_ttl", 0.0),
+            "account.getQuota": options.get("quota_ttl", 0.0),
+        }
+        self._stale_ttl = options.get("stale_ttl", 0.0)
+        self._build = build
+        self._disk_prefix: Optional[str] = None
+        identity = options.get("identity", identity)
+        disk_dir = options.get("disk_dir")
+        if disk_dir and identity is not None and build is not None:
+            digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()
+            self._disk_prefix = os.path.join(disk_dir, digest[:32])
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._refreshes: dict[str, asyncio.Task[None]] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._stats = ServerCacheStats()
+
+    def stats(self) -> ServerCacheStats:
+        """Get a snapshot of the counters."""
+        return replace(self._stats)
+
+    def clear(self) -> None:
+        """Drop the in-memory entries and stop background refreshes."""
+        for task in self._refreshes.values():
+            task.cancel()
+        self._refreshes.clear()
+        self._entries.clear()
+        self._loaded = False
+
+    async def get(self, method: str, connection: "JsonRpcClient") -> Any:
+        """
+        Get the result of ``method``, from the cache when it is fresh enough.
+
+        Raises:
+            Exception: If the server request fails and no usable entry exists.
+        """
+        ttl = self._ttls[method]
+        if ttl is not None and ttl <= 0:
+            return await connection.request(method, {})
+        if not self._loaded and self._disk_prefix is not None:
+            await self._load()
+
+        result = self._lookup(method, ttl, connection)
+        if result is not None:
+            return result
+        lock = self._locks.setdefault(method, asyncio.Lock())
+        async with lock:
+            # Another caller may have fetched it while this one waited
+            result = self._lookup(method, ttl, connection, count=False)
+            if result is not None:
+                self._stats.hits += 1
+                return result
+            self._stats.misses += 1
+            result = await connection.request(method, {})
+            await self._store(method, result)
+            return result
+
+    def _on_disk(self, method: str) -> bool:
+        """Whether ``method`` uses the on-disk cache, which needs a finite TTL."""
+        ttl = self._ttls.get(method)
+        return self._disk_prefix is not None and ttl is not None and ttl > 0
+
+    def _disk_path(self, method: str) -> str:
+        assert self._disk_prefix is not None
+        return f"{self._disk_prefix}-{method}.json"
+
+    def _lookup(
+        self,
+        method: str,
+        ttl: Optional[float],
+        connection: "JsonRpcClient",
+        count: bool = True,
+    ) -> Any:
+        entry = self._entries.get(method)
+        if entry is None:
+            return None
+        fetched_at, result = entry
+        age = time.time() - fetched_at
+        if ttl is None or age < ttl:
+            if count:
+                self._stats.hits += 1
+            return result
+        if age < ttl + self._stale_ttl:
+            if count:
+                self._stats.stale_hits += 1
+            refresh = self._refreshes.get(method)
+            if refresh is None or refresh.done():
+                self._refreshes[method] = asyncio.ensure_future(self._refresh(method, connection))
+            return result
+        return None
+
+    async def _refresh(self, method: str, connection: "JsonRpcClient") -> None:
+        try:
+            result = await connection.request(method, {})
+        except Exception:
+            return  # Served stale until the entry expires, then fetched by the caller
+        self._stats.refreshes += 1
+        await self._store(method, result)
+
+    async def _store(self, method: str, result: Any) -> None:
+        fetched_at = time.time()
+        self._entries[method] = (fetched_at, result)
+        if self._on_disk(method):
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(
+                    None,
+                    _write_disk_entry,
+                    self._disk_path(method),
+                    self._build,
+                    fetched_at,
+                    result,
+                )
+            except OSError:
+                pass  # The on-disk cache is an optimization only
+
+    async def _load(self) -> None:
+        """Read the on-disk entries once per connection."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            paths = {
+                method: self._disk_path(method) for method in self._ttls if self._on_disk(method)
+            }
+            loop = asyncio.get_running_loop()
+            entries = await loop.run_in_executor(None, _read_disk_entries, paths, self._build)
+            for method, (fetched_at, result) in entries.items():
+                if method not in self._entries:
+                    self._entries[method] = (fetched_at, result)
+                    self._stats.disk_loads += 1
+
+
+def _read_disk_entries(paths: dict[str, str], build: str) -> dict[str, tuple[float, Any]]:
+    """Read the entry of every method from its file, skipping missing or foreign ones."""
+    entries: dict[str, tuple[float, Any]] = {}
+    for method, path in paths.items():
+        entry = _read_disk_entry(path, build)
+        if entry is not None:
+            entries[method] = entry
+    return entries
+
+
+def _read_disk_entry(path: str, build: str) -> Optional[tuple[float, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("format") != _DISK_FORMAT:
+        return None
+    if data.get("build") != build:
+        return None  # Written for another CLI build, whose results may differ
+    try:
+        return float(data["fetchedAt"]), data["result"]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _write_disk_entry(path: str, build: str, fetched_at: float, result: Any) -> None:
+    """Write one method's entry, replacing its file atomically."""
+    data = {"format": _DISK_FORMAT, "build": build, "fetchedAt": fetched_at, "result": result}
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
@@ -8,10 +8,15 @@ conversation sessions with the Copilot CLI.
 import asyncio
 import inspect
 import threading
-from typing import Any, Callable, Optional
+import time
+from collections.abc import AsyncIterator, Awaitable, Mapping
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional
 
-from .generated.rpc import SessionRpc
+from .fleet import FleetRun
+from .generated.rpc import SessionFleetStartParams, SessionRpc
 from .generated.session_events import SessionEvent, SessionEventType, session_event_from_dict
+from .journal import EventJournal
+from .rpc_cache import CachedSessionRpc
 from .types import (
     MessageOptions,
     SessionHooks,
@@ -25,6 +30,10 @@ from .types import (
 from .types import (
     SessionEvent as SessionEventTypeAlias,
 )
+from .workspace import SessionWorkspace
+
+if TYPE_CHECKING:
+    from .templates import SessionTemplate
 
 
 class CopilotSession:
@@ -72,8 +81,9 @@ class CopilotSession:
         self._workspace_path = workspace_path
         self._event_handlers: set[Callable[[SessionEvent], None]] = set()
         self._event_handlers_lock = threading.Lock()
-        self._tool_handlers: dict[str, ToolHandler] = {}
-        self._tool_handlers_lock = threading.Lock()
+        self._tools: dict[str, Tool] = {}
+        self._shared_tools: Mapping[str, Tool] = {}
+        self._tools_lock = threading.Lock()
         self._permission_handler: Optional[_PermissionHandlerFn] = None
         self._permission_handler_lock = threading.Lock()
         self._user_input_handler: Optional[UserInputHandler] = None
@@ -81,12 +91,36 @@ class CopilotSession:
         self._hooks: Optional[SessionHooks] = None
         self._hooks_lock = threading.Lock()
         self._rpc: Optional[SessionRpc] = None
+        self._rpc_cache: Optional[CachedSessionRpc] = None
+        self._history_cache_enabled = False
+        self._history: Optional[list[SessionEvent]] = None
+        self._history_index: dict[str, int] = {}
+        self._history_pending: Optional[list[SessionEvent]] = None
+        self._history_generation = 0
+        self._history_lock = threading.Lock()
+        self._journal: Optional[EventJournal] = None
+        self._journal_opening: Optional[asyncio.Task[None]] = None
+        self._workspace: Optional[SessionWorkspace] = None
+        # Idle tracking for the client's eviction policy
+        self._last_active = time.monotonic()
+        self._busy = False  # A sent message has not finished yet
+        self._evicted: Optional[Literal["detached", "destroyed"]] = None
+        self._evicting: Optional[asyncio.Task[None]] = None
+        self._rehydrate: Optional[Callable[[CopilotSession], Awaitable[None]]] = None
+        self._rehydrating: Optional[asyncio.Future[None]] = None
+        self._forget: Optional[Callable[[str], None]] = None  # Drops it from its client
+        self._template: Optional[SessionTemplate] = None  # Used to resume after eviction
 
     @property
     def rpc(self) -> SessionRpc:
-        """Typed session-scoped RPC methods."""
+        """
+        Typed session-scoped RPC methods.
+
+        A :class:`CachedSessionRpc` when the session was created with ``rpc_cache``.
+        Calls re-attach the session first if its client evicted it.
+        """
         if self._rpc is None:
-            self._rpc = SessionRpc(self._client, self.session_id)
+            self._rpc = SessionRpc(_LiveConnection(self), self.session_id)
         return self._rpc
 
     @property
@@ -99,6 +133,24 @@ class CopilotSession:
         """
         return self._workspace_path
 
+    @property
+    def workspace(self) -> SessionWorkspace:
+        """Chunked, binary-safe reads and writes of the session's workspace files."""
+        if self._workspace is None:
+            self._workspace = SessionWorkspace(self)
+        return self._workspace
+
+    @property
+    def journal(self) -> Optional[EventJournal]:
+        """
+        The durable event journal for this session, when the client was created
+        with ``journal_dir``.
+
+        The journal can be read without a connection to rebuild UI state or run
+        analytics over past events.
+        """
+        return self._journal
+
     async def send(self, options: MessageOptions) -> str:
         """
         Send a message to this session and wait for the response.
@@ -123,15 +175,22 @@ class CopilotSession:
             ...     "attachments": [{"type": "file", "path": "./src/main.py"}]
             ... })
         """
-        response = await self._client.request(
-            "session.send",
-            {
-                "sessionId": self.session_id,
-                "prompt": options["prompt"],
-                "attachments": options.get("attachments"),
-                "mode": options.get("mode"),
-            },
-        )
+        await self._ensure_live()
+        self._busy = True
+        self._last_active = time.monotonic()
+        try:
+            response = await self._client.request(
+                "session.send",
+                {
+                    "sessionId": self.session_id,
+                    "prompt": options["prompt"],
+                    "attachments": options.get("attachments"),
+                    "mode": options.get("mode"),
+                },
+            )
+        except BaseException:
+            self._busy = False
+            raise
         return response["messageId"]
 
     async def send_and_wait(
@@ -181,6 +240,7 @@ class CopilotSession:
                 )
                 idle_event.set()
 
+        await self._ensure_live()
         unsubscribe = self.on(handler)
         try:
             await self.send(options)
@@ -195,6 +255,46 @@ class CopilotSession:
         finally:
             unsubscribe()
 
+    async def start_fleet(
+        self,
+        prompt: Optional[str] = None,
+        *,
+        stream_events: bool = False,
+        max_buffered_events: int = 1000,
+    ) -> FleetRun:
+        """
+        Start fleet mode and track the subagents it launches.
+
+        Args:
+            prompt: Optional user prompt to combine with the fleet instructions.
+            stream_events: Buffer the events of every subagent from the moment it
+                starts, so :meth:`FleetRun.stream` never misses events.
+            max_buffered_events: Events buffered per subagent stream; the oldest
+                are dropped beyond this.
+
+        Returns:
+            A :class:`FleetRun` following the run. Call its ``close()`` method when
+            done with it.
+
+        Raises:
+            RuntimeError: If fleet mode could not be started.
+
+        Example:
+            >>> fleet = await session.start_fleet("Migrate every service to the new API")
+            >>> await fleet.wait(timeout=3600)
+            >>> print(fleet.counts())
+        """
+        run = FleetRun(self, stream_events, max_buffered_events)
+        try:
+            result = await self.rpc.fleet.start(SessionFleetStartParams(prompt))
+        except BaseException:
+            run.close()
+            raise
+        if not result.started:
+            run.close()
+            raise RuntimeError("Fleet mode could not be started")
+        return run
+
     def on(self, handler: Callable[[SessionEvent], None]) -> Callable[[], None]:
         """
         Subscribe to events from this session.
@@ -241,6 +341,21 @@ class CopilotSession:
         Args:
             event: The session event to dispatch to all handlers.
         """
+        self._last_active = time.monotonic()
+        if event.type in _TURN_END_EVENTS:
+            self._busy = False
+        if self._history_cache_enabled:
+            self._record_history_event(event)
+        if self._journal is not None and not event.ephemeral:
+            self._append_to_journal([event])
+        if (
+            self._workspace is not None
+            and event.type == SessionEventType.SESSION_WORKSPACE_FILE_CHANGED
+        ):
+            self._workspace._on_file_changed(event.data.path)
+        if self._rpc_cache is not None:
+            self._rpc_cache._handle_event(event)
+
         with self._event_handlers_lock:
             handlers = list(self._event_handlers)
 
@@ -265,14 +380,56 @@ class CopilotSession:
             tools: A list of Tool objects with their handlers, or None to clear
                 all registered tools.
         """
-        with self._tool_handlers_lock:
-            self._tool_handlers.clear()
-            if not tools:
-                return
-            for tool in tools:
-                if not tool.name or not tool.handler:
-                    continue
-                self._tool_handlers[tool.name] = tool.handler
+        registered = {tool.name: tool for tool in tools or [] if tool.name and tool.handler}
+        with self._tools_lock:
+            self._tools = registered
+
+    def _register_tool_map(self, tools: dict[str, Tool]) -> None:
+        """
+        Register a prebuilt name-to-tool map for this session.
+
+        Note:
+            This method is internal. It is used when creating a session from a
+            :class:`SessionTemplate`, whose tool map is built once.
+
+        Args:
+            tools: Mapping of tool names to tools. The map is shared rather than
+                copied; the session replaces its map instead of modifying it.
+        """
+        with self._tools_lock:
+            self._tools = tools
+
+    def _register_shared_tools(self, tools: Mapping[str, Tool]) -> None:
+        """
+        Register the tools of the client's tool sets used by this session.
+
+        Tools registered with :meth:`_register_tools` take precedence.
+
+        Note:
+            This method is internal. The map belongs to the client's
+            :class:`~copilot.tool_registry.ToolRegistry` and is shared by sessions.
+
+        Args:
+            tools: Read-only mapping of tool names to tools.
+        """
+        with self._tools_lock:
+            self._shared_tools = tools
+
+    def _get_tool(self, name: str) -> Optional[Tool]:
+        """
+        Retrieve a registered tool by name.
+
+        Note:
+            This method is internal and should not be called directly.
+
+        Args:
+            name: The name of the tool to retrieve.
+
+        Returns:
+            The tool if found, or None if no tool is registered for the given name.
+        """
+        with self._tools_lock:
+            return self._tools.get(name) or self._shared_tools.get(name)
 
     def _get_tool_handler(self, name: str) -> Optional[ToolHandler]:
         """
@@ -288,8 +445,8 @@ class CopilotSession:
             The tool handler if found, or None if no handler is registered
             for the given name.
         """
-        with self._tool_handlers_lock:
-            return self._tool_handlers.get(name)
+        tool = self._get_tool(name)
+        return tool.handler if tool else None
 
     def _register_permission_handler(self, handler: Optional[_PermissionHandlerFn]) -> None:
         """
@@ -447,17 +604,29 @@ class CopilotSession:
             # Hook failed, return None
             return None
 
-    async def get_messages(self) -> list[SessionEvent]:
+    async def get_messages(
+        self, after_event_id: Optional[str] = None, limit: Optional[int] = None
+    ) -> list[SessionEvent]:
         """
-        Retrieve all events and messages from this session's history.
+        Retrieve events and messages from this session's history.
 
-        This returns the complete conversation history including user messages,
+        This returns the conversation history including user messages,
         assistant responses, tool executions, and other session events.
 
+        When the session was created with ``history_cache`` enabled, the history
+        is fetched once and then kept current from live events, so repeated calls
+        only cost the events returned. The cache is invalidated when the session
+        is rewound or truncated.
+
+        Args:
+            after_event_id: Only return events that come after the event with this ID.
+            limit: Maximum number of events to return.
+
         Returns:
-            A list of all session events in chronological order.
+            A list of session events in chronological order.
 
         Raises:
+            ValueError: If ``after_event_id`` is not part of the session history.
             Exception: If the session has been destroyed or the connection fails.
 
         Example:
@@ -465,12 +634,268 @@ class CopilotSession:
             >>> for event in events:
             ...     if event.type == "assistant.message":
             ...         print(f"Assistant: {event.data.content}")
+            >>>
+            >>> # Only events newer than the last one seen
+            >>> newer = await session.get_messages(after_event_id=str(events[-1].id))
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be non-negative")
+
+        if self._history_cache_enabled:
+            with self._history_lock:
+                cached = self._history
+                index = self._history_index
+                if cached is not None:
+                    return self._slice_history(cached, index, after_event_id, limit)
+            events, index = await self._fetch_history_into_cache()
+        else:
+            events = await self._fetch_history()
+            index = {}
+            if after_event_id is not None:
+                index = {str(event.id): i for i, event in enumerate(events)}
+
+        return self._slice_history(events, index, after_event_id, limit)
+
+    async def iter_messages(
+        self, page_size: int = 100, after_event_id: Optional[str] = None
+    ) -> AsyncIterator[SessionEvent]:
         """
+        Iterate over this session's history page by page.
+
+        Without ``history_cache``, the history is fetched once and paged locally.
+        With it, each page is served from the cache, so events that arrive while
+        iterating are also yielded.
+
+        Args:
+            page_size: Number of events to read per page.
+            after_event_id: Start after the event with this ID.
+
+        Yields:
+            Session events in chronological order.
+
+        Example:
+            >>> async for event in session.iter_messages(page_size=500):
+            ...     print(event.type)
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+
+        if not self._history_cache_enabled:
+            events = await self._fetch_history()
+            index = {str(event.id): i for i, event in enumerate(events)}
+            start = 0
+            if after_event_id is not None:
+                start = self._slice_start(index, after_event_id)
+            for offset in range(start, len(events), page_size):
+                for event in events[offset : offset + page_size]:
+                    yield event
+            return
+
+        cursor = after_event_id
+        while True:
+            page = await self.get_messages(after_event_id=cursor, limit=page_size)
+            for event in page:
+                yield event
+            if len(page) < page_size:
+                return
+            cursor = str(page[-1].id)
+
+    async def _fetch_history(self) -> list[SessionEvent]:
+        """Fetch and decode the complete history from the server."""
+        await self._ensure_live()
         response = await self._client.request("session.getMessages", {"sessionId": self.session_id})
         # Convert dict events to SessionEvent objects
         events_dicts = response["events"]
         return [session_event_from_dict(event_dict) for event_dict in events_dicts]
 
+    async def _fetch_history_into_cache(self) -> tuple[list[SessionEvent], dict[str, int]]:
+        """
+        Fetch the history and install it as the local cache.
+
+        Live events that arrive while the request is in flight are buffered and
+        merged afterwards, so none are lost between the server snapshot and the
+        cache becoming active.
+        """
+        with self._history_lock:
+            generation = self._history_generation
+            if self._history_pending is None:
+                self._history_pending = []
+
+        try:
+            events = await self._fetch_history()
+        except Exception:
+            with self._history_lock:
+                if generation == self._history_generation and self._history is None:
+                    self._history_pending = None
+            raise
+        index = {str(event.id): i for i, event in enumerate(events)}
+        if self._journal is not None:
+            self._catch_up_journal(events, index)
+
+        with self._history_lock:
+            pending = self._history_pending or []
+            if generation != self._history_generation:
+                # Invalidated while fetching; serve this result without caching it
+                return events, index
+            if self._history is not None:
+                # A concurrent fetch already installed the cache and kept it current
+                return list(self._history), dict(self._history_index)
+            self._history_pending = None
+            for event in pending:
+                event_id = str(event.id)
+                if event_id not in index:
+                    index[event_id] = len(events)
+                    events.append(event)
+            self._history = events
+            self._history_index = index
+            return list(events), dict(index)
+
+    def _slice_history(
+        self,
+        events: list[SessionEvent],
+        index: dict[str, int],
+        after_event_id: Optional[str],
+        limit: Optional[int],
+    ) -> list[SessionEvent]:
+        start = 0
+        if after_event_id is not None:
+            start = self._slice_start(index, after_event_id)
+        end = len(events) if limit is None else min(len(events), start + limit)
+        return events[start:end]
+
+    @staticmethod
+    def _slice_start(index: dict[str, int], after_event_id: str) -> int:
+        position = index.get(after_event_id)
+        if position is None:
+            raise ValueError(f"Event {after_event_id} is not part of the session history")
+        return position + 1
+
+    def _enable_history_cache(self) -> None:
+        """
+        Enable the local history cache for this session.
+
+        Note:
+            This method is internal. The cache is typically enabled via the
+            ``history_cache`` option when creating or resuming a session.
+        """
+        self._history_cache_enabled = True
+
+    def _enable_rpc_cache(self) -> None:
+        """
+        Serve plan, mode, model and workspace listing reads from an event-updated cache.
+
+        Note:
+            This method is internal. The cache is typically enabled via the
+            ``rpc_cache`` option when creating or resuming a session.
+        """
+        self._rpc_cache = CachedSessionRpc(_LiveConnection(self), self.session_id)
+        self._rpc = self._rpc_cache
+
+    def _attach_journal(self, journal: EventJournal) -> None:
+        """
+        Attach a durable event journal to this session.
+
+        The journal only records events; history reads always come from the
+        server, since events may have been recorded there while no client was
+        attached. Each history fetch catches the journal up with the events the
+        server holds after the journal's last one.
+
+        Note:
+            This method is internal. Journals are attached by the client when
+            it was created with ``journal_dir``.
+        """
+        self._journal = journal
+
+    def _catch_up_journal(self, events: list[SessionEvent], index: dict[str, int]) -> None:
+        """Append the fetched events that follow the journal's last event."""
+        journal = self._journal
+        if journal is None:
+            return
+        tail = journal.tail_event_id
+        position = index.get(tail) if tail is not None else None
+        # Without a known tail, append everything; the journal skips duplicates by ID
+        self._append_to_journal(events if position is None else events[position + 1 :])
+
+    def _append_to_journal(self, events: list[SessionEvent]) -> None:
+        journal = self._journal
+        if journal is None:
+            return
+        try:
+            for event in events:
+                journal.append(event)
+        except Exception as e:
+            print(f"Error writing session journal: {e}")
+
+    async def _ensure_live(self) -> None:
+        """
+        Re-attach the session to its client if it was evicted.
+
+        Note:
+            This method is internal. Every request that targets this session on
+            the server goes through it, since a session destroyed on eviction
+            must be resumed before the server accepts requests for it again.
+            Concurrent callers share one re-attachment, so the session is
+            resumed once.
+        """
+        if self._evicted is None or self._rehydrate is None:
+            return
+        if self._rehydrating is None or self._rehydrating.done():
+            self._rehydrating = asyncio.ensure_future(self._rehydrate(self))
+        # Shielded so that one cancelled caller does not fail the others
+        await asyncio.shield(self._rehydrating)
+
+    def _detach(self, destroyed: bool) -> None:
+        """
+        Mark the session as evicted from its client and release cached state.
+
+        Note:
+            This method is internal. Handlers and tools are kept so that the
+            session can be re-hydrated on its next use.
+        """
+        self._evicted = "destroyed" if destroyed else "detached"
+        journal, self._journal = self._journal, None
+        if journal is not None:
+            journal.aclose()  # The final fsync completes in the background
+        self._invalidate_history_cache()
+
+    async def _close_journal(self) -> None:
+        """Flush and close the attached journal, if any, without blocking the loop."""
+        if self._journal_opening is not None and not self._journal_opening.done():
+            await asyncio.shield(self._journal_opening)
+        journal, self._journal = self._journal, None
+        if journal is not None:
+            await journal.aclose()
+
+    def _invalidate_history_cache(self) -> None:
+        """Drop the cached history so the next read refetches it from the server."""
+        with self._history_lock:
+            self._history = None
+            self._history_index = {}
+            self._history_pending = None
+            self._history_generation += 1
+
+    def _record_history_event(self, event: SessionEvent) -> None:
+        """Keep the history cache current with a live event."""
+        if event.type in (
+            SessionEventType.SESSION_SNAPSHOT_REWIND,
+            SessionEventType.SESSION_TRUNCATION,
+        ):
+            self._invalidate_history_cache()
+            return
+        if event.ephemeral:
+            return
+
+        with self._history_lock:
+            if self._history_pending is not None:
+                self._history_pending.append(event)
+            history = self._history
+            if history is None:
+                return
+            event_id = str(event.id)
+            if event_id not in self._history_index:
+                self._history_index[event_id] = len(history)
+                history.append(event)
+
     async def destroy(self) -> None:
         """
         Destroy this session and release all associated resources.
@@ -486,13 +911,26 @@ class CopilotSession:
             >>> # Clean up when done
             >>> await session.destroy()
         """
-        await self._client.request("session.destroy", {"sessionId": self.session_id})
+        if self._rehydrating is not None and not self._rehydrating.done():
+            await asyncio.shield(self._rehydrating)
+        evicted = self._evicted
+        if evicted == "destroyed":
+            # Destroyed on the server when it was evicted; nothing to resume
+            if self._evicting is not None:
+                await asyncio.shield(self._evicting)
+        else:
+            await self._client.request("session.destroy", {"sessionId": self.session_id})
+        if evicted is not None and self._forget is not None:
+            self._forget(self.session_id)
         with self._event_handlers_lock:
             self._event_handlers.clear()
-        with self._tool_handlers_lock:
-            self._tool_handlers.clear()
+        with self._tools_lock:
+            self._tools = {}
+            self._shared_tools = {}
         with self._permission_handler_lock:
             self._permission_handler = None
+        self._invalidate_history_cache()
+        await self._close_journal()
 
     async def abort(self) -> None:
         """
@@ -516,4 +954,19 @@ class CopilotSession:
             >>> await asyncio.sleep(5)
             >>> await session.abort()
         """
+        await self._ensure_live()
         await self._client.request("session.abort", {"sessionId": self.session_id})
+
+
+_TURN_END_EVENTS = (SessionEventType.SESSION_IDLE, SessionEventType.SESSION_ERROR)
+
+
+class _LiveConnection:
+    """A connection for the session's RPC methods that re-attaches it when evicted."""
+
+    def __init__(self, session: CopilotSession):
+        self._session = session
+
+    async def request(self, method: str, params: Any, **kwargs: Any) -> Any:
+        await self._session._ensure_live()
+        return await self._session._client.request(method, params, **kwargs)
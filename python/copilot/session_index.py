@@ -0,0 +1,351 @@
+"""
+Client-side index of session metadata.
+
+This module provides :class:`SessionIndex`, enabled with
+:meth:`CopilotClient.enable_session_index`. It is seeded from one
+``session.list`` call and then kept current from ``session.lifecycle``
+notifications, with secondary indexes on working directory, git root,
+repository and branch so that filtered listings are answered from memory. A
+periodic reconciliation against the server corrects any drift.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .types import SessionLifecycleEvent, SessionListFilter, SessionMetadata
+
+if TYPE_CHECKING:
+    from .client import CopilotClient
+
+# SessionListFilter fields and the SessionContext attributes they match
+_INDEXED_FIELDS = ("cwd", "gitRoot", "repository", "branch")
+
+
+@dataclass
+class SessionIndexStats:
+    """Counters for a :class:`SessionIndex`."""
+
+    sessions: int = 0
+    pending: int = 0  # Sessions whose context is not known yet
+    events_applied: int = 0  # Lifecycle events that changed the index
+    reconciliations: int = 0
+    drift: int = 0  # Entries added, removed or changed by reconciliations
+    server_queries: int = 0  # Filtered listings sent to the server while stale
+
+
+class SessionIndex:
+    """
+    Session metadata kept in memory and updated from lifecycle events.
+
+    Lookups by session ID and filtered listings do not contact the server:
+    a filter is answered from the secondary index of one of its fields, so its
+    cost depends on the number of matches rather than the number of sessions.
+
+    Lifecycle notifications do not include a session's context, so sessions
+    announced by ``session.created`` are listed without a context until a
+    refresh fills it in, and a ``session.updated`` session may have changed
+    branch or directory. Such refreshes list every session, so they run at
+    most once per ``refresh_interval`` however often sessions are created.
+    Meanwhile :meth:`query` sends filtered listings to the server once the
+    index has been unverified for more than ``max_staleness`` seconds, so they
+    match what the server would return; :meth:`list` always answers from memory.
+
+    Example:
+        >>> index = await client.enable_session_index(reconcile_interval=300)
+        >>> # Served from memory from now on
+        >>> sessions = await client.list_sessions(SessionListFilter(repository="owner/repo"))
+        >>> print(index.stats())
+    """
+
+    def __init__(
+        self,
+        client: "CopilotClient",
+        reconcile_interval: Optional[float] = 300.0,
+        refresh_interval: float = 30.0,
+        refresh_delay: float = 1.0,
+        max_staleness: float = 0.0,
+    ):
+        """
+        Initialize the index. Call :meth:`start` to seed it.
+
+        Args:
+            client: The client whose sessions are indexed.
+            reconcile_interval: Seconds between full reconciliations with the
+                server (None to disable).
+            refresh_interval: Minimum seconds between reconciliations that
+                fetch the context of newly announced sessions.
+            refresh_delay: Seconds to wait after a session is announced before
+                fetching the context of new sessions, so that bursts of
+                creations cost one request.
+            max_staleness: Seconds filtered :meth:`query` results may lag
+                behind session creations and updates.
+        """
+        self._client = client
+        self._reconcile_interval = reconcile_interval
+        self._refresh_interval = refresh_interval
+        self._refresh_delay = refresh_delay
+        self._max_staleness = max_staleness
+        self._last_reconcile = 0.0  # time.monotonic() of the last reconciliation
+        # time.monotonic() of the first event since then whose context is unknown
+        self._unverified_since: Optional[float] = None
+        self._lock = threading.Lock()
+        self._sessions: dict[str, SessionMetadata] = {}
+        self._by_field: dict[str, dict[str, set[str]]] = {f: {} for f in _INDEXED_FIELDS}
+        self._pending: set[str] = set()
+        # Sessions changed by events while a reconciliation was fetching the list
+        self._touched: Optional[set[str]] = None
+        self._reconcile_lock = asyncio.Lock()
+        self._stats = SessionIndexStats()
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._reconciler: Optional[asyncio.Task[None]] = None
+        self._refresh: Optional[asyncio.Task[None]] = None
+
+    async def start(self) -> None:
+        """Seed the index from the server and start following lifecycle events."""
+        if self._unsubscribe is None:
+            self._unsubscribe = self._client.on(self._handle_lifecycle_event)
+        await self.reconcile()
+        if self._reconcile_interval and self._reconciler is None:
+            self._reconciler = asyncio.ensure_future(self._reconcile_periodically())
+
+    def close(self) -> None:
+        """Stop following lifecycle events and stop background refreshes."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        for task in (self._reconciler, self._refresh):
+            if task is not None:
+                task.cancel()
+        self._reconciler = None
+        self._refresh = None
+
+    async def query(self, filter: Optional[SessionListFilter] = None) -> list[SessionMetadata]:
+        """
+        List sessions as the server would, from memory when the index is current.
+
+        Unfiltered listings always come from memory. Filtered ones are sent to
+        the server as a filtered ``session.list`` while the index has been
+        unverified for longer than ``max_staleness``, that is, when sessions
+        were created or updated since the last reconciliation; the result also
+        fills in the context of the sessions it returns.
+
+        Args:
+            filter: Only include sessions whose context matches every set field.
+        """
+        if filter is None or not filter.to_dict():
+            return self.list()
+        with self._lock:
+            since = self._unverified_since
+        if since is None or time.monotonic() - since <= self._max_staleness:
+            return self.list(filter)
+        sessions = await self._client._fetch_sessions(filter)
+        with self._lock:
+            self._stats.server_queries += 1
+            for metadata in sessions:
+                current = self._sessions.get(metadata.sessionId)
+                if current is None:
+                    continue  # Deleted since, or left to the next reconciliation
+                if current.modifiedTime > metadata.modifiedTime:
+                    # Updated by an event after the list was produced
+                    metadata = replace(
+                        metadata, modifiedTime=current.modifiedTime, summary=current.summary
+                    )
+                self._put(metadata)
+        return sessions
+
+    def get(self, session_id: str) -> Optional[SessionMetadata]:
+        """Get the metadata of a session."""
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def list(self, filter: Optional[SessionListFilter] = None) -> list[SessionMetadata]:
+        """
+        List sessions, most recently modified first.
+
+        Args:
+            filter: Only include sessions whose context matches every set field.
+        """
+        criteria = filter.to_dict() if filter is not None else {}
+        with self._lock:
+            if not criteria:
+                matches = list(self._sessions.values())
+            else:
+                sets = [
+                    self._by_field[field].get(value, set()) for field, value in criteria.items()
+                ]
+                smallest = min(sets, key=len)
+                matches = [
+                    self._sessions[session_id]
+                    for session_id in smallest
+                    if all(session_id in s for s in sets)
+                ]
+        matches.sort(key=lambda metadata: metadata.modifiedTime, reverse=True)
+        return matches
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def __contains__(self, session_id: object) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def stats(self) -> SessionIndexStats:
+        """Get a snapshot of the counters."""
+        with self._lock:
+            return replace(self._stats, sessions=len(self._sessions), pending=len(self._pending))
+
+    async def reconcile(self) -> int:
+        """
+        Replace the index contents with the server's session list.
+
+        Sessions changed by lifecycle events while the list was being fetched
+        keep their event-derived state.
+
+        Returns:
+            The number of entries added, removed or changed.
+        """
+        async with self._reconcile_lock:
+            return await self._reconcile()
+
+    async def _reconcile(self) -> int:
+        started = time.monotonic()
+        with self._lock:
+            self._touched = set()
+        try:
+            sessions = await self._client._fetch_sessions()
+        except BaseException:
+            with self._lock:
+                self._touched = None
+            raise
+        fresh = {metadata.sessionId: metadata for metadata in sessions}
+        drift = 0
+        with self._lock:
+            self._last_reconcile = time.monotonic()
+            touched = self._touched or set()
+            self._touched = None
+            # Events during the request may not be reflected in the list
+            self._unverified_since = started if touched else None
+            for session_id in list(self._sessions):
+                if session_id not in fresh and session_id not in touched:
+                    self._remove(session_id)
+                    drift += 1
+            for session_id, metadata in fresh.items():
+                if session_id in touched and session_id not in self._sessions:
+                    continue  # Deleted while the list was being fetched
+                current = self._sessions.get(session_id)
+                if (
+                    current is not None
+                    and session_id in touched
+                    and current.modifiedTime > metadata.modifiedTime
+                ):
+                    # Updated by an event after the list was produced
+                    metadata = replace(
+                        metadata, modifiedTime=current.modifiedTime, summary=current.summary
+                    )
+                if current != metadata:
+                    self._put(metadata)
+                    drift += 1
+            if self._stats.reconciliations:  # The first one seeds the index
+                self._stats.drift += drift
+            self._stats.reconciliations += 1
+        return drift
+
+    def _handle_lifecycle_event(self, event: SessionLifecycleEvent) -> None:
+        """
+        Apply a lifecycle event.
+
+        Note:
+            This method is internal. It is registered with :meth:`CopilotClient.on`.
+        """
+        if event.type not in ("session.created", "session.updated", "session.deleted"):
+            return
+        refresh = False
+        with self._lock:
+            if self._touched is not None:
+                self._touched.add(event.sessionId)
+            current = self._sessions.get(event.sessionId)
+            if event.type == "session.deleted":
+                if current is None:
+                    return
+                self._remove(event.sessionId)
+            elif current is not None:
+                if event.metadata is None:
+                    return
+                self._sessions[event.sessionId] = replace(
+                    current,
+                    modifiedTime=event.metadata.modifiedTime or current.modifiedTime,
+                    summary=event.metadata.summary
+                    if event.metadata.summary is not None
+                    else current.summary,
+                )
+            else:
+                metadata = event.metadata
+                self._put(
+                    SessionMetadata(
+                        sessionId=event.sessionId,
+                        startTime=metadata.startTime if metadata else "",
+                        modifiedTime=metadata.modifiedTime if metadata else "",
+                        isRemote=False,
+                        summary=metadata.summary if metadata else None,
+                    )
+                )
+                self._pending.add(event.sessionId)
+                refresh = self._refresh is None or self._refresh.done()
+            if event.type != "session.deleted" and self._unverified_since is None:
+                self._unverified_since = time.monotonic()
+            self._stats.events_applied += 1
+        if refresh:
+            delay = max(
+                self._refresh_delay,
+                self._last_reconcile + self._refresh_interval - time.monotonic(),
+            )
+            self._refresh = asyncio.ensure_future(self._refresh_pending(delay))
+
+    def _put(self, metadata: SessionMetadata) -> None:
+        """Insert or replace an entry; the lock must be held."""
+        if metadata.sessionId in self._sessions:
+            self._remove(metadata.sessionId)
+        self._sessions[metadata.sessionId] = metadata
+        if metadata.context is not None:
+            self._pending.discard(metadata.sessionId)
+            for field in _INDEXED_FIELDS:
+                value = getattr(metadata.context, field)
+                if value is not None:
+                    self._by_field[field].setdefault(value, set()).add(metadata.sessionId)
+
+    def _remove(self, session_id: str) -> None:
+        """Remove an entry; the lock must be held."""
+        metadata = self._sessions.pop(session_id, None)
+        self._pending.discard(session_id)
+        if metadata is None or metadata.context is None:
+            return
+        for field in _INDEXED_FIELDS:
+            value = getattr(metadata.context, field)
+            ids = self._by_field[field].get(value) if value is not None else None
+            if ids is not None:
+                ids.discard(session_id)
+                if not ids:
+                    del self._by_field[field][value]
+
+    async def _refresh_pending(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        with self._lock:
+            if not self._pending:
+                return  # Filled in by a reconciliation in the meantime
+        try:
+            await self.reconcile()
+        except Exception:
+            pass  # Retried by the next announcement or periodic reconciliation
+
+    async def _reconcile_periodically(self) -> None:
+        assert self._reconcile_interval
+        while True:
+            await asyncio.sleep(self._reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception:
+                pass  # The connection may be down; try again next time
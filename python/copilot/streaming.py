@@ -0,0 +1,260 @@
+"""
+Incremental assembly of streamed assistant output.
+
+This module provides the :class:`MessageAssembler` class, which builds the
+text of streamed assistant messages from ``assistant.message_delta`` events
+without repeated string concatenation.
+"""
+
+import threading
+from typing import Callable, Optional
+
+from .generated.session_events import SessionEvent, SessionEventType
+
+
+class _MessageBuffer:
+    """Chunk buffer for a single in-flight assistant message."""
+
+    __slots__ = ("chunks", "length", "truncated", "final", "turn_id")
+
+    def __init__(self, turn_id: Optional[str]):
+        self.chunks: list[str] = []
+        self.length = 0
+        self.truncated = False
+        self.final: Optional[str] = None
+        self.turn_id = turn_id
+
+
+class MessageAssembler:
+    """
+    Assembles streamed assistant messages, keyed by message ID.
+
+    Deltas are appended to a per-message chunk list in O(1) and only joined
+    when a snapshot is requested. When the authoritative ``assistant.message``
+    event arrives, its content replaces the buffered chunks. All buffers opened
+    during a turn are released on ``assistant.turn_end``.
+
+    The assembler is itself an event handler, so it can be passed directly to
+    :meth:`CopilotSession.on`.
+
+    Example:
+        >>> assembler = MessageAssembler()
+        >>> unsubscribe = session.on(assembler)
+        >>> await session.send({"prompt": "Tell me a long story"})
+        >>> # Later, from any handler or task:
+        >>> for message_id in assembler.message_ids():
+        ...     print(assembler.snapshot(message_id))
+    """
+
+    def __init__(
+        self,
+        max_chars_per_message: Optional[int] = None,
+        on_message: Optional[Callable[[str, str], None]] = None,
+    ):
+        """
+        Initialize a new MessageAssembler.
+
+        Args:
+            max_chars_per_message: Optional cap on the number of buffered characters
+                per in-flight message. Deltas beyond the cap are dropped and the
+                message is marked as truncated until the final ``assistant.message``
+                event supplies the complete content.
+            on_message: Optional callback invoked with ``(message_id, content)``
+                when a message is finalized.
+        """
+        if max_chars_per_message is not None and max_chars_per_message <= 0:
+            raise ValueError("max_chars_per_message must be positive")
+        self._max_chars = max_chars_per_message
+        self._on_message = on_message
+        self._buffers: dict[str, _MessageBuffer] = {}
+        self._current_turn_id: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, event: SessionEvent) -> None:
+        self.handle_event(event)
+
+    def handle_event(self, event: SessionEvent) -> None:
+        """
+        Feed a session event into the assembler.
+
+        Events other than message deltas, final messages and turn boundaries
+        are ignored.
+
+        Args:
+            event: The session event to process.
+        """
+        event_type = event.type
+        if event_type == SessionEventType.ASSISTANT_MESSAGE_DELTA:
+            self._append(event.data.message_id, event.data.delta_content)
+        elif event_type == SessionEventType.ASSISTANT_MESSAGE:
+            self._finalize(event.data.message_id, event.data.content)
+        elif event_type == SessionEventType.ASSISTANT_TURN_START:
+            with self._lock:
+                self._current_turn_id = event.data.turn_id
+        elif event_type == SessionEventType.ASSISTANT_TURN_END:
+            self._release_turn(event.data.turn_id)
+
+    def snapshot(self, message_id: str) -> Optional[str]:
+        """
+        Get the text assembled so far for a message.
+
+        Buffered chunks are collapsed into a single chunk, so a snapshot with no
+        new deltas since the last one is free. Otherwise the whole text is copied:
+        taking a snapshot per delta costs quadratic time in the message length.
+        Use :meth:`read` to follow a message as it streams.
+
+        Args:
+            message_id: The ID of the message.
+
+        Returns:
+            The final content if the message has completed, the partial text if
+            it is still streaming, or None if the message is unknown.
+        """
+        with self._lock:
+            buffer = self._buffers.get(message_id)
+            if buffer is None:
+                return None
+            if buffer.final is not None:
+                return buffer.final
+            if len(buffer.chunks) > 1:
+                buffer.chunks[:] = ["".join(buffer.chunks)]
+            return buffer.chunks[0] if buffer.chunks else ""
+
+    def read(self, message_id: str, offset: int = 0) -> Optional[str]:
+        """
+        Get the text of a message from a character offset on.
+
+        Only the chunks after ``offset`` are visited and copied, so a consumer
+        that passes the length of the text it has already read pays for each
+        delta once.
+
+        Args:
+            message_id: The ID of the message.
+            offset: The number of leading characters to skip.
+
+        Returns:
+            The text after ``offset`` (the final content once the message has
+            completed), or None if the message is unknown.
+
+        Example:
+            >>> received = 0
+            >>> # In a handler for each assistant.message_delta event:
+            >>> new_text = assembler.read(message_id, received) or ""
+            >>> received += len(new_text)
+        """
+        with self._lock:
+            buffer = self._buffers.get(message_id)
+            if buffer is None:
+                return None
+            if buffer.final is not None:
+                return buffer.final[offset:]
+            wanted = buffer.length - offset
+            if wanted <= 0:
+                return ""
+            # Walk back from the newest chunk to the one containing the offset
+            tail: list[str] = []
+            collected = 0
+            for chunk in reversed(buffer.chunks):
+                tail.append(chunk)
+                collected += len(chunk)
+                if collected >= wanted:
+                    break
+            tail.reverse()
+            if collected > wanted:
+                tail[0] = tail[0][collected - wanted :]
+            return "".join(tail)
+
+    def chunks(self, message_id: str) -> tuple[str, ...]:
+        """
+        Get the raw chunks buffered for a message without joining them.
+
+        Args:
+            message_id: The ID of the message.
+
+        Returns:
+            A tuple of text chunks, or an empty tuple if the message is unknown.
+        """
+        with self._lock:
+            buffer = self._buffers.get(message_id)
+            if buffer is None:
+                return ()
+            if buffer.final is not None:
+                return (buffer.final,)
+            return tuple(buffer.chunks)
+
+    def is_complete(self, message_id: str) -> bool:
+        """Whether the authoritative ``assistant.message`` event has been received."""
+        with self._lock:
+            buffer = self._buffers.get(message_id)
+            return buffer is not None and buffer.final is not None
+
+    def is_truncated(self, message_id: str) -> bool:
+        """Whether deltas for a still-streaming message were dropped by the size cap."""
+        with self._lock:
+            buffer = self._buffers.get(message_id)
+            return buffer is not None and buffer.final is None and buffer.truncated
+
+    def message_ids(self) -> list[str]:
+        """Get the IDs of all messages currently held, in arrival order."""
+        with self._lock:
+            return list(self._buffers)
+
+    def clear(self) -> None:
+        """Release all buffers."""
+        with self._lock:
+            self._buffers.clear()
+            self._current_turn_id = None
+
+    def _get_or_create(self, message_id: str) -> _MessageBuffer:
+        buffer = self._buffers.get(message_id)
+        if buffer is None:
+            buffer = _MessageBuffer(self._current_turn_id)
+            self._buffers[message_id] = buffer
+        return buffer
+
+    def _append(self, message_id: Optional[str], delta: Optional[str]) -> None:
+        if not message_id or not delta:
+            return
+        with self._lock:
+            buffer = self._get_or_create(message_id)
+            if buffer.final is not None or buffer.truncated:
+                return
+            if self._max_chars is not None:
+                remaining = self._max_chars - buffer.length
+                if len(delta) > remaining:
+                    buffer.truncated = True
+                    delta = delta[:remaining]
+                    if not delta:
+                        return
+            buffer.chunks.append(delta)
+            buffer.length += len(delta)
+
+    def _finalize(self, message_id: Optional[str], content: Optional[str]) -> None:
+        if not message_id:
+            return
+        final = content or ""
+        with self._lock:
+            buffer = self._get_or_create(message_id)
+            buffer.final = final
+            buffer.chunks = []
+            buffer.length = len(final)
+            buffer.truncated = False
+            callback = self._on_message
+
+        if callback:
+            try:
+                callback(message_id, final)
+            except Exception as e:
+                print(f"Error in message assembler callback: {e}")
+
+    def _release_turn(self, turn_id: Optional[str]) -> None:
+        with self._lock:
+            released = [
+                message_id
+                for message_id, buffer in self._buffers.items()
+                if buffer.turn_id is None or buffer.turn_id == turn_id
+            ]
+            for message_id in released:
+                del self._buffers[message_id]
+            if self._current_turn_id == turn_id:
+                self._current_turn_id = None
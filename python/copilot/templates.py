@@ -0,0 +1,302 @@
+"""
+Precompiled session configurations for the Copilot SDK.
+
+This module provides the :class:`SessionTemplate` class, which converts a
+:class:`SessionConfig` into its wire-format payload and tool-handler map once so
+that many sessions can be created or resumed from the same configuration
+without rebuilding either on every call.
+"""
+
+from typing import Any, Optional, Union
+
+from .tool_registry import _tool_definition
+from .types import (
+    CustomAgentConfig,
+    ProviderConfig,
+    ResumeSessionConfig,
+    SessionConfig,
+    Tool,
+)
+
+
+class SessionTemplate:
+    """
+    A session configuration compiled into its wire format.
+
+    The template walks the configuration once: tool definitions, provider and
+    custom agent settings and infinite session settings are converted up front,
+    and the tool handlers are collected into a lookup map. Creating a session
+    from a template then only copies the top level of the cached payload.
+
+    Per-call values such as the session ID or working directory are applied with
+    :meth:`with_overrides`, which returns a new template sharing the compiled
+    payload instead of recompiling it.
+
+    The configuration is captured when the template is built; later changes to
+    the original dict are not picked up.
+
+    Example:
+        >>> template = SessionTemplate({"model": "gpt-5", "tools": [get_weather]})
+        >>> session = await client.create_session(template)
+        >>> other = await client.create_session(
+        ...     template.with_overrides(working_directory="/srv/checkout-2")
+        ... )
+    """
+
+    def __init__(self, config: Optional[Union[SessionConfig, ResumeSessionConfig]] = None):
+        """
+        Compile a session configuration.
+
+        Args:
+            config: The configuration to compile. Accepts the same keys as
+                :meth:`CopilotClient.create_session` and
+                :meth:`CopilotClient.resume_session`.
+        """
+        cfg: dict[str, Any] = dict(config or {})
+        self._config = cfg
+        self._payload = _build_session_payload(cfg)
+        self._overrides: dict[str, Any] = {}
+        self._tools = list(cfg.get("tools") or [])
+        self._tools_by_name: dict[str, Tool] = {
+            tool.name: tool for tool in self._tools if tool.name and tool.handler
+        }
+        self._tool_sets: tuple[str, ...] = tuple(cfg.get("tool_sets") or ())
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """The configuration the template was compiled from, with overrides applied."""
+        config = dict(self._config)
+        for key, value in self._overrides.items():
+            config[_OVERRIDE_KEYS[key]] = value
+        return config
+
+    @property
+    def session_id(self) -> Optional[str]:
+        """The session ID new sessions are created with, if one is set."""
+        return self._overrides.get("sessionId", self._payload.get("sessionId"))
+
+    def with_overrides(
+        self,
+        *,
+        session_id: Optional[str] = None,
+        working_directory: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> "SessionTemplate":
+        """
+        Derive a template that differs only in per-call values.
+
+        The derived template shares the compiled payload and tool handlers of
+        this one; only the given values are replaced.
+
+        Args:
+            session_id: Custom ID for the created session.
+            working_directory: Working directory for the session.
+            model: Model to use for the session.
+
+        Returns:
+            A new :class:`SessionTemplate`.
+        """
+        derived = SessionTemplate.__new__(SessionTemplate)
+        derived._config = self._config
+        derived._payload = self._payload
+        derived._tools = self._tools
+        derived._tools_by_name = self._tools_by_name
+        derived._tool_sets = self._tool_sets
+        derived._overrides = dict(self._overrides)
+        if session_id:
+            derived._overrides["sessionId"] = session_id
+        if working_directory:
+            derived._overrides["workingDirectory"] = working_directory
+        if model:
+            derived._overrides["model"] = model
+        return derived
+
+    def _create_payload(self) -> dict[str, Any]:
+        """
+        Build the ``session.create`` request parameters.
+
+        Note:
+            This method is internal.
+        """
+        payload = {**self._payload, **self._overrides}
+        payload.pop("disableResume", None)
+        return payload
+
+    def _resume_payload(self, session_id: str) -> dict[str, Any]:
+        """
+        Build the ``session.resume`` request parameters for ``session_id``.
+
+        Note:
+            This method is internal.
+        """
+        return {**self._payload, **self._overrides, "sessionId": session_id}
+
+
+# Maps the wire keys accepted by with_overrides() back to their config keys
+_OVERRIDE_KEYS = {
+    "sessionId": "session_id",
+    "workingDirectory": "working_directory",
+    "model": "model",
+}
+
+
+def _build_session_payload(cfg: dict[str, Any]) -> dict[str, Any]:
+    """Convert a session configuration to its wire format."""
+    payload: dict[str, Any] = {}
+    if cfg.get("model"):
+        payload["model"] = cfg["model"]
+    if cfg.get("session_id"):
+        payload["sessionId"] = cfg["session_id"]
+    if cfg.get("client_name"):
+        payload["clientName"] = cfg["client_name"]
+    if cfg.get("reasoning_effort"):
+        payload["reasoningEffort"] = cfg["reasoning_effort"]
+
+    tools = cfg.get("tools")
+    if tools:
+        payload["tools"] = [_tool_definition(tool) for tool in tools]
+
+    # Add system message configuration if provided
+    system_message = cfg.get("system_message")
+    if system_message:
+        payload["systemMessage"] = system_message
+
+    # Add tool filtering options
+    available_tools = cfg.get("available_tools")
+    if available_tools is not None:
+        payload["availableTools"] = available_tools
+    excluded_tools = cfg.get("excluded_tools")
+    if excluded_tools:
+        payload["excludedTools"] = excluded_tools
+
+    # Always enable permission request callback (deny by default if no handler provided)
+    payload["requestPermission"] = True
+
+    # Enable user input request callback if handler provided
+    if cfg.get("on_user_input_request"):
+        payload["requestUserInput"] = True
+
+    # Enable hooks callback if any hook handler provided
+    hooks = cfg.get("hooks")
+    if hooks and any(hooks.values()):
+        payload["hooks"] = True
+
+    # Add working directory if provided
+    working_directory = cfg.get("working_directory")
+    if working_directory:
+        payload["workingDirectory"] = working_directory
+
+    # Add streaming option if provided
+    streaming = cfg.get("streaming")
+    if streaming is not None:
+        payload["streaming"] = streaming
+
+    # Add provider configuration if provided
+    provider = cfg.get("provider")
+    if provider:
+        payload["provider"] = _convert_provider_to_wire_format(provider)
+
+    # Add MCP servers configuration if provided
+    mcp_servers = cfg.get("mcp_servers")
+    if mcp_servers:
+        payload["mcpServers"] = mcp_servers
+    payload["envValueMode"] = "direct"
+
+    # Add custom agents configuration if provided
+    custom_agents = cfg.get("custom_agents")
+    if custom_agents:
+        payload["customAgents"] = [
+            _convert_custom_agent_to_wire_format(agent) for agent in custom_agents
+        ]
+
+    # Add config directory override if provided
+    config_dir = cfg.get("config_dir")
+    if config_dir:
+        payload["configDir"] = config_dir
+
+    # Add skill directories configuration if provided
+    skill_directories = cfg.get("skill_directories")
+    if skill_directories:
+        payload["skillDirectories"] = skill_directories
+
+    # Add disabled skills configuration if provided
+    disabled_skills = cfg.get("disabled_skills")
+    if disabled_skills:
+        payload["disabledSkills"] = disabled_skills
+
+    # Add infinite sessions configuration if provided
+    infinite_sessions = cfg.get("infinite_sessions")
+    if infinite_sessions:
+        wire_config: dict[str, Any] = {}
+        if "enabled" in infinite_sessions:
+            wire_config["enabled"] = infinite_sessions["enabled"]
+        if "background_compaction_threshold" in infinite_sessions:
+            wire_config["backgroundCompactionThreshold"] = infinite_sessions[
+                "background_compaction_threshold"
+            ]
+        if "buffer_exhaustion_threshold" in infinite_sessions:
+            wire_config["bufferExhaustionThreshold"] = infinite_sessions[
+                "buffer_exhaustion_threshold"
+            ]
+        payload["infiniteSessions"] = wire_config
+
+    # Add disable resume flag if provided (only sent on resume)
+    if cfg.get("disable_resume"):
+        payload["disableResume"] = True
+
+    return payload
+
+
+def _convert_provider_to_wire_format(provider: ProviderConfig | dict[str, Any]) -> dict[str, Any]:
+    """
+    Convert provider config from snake_case to camelCase wire format.
+
+    Args:
+        provider: The provider configuration in snake_case format.
+
+    Returns:
+        The provider configuration in camelCase wire format.
+    """
+    wire_provider: dict[str, Any] = {"type": provider.get("type")}
+    if "base_url" in provider:
+        wire_provider["baseUrl"] = provider["base_url"]
+    if "api_key" in provider:
+        wire_provider["apiKey"] = provider["api_key"]
+    if "wire_api" in provider:
+        wire_provider["wireApi"] = provider["wire_api"]
+    if "bearer_token" in provider:
+        wire_provider["bearerToken"] = provider["bearer_token"]
+    if "azure" in provider:
+        azure = provider["azure"]
+        wire_azure: dict[str, Any] = {}
+        if "api_version" in azure:
+            wire_azure["apiVersion"] = azure["api_version"]
+        if wire_azure:
+            wire_provider["azure"] = wire_azure
+    return wire_provider
+
+
+def _convert_custom_agent_to_wire_format(
+    agent: CustomAgentConfig | dict[str, Any],
+) -> dict[str, Any]:
+    """
+    Convert custom agent config from snake_case to camelCase wire format.
+
+    Args:
+        agent: The custom agent configuration in snake_case format.
+
+    Returns:
+        The custom agent configuration in camelCase wire format.
+    """
+    wire_agent: dict[str, Any] = {"name": agent.get("name"), "prompt": agent.get("prompt")}
+    if "display_name" in agent:
+        wire_agent["displayName"] = agent["display_name"]
+    if "description" in agent:
+        wire_agent["description"] = agent["description"]
+    if "tools" in agent:
+        wire_agent["tools"] = agent["tools"]
+    if "mcp_servers" in agent:
+        wire_agent["mcpServers"] = agent["mcp_servers"]
+    if "infer" in agent:
+        wire_agent["infer"] = agent["infer"]
+    return wire_agent
@@ -0,0 +1,200 @@
+"""
+Memoization of tool results.
+
+This module provides :class:`ToolResultCache`, which stores successful results
+of tools declared with a :class:`ToolCachePolicy` and collapses concurrent calls
+with identical arguments into a single execution.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Optional
+
+from .tool_results import result_size
+from .types import Tool, ToolCachePolicy, ToolResult
+
+
+@dataclass
+class ToolCacheStats:
+    """Cache figures for a single tool."""
+
+    hits: int = 0  # Calls answered from the cache
+    misses: int = 0  # Calls that executed the handler
+    collapsed: int = 0  # Calls that shared the result of an identical in-flight call
+    evictions: int = 0  # Entries dropped to stay within max_entries / max_bytes
+    expirations: int = 0  # Entries dropped because their TTL passed
+    entries: int = 0  # Entries currently cached
+    bytes: int = 0  # Size of the currently cached result text
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of calls answered without executing the handler."""
+        total = self.hits + self.misses + self.collapsed
+        return (self.hits + self.collapsed) / total if total else 0.0
+
+
+class _Entry:
+    __slots__ = ("result", "size", "expires_at")
+
+    def __init__(self, result: ToolResult, size: int, expires_at: Optional[float]):
+        self.result = result
+        self.size = size
+        self.expires_at = expires_at
+
+
+class _ToolCacheStore:
+    """LRU entries and in-flight calls of one tool."""
+
+    def __init__(self) -> None:
+        self.entries: OrderedDict[tuple[Optional[str], str], _Entry] = OrderedDict()
+        self.inflight: dict[tuple[Optional[str], str], asyncio.Future] = {}
+        self.stats = ToolCacheStats()
+
+
+class ToolResultCache:
+    """
+    Caches successful tool results according to each tool's :class:`ToolCachePolicy`.
+
+    Example:
+        >>> cache = ToolResultCache()
+        >>> result = await cache.get_or_call(tool, session_id, arguments, run_tool)
+        >>> print(cache.stats()[tool.name].hit_rate)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stores: dict[str, _ToolCacheStore] = {}
+
+    async def get_or_call(
+        self,
+        tool: Tool,
+        session_id: str,
+        arguments: Any,
+        call: Callable[[], Awaitable[ToolResult]],
+        per_session: bool = False,
+    ) -> ToolResult:
+        """
+        Return the cached result for a call, executing it if needed.
+
+        While a call is executing, identical calls wait for its result instead
+        of executing again. Only results with ``resultType`` "success" are stored.
+
+        Args:
+            tool: The tool being called. Must have a cache policy.
+            session_id: The calling session.
+            arguments: The call arguments.
+            call: Executes the call on a cache miss.
+            per_session: Keep separate entries for each session even if the
+                policy shares them, e.g. when results refer to session state.
+
+        Returns:
+            The (possibly cached) result.
+        """
+        policy = tool.cache
+        assert policy is not None
+        scoped = policy.per_session or per_session
+        key = (session_id if scoped else None, _hash_arguments(arguments))
+
+        with self._lock:
+            store = self._stores.get(tool.name)
+            if store is None:
+                store = self._stores[tool.name] = _ToolCacheStore()
+            entry = store.entries.get(key)
+            if entry is not None:
+                if entry.expires_at is None or entry.expires_at > time.monotonic():
+                    store.entries.move_to_end(key)
+                    store.stats.hits += 1
+                    return dict(entry.result)  # type: ignore[return-value]
+                self._remove(store, key)
+                store.stats.expirations += 1
+            inflight = store.inflight.get(key)
+            if inflight is None:
+                leader = asyncio.get_running_loop().create_future()
+                store.inflight[key] = leader
+                store.stats.misses += 1
+            else:
+                store.stats.collapsed += 1
+
+        if inflight is not None:
+            try:
+                return dict(await asyncio.shield(inflight))  # type: ignore[return-value]
+            except Exception:
+                # The leading call failed to produce a result; run this one on its own
+                return await call()
+
+        try:
+            result = await call()
+        except BaseException as exc:
+            with self._lock:
+                store.inflight.pop(key, None)
+            leader.set_exception(exc if isinstance(exc, Exception) else RuntimeError(str(exc)))
+            # Followers retrieve the exception; keep asyncio from reporting it as unhandled
+            leader.exception()
+            raise
+
+        with self._lock:
+            store.inflight.pop(key, None)
+            if isinstance(result, dict) and result.get("resultType") == "success":
+                self._store(store, policy, key, result)
+        leader.set_result(result)
+        return result
+
+    def clear(self, tool_name: Optional[str] = None) -> None:
+        """
+        Drop cached results.
+
+        Args:
+            tool_name: Only drop the results of this tool; all tools when None.
+        """
+        with self._lock:
+            if tool_name is None:
+                stores = list(self._stores.values())
+            else:
+                stores = [self._stores[tool_name]] if tool_name in self._stores else []
+            for store in stores:
+                store.entries.clear()
+                store.stats.entries = 0
+                store.stats.bytes = 0
+
+    def stats(self) -> dict[str, ToolCacheStats]:
+        """Get a snapshot of the cache figures, keyed by tool name."""
+        with self._lock:
+            return {name: replace(store.stats) for name, store in self._stores.items()}
+
+    def _store(
+        self,
+        store: _ToolCacheStore,
+        policy: ToolCachePolicy,
+        key: tuple[Optional[str], str],
+        result: ToolResult,
+    ) -> None:
+        size = result_size(result)
+        if policy.max_bytes is not None and size > policy.max_bytes:
+            return
+        if key in store.entries:
+            self._remove(store, key)
+        expires_at = time.monotonic() + policy.ttl if policy.ttl is not None else None
+        store.entries[key] = _Entry(result, size, expires_at)
+        store.stats.entries += 1
+        store.stats.bytes += size
+        while len(store.entries) > policy.max_entries or (
+            policy.max_bytes is not None and store.stats.bytes > policy.max_bytes
+        ):
+            self._remove(store, next(iter(store.entries)))
+            store.stats.evictions += 1
+
+    def _remove(self, store: _ToolCacheStore, key: tuple[Optional[str], str]) -> None:
+        entry = store.entries.pop(key)
+        store.stats.entries -= 1
+        store.stats.bytes -= entry.size
+
+
+def _hash_arguments(arguments: Any) -> str:
+    canonical = json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,105 @@
+"""
+Progress reporting for long-running tools.
+
+This module provides :class:`ToolProgress`, which tool handlers use to publish
+progress messages and partial output while they run. Reports are delivered to
+the session's event handlers as ephemeral ``tool.execution_progress`` and
+``tool.execution_partial_result`` events.
+"""
+
+import asyncio
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from .generated.session_events import SessionEvent, session_event_from_dict
+
+
+class ToolProgress:
+    """
+    Reports progress and partial output of a single tool call.
+
+    Handlers receive a reporter through the ``progress`` key of the invocation,
+    or by declaring a parameter annotated with ``ToolProgress`` when using
+    :func:`define_tool`. Reports may be made from the event loop or from a
+    worker thread.
+
+    The CLI protocol has no request for tool progress, so reports reach the
+    session's own event handlers (for example a UI) but not the model. Handlers
+    running in a process pool receive a detached reporter whose reports are
+    dropped.
+
+    Example:
+        >>> @define_tool(description="Run the test suite")
+        ... async def run_tests(params: TestParams, progress: ToolProgress) -> str:
+        ...     for i, suite in enumerate(params.suites):
+        ...         progress.report(f"Running {suite} ({i + 1}/{len(params.suites)})")
+        ...         await run_suite(suite)
+        ...     return "All suites passed"
+    """
+
+    def __init__(
+        self,
+        tool_call_id: str,
+        dispatch: Optional[Callable[[SessionEvent], None]] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        """
+        Initialize a reporter.
+
+        Note:
+            Reporters are created by the client for each tool call.
+
+        Args:
+            tool_call_id: The ID of the tool call being reported on.
+            dispatch: Delivers the synthesized events; reports are dropped when None.
+            loop: The event loop ``dispatch`` must run on.
+        """
+        self.tool_call_id = tool_call_id
+        self._dispatch = dispatch
+        self._loop = loop
+        self._loop_thread = threading.get_ident() if loop is not None else None
+
+    def report(self, message: str) -> None:
+        """
+        Publish a progress message, e.g. ``"Indexed 300 of 1200 files"``.
+
+        Args:
+            message: Human-readable description of the current progress.
+        """
+        self._emit("tool.execution_progress", {"progressMessage": message})
+
+    def partial(self, output: str) -> None:
+        """
+        Publish a chunk of output produced so far.
+
+        Args:
+            output: The new output since the previous chunk.
+        """
+        self._emit("tool.execution_partial_result", {"partialOutput": output})
+
+    def __getstate__(self) -> dict[str, Any]:
+        # A reporter sent to a worker process cannot reach the session
+        return {"tool_call_id": self.tool_call_id}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["tool_call_id"])  # type: ignore[misc]
+
+    def _emit(self, event_type: str, data: dict[str, Any]) -> None:
+        if self._dispatch is None:
+            return
+        event = session_event_from_dict(
+            {
+                "id": str(uuid.uuid4()),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "parentId": None,
+                "ephemeral": True,
+                "type": event_type,
+                "data": {"toolCallId": self.tool_call_id, **data},
+            }
+        )
+        if self._loop is None or threading.get_ident() == self._loop_thread:
+            self._dispatch(event)
+        else:
+            self._loop.call_soon_threadsafe(self._dispatch, event)
@@ -0,0 +1,172 @@
+"""
+Client-level registry of named tool sets.
+
+This module provides :class:`ToolRegistry`, which compiles tools into named
+:class:`ToolSet` objects once: their wire-format definitions are serialized and
+their handlers collected into a read-only map when the set is registered.
+Sessions that reference a tool set by name send the cached definitions and look
+tools up in the shared map, so creating a session does no per-tool work.
+"""
+
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Optional
+
+from .types import Tool
+
+
+class ToolSet:
+    """
+    A named, immutable group of tools compiled for reuse across sessions.
+
+    Attributes:
+        name: The name the set is registered under.
+        tools: The tools in the set.
+        definitions: The wire-format definitions sent with ``session.create``.
+        handlers: Read-only map of tool names to tools, shared by every session
+            that uses the set.
+    """
+
+    __slots__ = ("name", "tools", "definitions", "handlers")
+
+    def __init__(self, name: str, tools: list[Tool]):
+        """
+        Compile a tool set.
+
+        Args:
+            name: The name of the set.
+            tools: The tools in the set.
+
+        Raises:
+            ValueError: If two tools share a name.
+        """
+        by_name: dict[str, Tool] = {}
+        for tool in tools:
+            if tool.name in by_name:
+                raise ValueError(f"Duplicate tool '{tool.name}' in tool set '{name}'")
+            by_name[tool.name] = tool
+        self.name = name
+        self.tools: tuple[Tool, ...] = tuple(tools)
+        self.definitions: tuple[dict[str, Any], ...] = tuple(_tool_definition(t) for t in tools)
+        self.handlers: Mapping[str, Tool] = MappingProxyType(
+            {tool.name: tool for tool in tools if tool.name and tool.handler}
+        )
+
+
+class ToolRegistry:
+    """
+    Named tool sets shared by the sessions of a client.
+
+    Register tools once, then reference them by name with the ``tool_sets``
+    session option. Tools passed directly in ``tools`` take precedence over tools
+    of the same name in a tool set.
+
+    Example:
+        >>> client.tool_registry.register("repo", [read_file, search_code, run_tests])
+        >>> session = await client.create_session({"model": "gpt-5", "tool_sets": ["repo"]})
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sets: dict[str, ToolSet] = {}
+        # Combined definitions and handler maps, keyed by the requested set names
+        self._resolved: dict[tuple[str, ...], tuple[list[dict[str, Any]], Mapping[str, Tool]]] = {}
+
+    def register(self, name: str, tools: list[Tool]) -> ToolSet:
+        """
+        Compile and register a tool set, replacing any set with the same name.
+
+        Sessions already using a replaced set keep the tools they were created with.
+
+        Args:
+            name: The name sessions reference the set by.
+            tools: The tools in the set.
+
+        Returns:
+            The compiled :class:`ToolSet`.
+
+        Raises:
+            ValueError: If two tools share a name.
+        """
+        tool_set = ToolSet(name, tools)
+        with self._lock:
+            self._sets[name] = tool_set
+            self._resolved.clear()
+        return tool_set
+
+    def unregister(self, name: str) -> bool:
+        """
+        Remove a tool set.
+
+        Args:
+            name: The name of the set.
+
+        Returns:
+            True if the set was registered.
+        """
+        with self._lock:
+            removed = self._sets.pop(name, None) is not None
+            self._resolved.clear()
+        return removed
+
+    def get(self, name: str) -> Optional[ToolSet]:
+        """Get a registered tool set by name."""
+        with self._lock:
+            return self._sets.get(name)
+
+    def names(self) -> list[str]:
+        """Get the names of the registered tool sets."""
+        with self._lock:
+            return list(self._sets)
+
+    def __contains__(self, name: object) -> bool:
+        with self._lock:
+            return name in self._sets
+
+    def _resolve(self, names: tuple[str, ...]) -> tuple[list[dict[str, Any]], Mapping[str, Tool]]:
+        """
+        Combine tool sets into one definition list and one handler map.
+
+        The result is cached until a set is registered or removed; callers must
+        not modify it.
+
+        Note:
+            This method is internal.
+
+        Raises:
+            ValueError: If a set is not registered, or two sets contain a tool
+                of the same name.
+        """
+        with self._lock:
+            resolved = self._resolved.get(names)
+            if resolved is not None:
+                return resolved
+            missing = [name for name in names if name not in self._sets]
+            if missing:
+                raise ValueError(f"Unknown tool set: {missing[0]}")
+            sets = [self._sets[name] for name in dict.fromkeys(names)]
+            if len(sets) == 1:
+                resolved = (list(sets[0].definitions), sets[0].handlers)
+            else:
+                definitions: list[dict[str, Any]] = []
+                handlers: dict[str, Tool] = {}
+                seen: set[str] = set()
+                for tool_set in sets:
+                    for tool, definition in zip(tool_set.tools, tool_set.definitions):
+                        if tool.name in seen:
+                            raise ValueError(f"Tool '{tool.name}' is defined by several tool sets")
+                        seen.add(tool.name)
+                        definitions.append(definition)
+                    handlers.update(tool_set.handlers)
+                resolved = (definitions, MappingProxyType(handlers))
+            self._resolved[names] = resolved
+            return resolved
+
+
+def _tool_definition(tool: Tool) -> dict[str, Any]:
+    """Convert a tool to its wire-format definition."""
+    definition: dict[str, Any] = {"name": tool.name, "description": tool.description}
+    if tool.parameters:
+        definition["parameters"] = tool.parameters
+    return definition
@@ -0,0 +1,192 @@
+"""
+Size limits for tool results.
+
+This module applies a :class:`~copilot.types.ToolResultPolicy` to the result of
+a tool call before it is sent to the CLI, so a tool that returns megabytes of
+text does not flood the connection and the model's context.
+"""
+
+import re
+from collections import deque
+from typing import Any, Optional
+
+from .generated.rpc import SessionWorkspaceCreateFileParams
+from .types import ToolResult, ToolResultPolicy
+
+
+def result_size(result: Any) -> int:
+    """Return the UTF-8 size in bytes of a result's text for the LLM."""
+    if not isinstance(result, dict):
+        return 0
+    text = result.get("textResultForLlm")
+    if isinstance(text, _TruncatedText):
+        return text.original_bytes
+    return len(text.encode("utf-8")) if isinstance(text, str) else 0
+
+
+class _TruncatedText(str):
+    """Result text already cut down while it was streamed, with its original size."""
+
+    original_bytes: int
+
+    def __new__(cls, text: str, original_bytes: int) -> "_TruncatedText":
+        value = super().__new__(cls, text)
+        value.original_bytes = original_bytes
+        return value
+
+
+class _StreamedText:
+    """
+    Collects the text chunks a streaming tool yields, bounded by a size policy.
+
+    Once the text exceeds ``policy.max_bytes``, only its first and last
+    ``max_bytes`` bytes are kept for the "truncate" and "fail" strategies, which
+    is all they can return, so memory stays bounded however long the stream
+    runs. Without a policy, and for "offload", which writes the whole text to
+    the workspace, every chunk is kept.
+    """
+
+    def __init__(self, policy: Optional[ToolResultPolicy] = None):
+        self._policy = policy
+        self._bounded = policy is not None and policy.strategy != "offload"
+        self._parts: list[str] = []
+        self._size = 0
+        self._head = bytearray()
+        self._tail: deque[bytes] = deque()
+        self._tail_size = 0
+
+    def add(self, text: str) -> None:
+        """Append a chunk of text."""
+        if not self._bounded:
+            self._parts.append(text)
+            return
+        assert self._policy is not None
+        limit = self._policy.max_bytes
+        data = text.encode("utf-8")
+        self._size += len(data)
+        if len(self._head) < limit:
+            self._head += data[: limit - len(self._head)]
+        self._tail.append(data)
+        self._tail_size += len(data)
+        while self._tail_size - len(self._tail[0]) >= limit:
+            self._tail_size -= len(self._tail.popleft())
+
+    def value(self) -> str:
+        """The collected text, already truncated if it exceeded the policy's limit."""
+        if not self._bounded:
+            return "".join(self._parts)
+        assert self._policy is not None
+        if self._size <= self._policy.max_bytes:
+            return self._head.decode("utf-8")
+        text = _join_truncated(bytes(self._head), b"".join(self._tail), self._size, self._policy)
+        return _TruncatedText(text, self._size)
+
+
+async def apply_result_policy(
+    result: ToolResult,
+    policy: ToolResultPolicy,
+    tool_name: str,
+    tool_call_id: str,
+    workspace: Optional[Any] = None,
+) -> tuple[ToolResult, Optional[str]]:
+    """
+    Apply a size policy to a tool result.
+
+    Args:
+        result: The normalized tool result.
+        policy: The size policy of the tool.
+        tool_name: The name of the tool that produced the result.
+        tool_call_id: The ID of the tool call, used to name offloaded files.
+        workspace: The session's workspace RPC API, used by the "offload" strategy.
+
+    Returns:
+        The result to send, and the action taken: None when the result fits,
+        otherwise "failed", "truncated" or "offloaded".
+    """
+    size = result_size(result)
+    if size <= policy.max_bytes:
+        return result, None
+    text = result["textResultForLlm"]
+
+    if policy.strategy == "fail":
+        return (
+            _with_telemetry(
+                ToolResult(
+                    textResultForLlm=f"Tool '{tool_name}' returned {size} bytes, more than the "
+                    f"limit of {policy.max_bytes} bytes.",
+                    resultType="failure",
+                    error=f"tool '{tool_name}' result exceeds {policy.max_bytes} bytes",
+                ),
+                {"resultBytes": size},
+            ),
+            "failed",
+        )
+
+    if policy.strategy == "offload" and workspace is not None:
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{tool_name}-{tool_call_id}")
+        path = f"{policy.offload_dir}/{safe_name}.txt"
+        try:
+            await workspace.create_file(SessionWorkspaceCreateFileParams(content=text, path=path))
+        except Exception:  # pylint: disable=broad-except
+            pass  # Fall back to truncation
+        else:
+            header = (
+                f"The result ({size} bytes) was too large to return and was saved to the "
+                f"workspace file '{path}'. It begins with:\n\n"
+            )
+            budget = max(0, policy.max_bytes - len(header.encode("utf-8")))
+            preview = text.encode("utf-8")[:budget].decode("utf-8", errors="ignore")
+            return (
+                _with_telemetry(
+                    {**result, "textResultForLlm": header + preview},
+                    {"resultBytes": size, "offloadedTo": path},
+                ),
+                "offloaded",
+            )
+
+    if not isinstance(text, _TruncatedText):  # Else already cut down while streamed
+        text = truncate_text(text, policy)
+    return (
+        _with_telemetry(
+            {**result, "textResultForLlm": text},
+            {"resultBytes": size, "truncated": True},
+        ),
+        "truncated",
+    )
+
+
+def truncate_text(text: str, policy: ToolResultPolicy) -> str:
+    """
+    Cut ``text`` down to about ``policy.max_bytes``, keeping its head and tail.
+
+    The omitted middle is replaced by a marker stating how many bytes were
+    dropped. Multi-byte characters split at a cut are dropped.
+    """
+    data = text.encode("utf-8")
+    if len(data) <= policy.max_bytes:
+        return text
+    return _join_truncated(data, data, len(data), policy)
+
+
+def _join_truncated(head_data: bytes, tail_data: bytes, size: int, policy: ToolResultPolicy) -> str:
+    """
+    Build the truncated form of a text of ``size`` bytes from its start and end.
+
+    ``head_data`` must start the text and ``tail_data`` end it, each holding at
+    least ``policy.max_bytes`` bytes or the whole text.
+    """
+    omitted = size - policy.max_bytes
+    marker = f"\n\n[... {omitted} bytes omitted ...]\n\n"
+    budget = max(0, policy.max_bytes - len(marker.encode("utf-8")))
+    head = int(budget * min(max(policy.head_fraction, 0.0), 1.0))
+    tail = budget - head
+    marker = f"\n\n[... {size - head - tail} bytes omitted ...]\n\n"
+    return (
+        head_data[:head].decode("utf-8", errors="ignore")
+        + marker
+        + (tail_data[len(tail_data) - tail :].decode("utf-8", errors="ignore") if tail else "")
+    )
+
+
+def _with_telemetry(result: Any, telemetry: dict[str, Any]) -> ToolResult:
+    return {**result, "toolTelemetry": {**(result.get("toolTelemetry") or {}), **telemetry}}
@@ -7,23 +7,58 @@ generation from Pydantic models.
 
 from __future__ import annotations
 
+import functools
 import inspect
 import json
-from typing import Any, Callable, TypeVar, get_type_hints, overload
+from collections.abc import AsyncIterator
+from typing import Any, Callable, Literal, TypeVar, get_type_hints, overload
 
 from pydantic import BaseModel
 
-from .types import Tool, ToolInvocation, ToolResult
+from .cancellation import ToolCancellationToken
+from .executors import _current_call, run_in_tool_executor
+from .tool_progress import ToolProgress
+from .tool_results import _StreamedText
+from .types import (
+    Tool,
+    ToolCachePolicy,
+    ToolExecutor,
+    ToolInvocation,
+    ToolResult,
+    ToolResultPolicy,
+)
 
 T = TypeVar("T", bound=BaseModel)
 R = TypeVar("R")
 
+# How arguments are turned into the Pydantic parameter model:
+# - "fast": validate with the model's cached validator (lax mode, like model_validate)
+# - "strict": validate in strict mode (no type coercion, e.g. "1" is not an int)
+# - "none": build the model without validation via model_construct()
+ValidationMode = Literal["fast", "strict", "none"]
+
+# Per-call helpers a handler can receive by annotating a parameter with their
+# type, mapped to the invocation key that carries them
+_INJECTED_TYPES: dict[type, str] = {
+    ToolProgress: "progress",
+    ToolCancellationToken: "cancellation",
+}
+
 
 @overload
 def define_tool(
     name: str | None = None,
     *,
     description: str | None = None,
+    executor: ToolExecutor | None = None,
+    max_concurrency: int | None = None,
+    per_session_max: int | None = None,
+    max_queue: int | None = None,
+    cache: ToolCachePolicy | None = None,
+    validate: ValidationMode = "fast",
+    timeout: float | None = None,
+    result_policy: ToolResultPolicy | None = None,
+    isolated: bool = False,
 ) -> Callable[[Callable[..., Any]], Tool]: ...
 
 
@@ -34,6 +69,15 @@ def define_tool(
     description: str | None = None,
     handler: Callable[[T, ToolInvocation], R],
     params_type: type[T],
+    executor: ToolExecutor | None = None,
+    max_concurrency: int | None = None,
+    per_session_max: int | None = None,
+    max_queue: int | None = None,
+    cache: ToolCachePolicy | None = None,
+    validate: ValidationMode = "fast",
+    timeout: float | None = None,
+    result_policy: ToolResultPolicy | None = None,
+    isolated: bool = False,
 ) -> Tool: ...
 
 
@@ -43,6 +87,15 @@ def define_tool(
     description: str | None = None,
     handler: Callable[[Any, ToolInvocation], Any] | None = None,
     params_type: type[BaseModel] | None = None,
+    executor: ToolExecutor | None = None,
+    max_concurrency: int | None = None,
+    per_session_max: int | None = None,
+    max_queue: int | None = None,
+    cache: ToolCachePolicy | None = None,
+    validate: ValidationMode = "fast",
+    timeout: float | None = None,
+    result_policy: ToolResultPolicy | None = None,
+    isolated: bool = False,
 ) -> Tool | Callable[[Callable[[Any, ToolInvocation], Any]], Tool]:
     """
     Define a tool with automatic JSON schema generation from Pydantic models.
@@ -69,12 +122,41 @@ def define_tool(
             params_type=LookupIssueParams
         )
 
+    Long-running handlers can declare a parameter annotated with ToolProgress to
+    publish progress, and async generator handlers stream their output: each
+    yielded chunk is published as partial output, and the chunks joined together
+    form the result. Handlers can likewise declare a parameter annotated with
+    ToolCancellationToken to learn when their call has timed out.
+
     Args:
         name: The tool name (defaults to function name)
         description: Description of what the tool does (shown to the LLM)
         handler: Optional handler function (if not using as decorator)
         params_type: Optional Pydantic model type for parameters (inferred from
                     type hints when using as decorator)
+        executor: Where a synchronous handler runs: "inline" (on the event loop),
+                  "thread", "process", or a concurrent.futures.Executor. Defaults to
+                  the client's tool_executor option ("thread"). Handlers run with
+                  "process" must be defined at module level and have picklable
+                  parameters and results. Async handlers always run on the event loop.
+        max_concurrency: Maximum number of concurrent calls across all sessions
+        per_session_max: Maximum number of concurrent calls from one session
+        max_queue: Maximum number of calls waiting for a slot; further calls are
+                   answered with a "rejected" result
+        cache: Reuse successful results of calls with identical arguments, see
+               ToolCachePolicy. Only for read-only tools.
+        validate: How arguments are validated against the Pydantic parameter model:
+                  "fast" (default), "strict" (no type coercion) or "none" (trust
+                  the arguments and skip validation). "none" builds the model with
+                  model_construct(), which pays off for large arguments; for small
+                  models "fast" is usually quicker.
+        timeout: Seconds a call may run before it is answered with a "failure"
+                 result. Defaults to the client's tool_timeout option.
+        result_policy: Limit on the size of the result text, see ToolResultPolicy.
+                       Defaults to the client's tool_result_policy option.
+        isolated: Run the handler in the client's pool of isolated worker processes,
+                  the same as executor="isolated". The handler must be synchronous
+                  and meet the requirements of "process".
 
     Returns:
         A Tool instance
@@ -84,8 +166,13 @@ def define_tool(
         tool_name = name if name is not None else getattr(fn, "__name__", "unknown")
 
         sig = inspect.signature(fn)
-        param_names = list(sig.parameters.keys())
         hints = get_type_hints(fn)
+        # A parameter annotated with ToolProgress or ToolCancellationToken receives
+        # the call's helper by keyword and does not count towards the signature shape
+        injected = {
+            p: _INJECTED_TYPES[hints[p]] for p in sig.parameters if hints.get(p) in _INJECTED_TYPES
+        }
+        param_names = [p for p in sig.parameters if p not in injected]
         num_params = len(param_names)
 
         # Detect handler signature:
@@ -108,28 +195,41 @@ def define_tool(
             if ptype is None and _is_pydantic_model(first_param_type):
                 ptype = first_param_type
 
+        is_async = inspect.iscoroutinefunction(fn) or inspect.isasyncgenfunction(fn)
+        tool_executor = executor
+        if isolated:
+            if is_async:
+                raise ValueError(f"Isolated tool '{tool_name}' must have a synchronous handler")
+            if executor not in (None, "isolated"):
+                raise ValueError(f"Isolated tool '{tool_name}' cannot select executor {executor!r}")
+            tool_executor = "isolated"
+        runs_inline = not is_async and tool_executor == "inline"
+
         # Generate schema from Pydantic model
-        schema = None
-        if ptype is not None and _is_pydantic_model(ptype):
-            schema = ptype.model_json_schema()
+        model = ptype if _is_pydantic_model(ptype) else None
+        schema = model.model_json_schema() if model is not None else None
+
+        # All signature decisions are made here, once, rather than on every call
+        bind_args = _compile_binder(takes_params, takes_invocation, model, validate)
 
         async def wrapped_handler(invocation: ToolInvocation) -> ToolResult:
             try:
-                # Build args based on detected signature
-                call_args = []
-                if takes_params:
-                    args = invocation["arguments"] or {}
-                    if ptype is not None and _is_pydantic_model(ptype):
-                        call_args.append(ptype.model_validate(args))
-                    else:
-                        call_args.append(args)
-                if takes_invocation:
-                    call_args.append(invocation)
-
-                result = fn(*call_args)
+                call_args = bind_args(invocation)
+                target = fn
+                if injected:
+                    target = functools.partial(
+                        fn, **{p: _injected_value(invocation, key) for p, key in injected.items()}
+                    )
+
+                if is_async or runs_inline:
+                    result = target(*call_args)
+                else:
+                    result = await run_in_tool_executor(target, call_args, tool_executor)
 
                 if inspect.isawaitable(result):
                     result = await result
+                elif inspect.isasyncgen(result):
+                    result = await _collect_streamed_output(result, invocation.get("progress"))
 
                 return _normalize_result(result)
 
@@ -144,11 +244,21 @@ def define_tool(
                     toolTelemetry={},
                 )
 
+        # Lets process workers reach the undecorated function, see copilot.executors
+        wrapped_handler.__wrapped__ = fn  # type: ignore[attr-defined]
+
         return Tool(
             name=tool_name,
             description=description or "",
             parameters=schema,
             handler=wrapped_handler,
+            executor=tool_executor,
+            max_concurrency=max_concurrency,
+            per_session_max=per_session_max,
+            max_queue=max_queue,
+            cache=cache,
+            timeout=timeout,
+            result_policy=result_policy,
         )
 
     # If handler is provided, call decorator immediately
@@ -161,6 +271,86 @@ def define_tool(
     return decorator
 
 
+def _injected_value(invocation: ToolInvocation, key: str) -> Any:
+    """
+    Return the per-call helper stored under ``key``.
+
+    Handlers invoked outside the client get a detached helper instead.
+    """
+    value = invocation.get(key)
+    if value is not None:
+        return value
+    if key == "progress":
+        return ToolProgress(invocation["tool_call_id"])
+    return ToolCancellationToken()
+
+
+async def _collect_streamed_output(
+    chunks: AsyncIterator[Any], progress: ToolProgress | None
+) -> str:
+    """
+    Consume the output of an async generator tool handler.
+
+    Each yielded chunk is published as partial output and appended to the final
+    result text. Chunks that are not strings are JSON-serialized. When the call
+    has a result size policy, the text is bounded by it while it is collected;
+    see :class:`~copilot.tool_results._StreamedText`.
+    """
+    call = _current_call.get()
+    collected = _StreamedText(call.result_policy if call is not None else None)
+    async for chunk in chunks:
+        text = chunk if isinstance(chunk, str) else _normalize_result(chunk)["textResultForLlm"]
+        if progress is not None:
+            progress.partial(text)
+        collected.add(text)
+    return collected.value()
+
+
+def _compile_binder(
+    takes_params: bool,
+    takes_invocation: bool,
+    model: type[BaseModel] | None,
+    validate: ValidationMode,
+) -> Callable[[ToolInvocation], tuple[Any, ...]]:
+    """
+    Build the function that turns an invocation into the handler's arguments.
+
+    One small function is built per signature shape, so a call does no more than
+    its shape needs.
+    """
+    if validate not in ("fast", "strict", "none"):
+        raise ValueError(f"Unknown validation mode: {validate!r}")
+
+    if not takes_params:
+        if takes_invocation:
+            return lambda invocation: (invocation,)
+        return lambda invocation: ()
+
+    to_params: Callable[[Any], Any]
+    if model is None:
+
+        def to_params(args: Any) -> Any:
+            return args
+
+    elif validate == "none":
+        construct = model.model_construct
+
+        def to_params(args: Any) -> Any:
+            return construct(**args)
+
+    else:
+        # The same validator model_validate() uses, looked up once
+        validate_python = model.__pydantic_validator__.validate_python
+        strict = validate == "strict"
+
+        def to_params(args: Any) -> Any:
+            return validate_python(args, strict=strict)
+
+    if takes_invocation:
+        return lambda invocation: (to_params(invocation["arguments"] or {}), invocation)
+    return lambda invocation: (to_params(invocation["arguments"] or {}),)
+
+
 def _is_pydantic_model(t: Any) -> bool:
     """Check if a type is a Pydantic BaseModel subclass."""
     try:
@@ -5,13 +5,17 @@ Type definitions for the Copilot SDK
 from __future__ import annotations
 
 from collections.abc import Awaitable
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from typing import Any, Callable, Literal, TypedDict, Union
 
 from typing_extensions import NotRequired
 
 # Import generated SessionEvent types
+from .cancellation import ToolCancellationToken
 from .generated.session_events import SessionEvent
+from .metrics import MetricsSink
+from .tool_progress import ToolProgress
 
 # SessionEvent is now imported from generated types
 # It provides proper type discrimination for all event types
@@ -97,6 +101,37 @@ class CopilotClientOptions(TypedDict, total=False):
     # When False, only explicit tokens (github_token or environment variables) are used.
     # Default: True (but defaults to False when github_token is provided)
     use_logged_in_user: bool
+    # Directory for durable per-session event journals. When set, every non-ephemeral
+    # session event is appended to <journal_dir>/<session_id>/ so a restarted process
+    # can rebuild session state locally (see copilot.journal.EventJournal).
+    journal_dir: str
+    # Default executor for synchronous tool handlers (default: "thread"). Individual tools
+    # can override it with Tool.executor / define_tool(executor=...).
+    tool_executor: ToolExecutor
+    # Maximum number of workers in the client's tool thread and process pools
+    # (default: chosen by concurrent.futures)
+    tool_max_workers: int
+    # Options for the pool of isolated worker processes used by tools with
+    # executor="isolated" / define_tool(isolated=True)
+    tool_worker_pool: WorkerPoolOptions
+    # Default seconds a tool call may run before it is answered with a "failure" result
+    # (default: no limit). Individual tools can override it with Tool.timeout.
+    tool_timeout: float
+    # Default size policy for tool results (default: no limit). Individual tools can
+    # override it with Tool.result_policy.
+    tool_result_policy: ToolResultPolicy
+    # Extra receivers of per-call tool metrics, e.g. copilot.metrics.OpenTelemetrySink.
+    # The client's own figures are always kept in client.tool_metrics.
+    tool_metrics_sinks: list[MetricsSink]
+    # Evict sessions with no events or sends for this many seconds (default: never).
+    # Evicted sessions are re-attached, and resumed if needed, on their next use.
+    session_idle_ttl: float
+    # Evict the least recently active sessions beyond this many (default: no limit)
+    max_sessions: int
+    # Also destroy evicted sessions on the server (default: False)
+    destroy_evicted: bool
+    # TTLs and on-disk sharing of list_models, get_status and get_quota results
+    server_cache: ServerCacheOptions
 
 
 ToolResultType = Literal["success", "failure", "rejected", "denied"]
@@ -125,10 +160,88 @@ class ToolInvocation(TypedDict):
     tool_call_id: str
     tool_name: str
     arguments: Any
+    # Reporter for progress and partial output (set for calls dispatched by the client)
+    progress: NotRequired[ToolProgress]
+    # Set when the call times out (set for calls dispatched by the client)
+    cancellation: NotRequired[ToolCancellationToken]
 
 
 ToolHandler = Callable[[ToolInvocation], Union[ToolResult, Awaitable[ToolResult]]]
 
+# Where synchronous tool handlers run: on the event loop ("inline"), in the client's
+# thread pool ("thread"), in the client's process pool ("process"), in the client's pool
+# of isolated warm worker processes ("isolated", see copilot.workers.WorkerPool), or in a
+# caller-supplied concurrent.futures.Executor. Async handlers always run on the event loop.
+ToolExecutor = Union[Literal["inline", "thread", "process", "isolated"], Executor]
+
+
+class WorkerPoolOptions(TypedDict, total=False):
+    """Options for the client's "isolated" tool worker pool."""
+
+    # Number of worker processes (default: tool_max_workers, then the number of CPUs)
+    workers: int
+    # Modules each worker imports when it starts, e.g. the modules defining the tools
+    preload: list[str]
+    # Calls a worker serves before it is replaced (default: unlimited)
+    max_calls: int
+    # Address space limit in bytes for each worker (Unix only)
+    memory_limit: int
+    # Seconds a call may run before its worker is killed (default: unlimited)
+    time_limit: float
+
+
+class ServerCacheOptions(TypedDict, total=False):
+    """Caching of models.list, status.get and account.getQuota results."""
+
+    # Seconds a models.list result stays fresh (default: until the client stops;
+    # only results with a finite TTL are kept on disk)
+    models_ttl: float | None
+    # Seconds a status.get result stays fresh (default: 0, not cached)
+    status_ttl: float
+    # Seconds an account.getQuota result stays fresh (default: 0, not cached)
+    quota_ttl: float
+    # Seconds past its TTL an entry is still served while it is refreshed in the
+    # background (default: 0)
+    stale_ttl: float
+    # Directory of an on-disk cache shared by processes using the same identity
+    disk_dir: str
+    # Identity the on-disk cache is keyed by (default: a hash of the GitHub token
+    # the CLI uses; without a token or an identity, nothing is kept on disk)
+    identity: str
+
+
+@dataclass
+class ToolCachePolicy:
+    """
+    Opt-in memoization of a tool's successful results.
+
+    Results are keyed by the tool name and a canonical hash of the call arguments.
+    Only use this for read-only tools whose result depends on the arguments alone.
+    """
+
+    ttl: float | None = 300.0  # Seconds an entry stays valid (None: until evicted)
+    max_entries: int = 1024  # Least recently used entries are evicted beyond this
+    max_bytes: int | None = None  # Limit on the total size of cached result text
+    per_session: bool = False  # Keep separate entries for each session
+
+
+@dataclass
+class ToolResultPolicy:
+    """
+    Limit on the size of a tool's result text.
+
+    Results larger than ``max_bytes`` (UTF-8) are handled by ``strategy``:
+    "fail" replaces the result with a failure, "truncate" keeps the head and tail
+    of the text around a marker, and "offload" saves the full text to the session
+    workspace and returns a pointer to it with a preview. Offloading falls back to
+    truncation if the file cannot be written.
+    """
+
+    max_bytes: int = 64_000
+    strategy: Literal["fail", "truncate", "offload"] = "truncate"
+    head_fraction: float = 0.8  # Share of the kept text taken from the start when truncating
+    offload_dir: str = "tool-results"  # Workspace directory for offloaded results
+
 
 @dataclass
 class Tool:
@@ -136,6 +249,22 @@ class Tool:
     description: str
     handler: ToolHandler
     parameters: dict[str, Any] | None = None
+    # Executor for a synchronous handler; None uses the client's tool_executor option
+    executor: ToolExecutor | None = None
+    # Maximum number of concurrent calls across all sessions (None: unlimited)
+    max_concurrency: int | None = None
+    # Maximum number of concurrent calls from a single session (None: unlimited)
+    per_session_max: int | None = None
+    # Maximum number of calls waiting for a slot; further calls get a "rejected"
+    # result (None: unbounded). Only applies when a concurrency limit is set.
+    max_queue: int | None = None
+    # Reuse successful results of calls with identical arguments (None: never cache)
+    cache: ToolCachePolicy | None = None
+    # Seconds a call may run before it is answered with a "failure" result
+    # (None: the client's tool_timeout option)
+    timeout: float | None = None
+    # Limit on the size of the result text (None: the client's tool_result_policy option)
+    result_policy: ToolResultPolicy | None = None
 
 
 # System message configuration (discriminated union)
@@ -476,6 +605,9 @@ class SessionConfig(TypedDict, total=False):
     # Only valid for models where capabilities.supports.reasoning_effort is True.
     reasoning_effort: ReasoningEffort
     tools: list[Tool]
+    # Names of tool sets registered with the client's tool_registry; their
+    # definitions and handlers are shared rather than rebuilt per session
+    tool_sets: list[str]
     system_message: SystemMessageConfig  # System message configuration
     # List of tool names to allow (takes precedence over excluded_tools)
     available_tools: list[str]
@@ -510,6 +642,12 @@ class SessionConfig(TypedDict, total=False):
     # When enabled (default), sessions automatically manage context limits and persist state.
     # Set to {"enabled": False} to disable.
     infinite_sessions: InfiniteSessionConfig
+    # Keep a local copy of the session history, updated from live events, so that
+    # repeated get_messages() calls only pay for events received since the last read.
+    history_cache: bool
+    # Serve session.rpc plan, mode, model and workspace listing reads from a cache
+    # kept current by session events.
+    rpc_cache: bool
 
 
 # Azure-specific provider options
@@ -544,6 +682,9 @@ class ResumeSessionConfig(TypedDict, total=False):
     # Model to use for this session. Can change the model when resuming.
     model: str
     tools: list[Tool]
+    # Names of tool sets registered with the client's tool_registry; their
+    # definitions and handlers are shared rather than rebuilt per session
+    tool_sets: list[str]
     system_message: SystemMessageConfig  # System message configuration
     # List of tool names to allow (takes precedence over excluded_tools)
     available_tools: list[str]
@@ -576,6 +717,10 @@ class ResumeSessionConfig(TypedDict, total=False):
     # When True, skips emitting the session.resume event.
     # Useful for reconnecting to a session without triggering resume-related side effects.
     disable_resume: bool
+    # Keep a local copy of the session history, updated from live events.
+    history_cache: bool
+    # Serve session.rpc plan, mode, model and workspace listing reads from a cache.
+    rpc_cache: bool
 
 
 # Options for sending a message to a session
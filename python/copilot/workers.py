@@ -0,0 +1,269 @@
+"""
+Isolated worker processes for tool handlers.
+
+This module provides :class:`WorkerPool`, an executor that keeps warm worker
+processes with the tool modules already imported. Each call is sent to a
+worker over a pipe, is bounded in time and memory, and a worker that crashes,
+runs out of time or has served its share of calls is replaced, so an untrusted
+or CPU-heavy tool cannot take down or slow down the client's process.
+"""
+
+import importlib
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Optional
+
+_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+class WorkerTimeoutError(Exception):
+    """Raised when a call exceeds the pool's time limit; the worker is killed."""
+
+
+class WorkerCrashedError(Exception):
+    """Raised when a worker process dies while running a call."""
+
+
+@dataclass
+class WorkerPoolStats:
+    """Counters for a :class:`WorkerPool`."""
+
+    workers_started: int = 0
+    calls: int = 0
+    recycled: int = 0  # Workers retired after max_calls or a MemoryError
+    crashed: int = 0  # Workers that died during a call
+    timed_out: int = 0  # Workers killed for exceeding the time limit
+
+
+class WorkerPool(Executor):
+    """
+    A pool of warm worker processes for running tool handlers in isolation.
+
+    Workers are started ahead of use, import the ``preload`` modules once, and
+    then serve calls one at a time. Calls and results are pickled and sent over
+    a pipe, so functions must be defined at module level and their arguments and
+    results must be picklable (``@define_tool`` functions are supported).
+
+    Example:
+        >>> pool = WorkerPool(workers=4, preload=["myproject.parsers"],
+        ...                   max_calls=200, memory_limit=512 * 2**20, time_limit=30)
+        >>> session = await client.create_session({"tools": [define_tool(
+        ...     "parse", description="Parse a file", handler=parse, params_type=ParseParams,
+        ...     executor=pool)]})
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        preload: Optional[list[str]] = None,
+        max_calls: Optional[int] = None,
+        memory_limit: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        mp_context: Optional[Any] = None,
+    ):
+        """
+        Initialize the pool. Workers are started on first use or by :meth:`start`.
+
+        Args:
+            workers: Number of worker processes (default: the number of CPUs).
+            preload: Modules each worker imports when it starts.
+            max_calls: Calls a worker serves before it is replaced (default: unlimited).
+            memory_limit: Address space limit in bytes for each worker. Enforced
+                where the ``resource`` module is available (Unix); a call that
+                exceeds it fails with MemoryError and its worker is replaced.
+            time_limit: Seconds a call may run before its worker is killed and the
+                call fails with :class:`WorkerTimeoutError` (default: unlimited).
+            mp_context: The multiprocessing context (default: "spawn").
+        """
+        self._size = workers or os.cpu_count() or 1
+        self._preload = list(preload or [])
+        self._max_calls = max_calls
+        self._memory_limit = memory_limit
+        self._time_limit = time_limit
+        self._context = mp_context or multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._idle: queue.SimpleQueue[_Worker] = queue.SimpleQueue()
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._shutdown = False
+        self._stats = WorkerPoolStats()
+
+    def start(self) -> None:
+        """Start the worker processes, if they are not running yet."""
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot start a worker pool after shutdown")
+            if self._threads is not None:
+                return
+            self._threads = ThreadPoolExecutor(self._size, thread_name_prefix="copilot-worker")
+        for _ in range(self._size):
+            self._spawn()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> "Future[Any]":
+        """
+        Schedule ``fn(*args, **kwargs)`` to run in a worker process.
+
+        Returns:
+            A future for the result. It fails with :class:`WorkerTimeoutError` or
+            :class:`WorkerCrashedError` if the worker does not return a result.
+        """
+        self.start()
+        threads = self._threads
+        if threads is None or self._shutdown:
+            raise RuntimeError("cannot schedule new calls after shutdown")
+        return threads.submit(self._call, _picklable(fn), args, kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop the worker processes.
+
+        Args:
+            wait: Wait for running calls to finish before returning.
+            cancel_futures: Cancel calls that have not started.
+        """
+        with self._lock:
+            self._shutdown = True
+            threads = self._threads
+        if threads is not None:
+            threads.shutdown(wait=wait, cancel_futures=cancel_futures)
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(worker)
+
+    def stats(self) -> WorkerPoolStats:
+        """Get a snapshot of the pool's counters."""
+        with self._lock:
+            return replace(self._stats)
+
+    def _call(self, fn: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        payload = pickle.dumps((fn, args, kwargs), _PROTOCOL)
+        worker = self._idle.get()
+        try:
+            if not worker.ready:
+                # Startup and preloading do not count towards the time limit
+                worker.conn.recv_bytes()
+                worker.ready = True
+            worker.conn.send_bytes(payload)
+            if not worker.conn.poll(self._time_limit):
+                self._discard(worker, "timed_out")
+                raise WorkerTimeoutError(
+                    f"tool call exceeded the worker time limit of {self._time_limit:g}s"
+                )
+            status, value = pickle.loads(worker.conn.recv_bytes())
+        except (EOFError, OSError) as exc:
+            self._discard(worker, "crashed")
+            raise WorkerCrashedError(
+                f"tool worker exited unexpectedly (exit code {worker.process.exitcode})"
+            ) from exc
+
+        worker.calls += 1
+        with self._lock:
+            self._stats.calls += 1
+        if isinstance(value, MemoryError) or (
+            self._max_calls is not None and worker.calls >= self._max_calls
+        ):
+            self._discard(worker, "recycled")
+        else:
+            self._release(worker)
+        if status == "error":
+            raise value
+        return value
+
+    def _spawn(self) -> None:
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child, self._preload, self._memory_limit),
+            name="copilot-worker",
+            daemon=True,
+        )
+        process.start()
+        child.close()
+        with self._lock:
+            self._stats.workers_started += 1
+        self._idle.put(_Worker(process, parent))
+
+    def _release(self, worker: "_Worker") -> None:
+        if self._shutdown:
+            self._retire(worker)
+        else:
+            self._idle.put(worker)
+
+    def _discard(self, worker: "_Worker", reason: str) -> None:
+        # Replace a worker that must not serve further calls
+        with self._lock:
+            setattr(self._stats, reason, getattr(self._stats, reason) + 1)
+        if not self._shutdown:
+            self._spawn()
+        self._retire(worker, kill=reason != "recycled")
+
+    def _retire(self, worker: "_Worker", kill: bool = False) -> None:
+        if kill:
+            worker.process.kill()
+        worker.conn.close()  # A live worker exits when its pipe closes
+        worker.process.join(timeout=1 if not kill else None)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+
+
+class _Worker:
+    __slots__ = ("process", "conn", "calls", "ready")
+
+    def __init__(self, process: Any, conn: Connection):
+        self.process = process
+        self.conn = conn
+        self.calls = 0
+        self.ready = False
+
+
+def _picklable(fn: Callable[..., Any]) -> Callable[..., Any]:
+    # Imported here because copilot.executors creates WorkerPools
+    from .executors import _process_callable
+
+    return _process_callable(fn)
+
+
+def _worker_main(conn: Connection, preload: list[str], memory_limit: Optional[int]) -> None:
+    """
+    Serve calls received over ``conn`` until it is closed.
+
+    Note:
+        This function runs in the worker process.
+    """
+    if memory_limit is not None:
+        try:
+            import resource
+        except ImportError:
+            pass
+        else:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    for module in preload:
+        importlib.import_module(module)
+    conn.send_bytes(b"")  # Ready
+
+    while True:
+        try:
+            data = conn.recv_bytes()
+        except (EOFError, OSError):
+            return
+        try:
+            fn, args, kwargs = pickle.loads(data)
+            reply: tuple[str, Any] = ("ok", fn(*args, **kwargs))
+        except Exception as exc:  # pylint: disable=broad-except
+            reply = ("error", exc)
+        try:
+            payload = pickle.dumps(reply, _PROTOCOL)
+        except Exception as exc:  # pylint: disable=broad-except
+            payload = pickle.dumps(
+                ("error", RuntimeError(f"tool result could not be pickled: {exc}")), _PROTOCOL
+            )
+        conn.send_bytes(payload)
@@ -0,0 +1,540 @@
+"""
+Chunked access to session workspace files.
+
+This module provides :class:`SessionWorkspace`, available as
+:attr:`CopilotSession.workspace`. It reads and writes workspace files in byte
+ranges so that large artifacts are never held in memory as a whole, and keeps
+several chunks in flight to overlap disk I/O with the caller's processing. It
+can also mirror a local directory to or from the workspace, transferring only
+the files whose content changed.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import threading
+import uuid
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Literal, Optional, Union
+
+from .generated.rpc import SessionWorkspaceCreateFileParams, SessionWorkspaceReadFileParams
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+SyncDirection = Literal["push", "pull"]
+
+# Temporary files created by SessionWorkspace.write_chunks
+_TEMP_FILE = re.compile(r"^\..+\.[0-9a-f]{32}$")
+
+
+@dataclass(frozen=True)
+class WorkspaceChunk:
+    """A byte range of a workspace file."""
+
+    offset: int
+    data: bytes
+
+
+@dataclass
+class WorkspaceSyncResult:
+    """The outcome of :meth:`SessionWorkspace.sync`."""
+
+    transferred: list[str] = field(default_factory=list)  # Paths that were copied
+    skipped: int = 0  # Files whose content was already in sync
+    bytes_transferred: int = 0
+
+
+class SessionWorkspace:
+    """
+    Chunked reads and writes of a session's workspace files.
+
+    When the session's workspace directory is reachable on this machine (the
+    usual case when the client starts the CLI), files are read and written
+    directly in byte ranges, with binary content supported. Otherwise the
+    ``session.workspace`` RPC methods are used; they transfer whole UTF-8 files,
+    so chunks are cut from the full content and binary content is rejected.
+
+    Paths are relative to the workspace's ``files/`` directory.
+
+    Example:
+        >>> async for chunk in session.workspace.read_chunks("report.json"):
+        ...     out.write(chunk.data)
+        >>> await session.workspace.write_chunks("dump.bin", produce_chunks())
+    """
+
+    def __init__(self, session: Any, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize the workspace accessor.
+
+        Note:
+            Use :attr:`CopilotSession.workspace` instead of creating one directly.
+
+        Args:
+            session: The session whose workspace is accessed.
+            chunk_size: Default size of the chunks read.
+        """
+        self._session = session
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        # Content hash of each workspace file as of its last sync, and the paths
+        # reported changed by session.workspace_file_changed events since then
+        self._manifest: dict[str, str] = {}
+        self._changed: set[str] = set()
+        # Hashes of local files keyed by path, valid while (size, mtime) match
+        self._hashes: dict[str, tuple[int, int, str]] = {}
+
+    @property
+    def manifest(self) -> dict[str, str]:
+        """The SHA-256 of each workspace file as of its last sync, keyed by path."""
+        with self._lock:
+            return dict(self._manifest)
+
+    @property
+    def local_dir(self) -> Optional[str]:
+        """The workspace ``files/`` directory on this machine, or None if unreachable."""
+        workspace_path = self._session.workspace_path
+        if workspace_path and os.path.isdir(workspace_path):
+            return os.path.join(workspace_path, "files")
+        return None
+
+    async def read_chunks(
+        self,
+        path: str,
+        *,
+        offset: int = 0,
+        length: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        prefetch: int = 4,
+    ) -> AsyncIterator[WorkspaceChunk]:
+        """
+        Read a byte range of a workspace file as a sequence of chunks.
+
+        Args:
+            path: Path relative to the workspace files directory.
+            offset: First byte to read.
+            length: Number of bytes to read (default: to the end of the file).
+            chunk_size: Size of each chunk (default: :attr:`chunk_size`).
+            prefetch: Chunks read ahead while the caller processes earlier ones.
+
+        Yields:
+            :class:`WorkspaceChunk` objects in file order.
+
+        Raises:
+            ValueError: If the path escapes the workspace.
+            FileNotFoundError: If the file does not exist in a local workspace.
+        """
+        size = chunk_size or self.chunk_size
+        local_dir = self.local_dir
+        if local_dir is None:
+            data = await self._read_remote(path)
+            end = len(data) if length is None else min(len(data), offset + length)
+            for start in range(offset, end, size):
+                yield WorkspaceChunk(start, data[start : min(start + size, end)])
+            return
+
+        full_path = _resolve(local_dir, path)
+        loop = asyncio.get_running_loop()
+        file_size = (await loop.run_in_executor(None, os.stat, full_path)).st_size
+        end = file_size if length is None else min(file_size, offset + length)
+        pending: deque[tuple[int, asyncio.Future[bytes]]] = deque()
+        next_offset = offset
+        try:
+            while pending or next_offset < end:
+                while next_offset < end and len(pending) < max(1, prefetch):
+                    n = min(size, end - next_offset)
+                    future = loop.run_in_executor(None, _read_range, full_path, next_offset, n)
+                    pending.append((next_offset, future))
+                    next_offset += n
+                start, future = pending.popleft()
+                yield WorkspaceChunk(start, await future)
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    async def read_bytes(self, path: str, offset: int = 0, length: Optional[int] = None) -> bytes:
+        """
+        Read a byte range of a workspace file into memory.
+
+        Args:
+            path: Path relative to the workspace files directory.
+            offset: First byte to read.
+            length: Number of bytes to read (default: to the end of the file).
+
+        Returns:
+            The bytes read.
+        """
+        parts = [c.data async for c in self.read_chunks(path, offset=offset, length=length)]
+        return b"".join(parts)
+
+    async def write_chunks(
+        self,
+        path: str,
+        chunks: Union[AsyncIterable[Union[bytes, str]], Iterable[Union[bytes, str]]],
+        *,
+        max_in_flight: int = 4,
+    ) -> int:
+        """
+        Write a workspace file from a sequence of chunks.
+
+        In a local workspace the chunks are written to a temporary file, up to
+        ``max_in_flight`` at a time, which then replaces ``path`` atomically; a
+        failed write leaves any existing file untouched. Local writes do not go
+        through the ``session.workspace`` RPC methods, so the CLI emits no
+        ``session.workspace_file_changed`` event for them and other observers of
+        the session do not see them; the session's own cached file listing (see
+        the ``rpc_cache`` session option) is updated.
+
+        Args:
+            path: Path relative to the workspace files directory.
+            chunks: Bytes or str chunks (str is encoded as UTF-8), sync or async.
+            max_in_flight: Chunks being written concurrently.
+
+        Returns:
+            The number of bytes written.
+
+        Raises:
+            ValueError: If the path escapes the workspace, or binary content is
+                written to a workspace only reachable over RPC.
+        """
+        local_dir = self.local_dir
+        if local_dir is None:
+            data = b"".join([_as_bytes(chunk) async for chunk in _aiter(chunks)])
+            await self._write_remote(path, data)
+            return len(data)
+
+        full_path = _resolve(local_dir, path)
+        loop = asyncio.get_running_loop()
+        directory = os.path.dirname(full_path)
+        temp_path = os.path.join(directory, f".{os.path.basename(full_path)}.{uuid.uuid4().hex}")
+        await loop.run_in_executor(None, _create_empty, temp_path)
+        pending: deque[asyncio.Future[None]] = deque()
+        written = 0
+        try:
+            async for chunk in _aiter(chunks):
+                data = _as_bytes(chunk)
+                pending.append(loop.run_in_executor(None, _write_range, temp_path, written, data))
+                written += len(data)
+                if len(pending) >= max(1, max_in_flight):
+                    await pending.popleft()
+            while pending:
+                await pending.popleft()
+            await loop.run_in_executor(None, os.replace, temp_path, full_path)
+        except BaseException:
+            await asyncio.gather(*pending, return_exceptions=True)
+            await loop.run_in_executor(None, _remove_if_exists, temp_path)
+            raise
+        rpc_cache = self._session._rpc_cache
+        if rpc_cache is not None:
+            relative = os.path.relpath(full_path, os.path.realpath(local_dir))
+            rpc_cache._file_written(relative.replace(os.sep, "/"))
+        return written
+
+    async def write_bytes(self, path: str, data: Union[bytes, str]) -> int:
+        """
+        Write a workspace file from bytes or str.
+
+        Large content is written in chunks of :attr:`chunk_size`.
+
+        Returns:
+            The number of bytes written.
+        """
+        content = _as_bytes(data)
+        view = memoryview(content)
+        chunks = (
+            bytes(view[i : i + self.chunk_size]) for i in range(0, len(content), self.chunk_size)
+        )
+        return await self.write_chunks(path, chunks)
+
+    async def sync(
+        self,
+        local_dir: str,
+        direction: SyncDirection = "push",
+        *,
+        concurrency: int = 8,
+        batch_bytes: int = 256 * 1024,
+    ) -> WorkspaceSyncResult:
+        """
+        Mirror a local directory to or from the workspace files directory.
+
+        Only files whose content differs are transferred. The workspace keeps a
+        manifest of content hashes from earlier syncs, kept current by
+        ``session.workspace_file_changed`` events, so unchanged workspace files
+        are not read back to be compared. Local files are only rehashed when
+        their size or modification time changed. Files are not deleted on
+        either side.
+
+        Args:
+            local_dir: The local directory.
+            direction: "push" copies local files into the workspace; "pull"
+                copies workspace files into ``local_dir``.
+            concurrency: Transfers run at the same time.
+            batch_bytes: Files smaller than this are grouped into batches of up
+                to this many bytes, each transferred by one worker. Files of
+                unknown size, as listed by the workspace RPC, are transferred
+                one per worker.
+
+        Returns:
+            The paths transferred and the number of files skipped.
+
+        Raises:
+            ValueError: If ``direction`` is unknown.
+
+        Example:
+            >>> await session.workspace.sync("./project", "push")
+            >>> await session.send_and_wait({"prompt": "Refactor the parser"})
+            >>> result = await session.workspace.sync("./project", "pull")
+            >>> print(result.transferred)
+        """
+        if direction not in ("push", "pull"):
+            raise ValueError(f"Unknown sync direction: {direction!r}")
+        result = WorkspaceSyncResult()
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def hashed(path: str) -> str:
+            async with semaphore:
+                return await self._hash(path)
+
+        if direction == "push":
+            candidates = await asyncio.get_running_loop().run_in_executor(None, _scan, local_dir)
+            digests = await asyncio.gather(
+                *(hashed(os.path.join(local_dir, path)) for path, _ in candidates)
+            )
+            todo: list[tuple[str, Optional[int], Optional[str]]] = []
+            for (path, size), digest in zip(candidates, digests):
+                if await self._in_sync(path, digest):
+                    result.skipped += 1
+                else:
+                    todo.append((path, size, digest))
+            transfer = self._push
+        else:
+            todo = []
+            for path, size in await self._list(local_dir):
+                local_path = _resolve(local_dir, path)
+                digest = await hashed(local_path) if os.path.isfile(local_path) else None
+                if digest is not None and await self._in_sync(path, digest):
+                    result.skipped += 1
+                else:
+                    todo.append((path, size, None))
+            transfer = self._pull
+
+        async def run(batch: list[tuple[str, Optional[int], Optional[str]]]) -> None:
+            async with semaphore:
+                for path, _, digest in batch:
+                    size = await transfer(local_dir, path, digest)
+                    result.bytes_transferred += size
+                    result.transferred.append(path)
+
+        await asyncio.gather(*(run(batch) for batch in _batches(todo, batch_bytes)))
+        return result
+
+    def _on_file_changed(self, path: Optional[str]) -> None:
+        """
+        Record that a workspace file changed since it was last synced.
+
+        Note:
+            This method is internal. It is called for session.workspace_file_changed events.
+        """
+        if path:
+            with self._lock:
+                self._changed.add(path)
+
+    async def _in_sync(self, path: str, digest: str) -> bool:
+        """Whether the workspace copy of ``path`` has content ``digest``."""
+        with self._lock:
+            known = self._manifest.get(path)
+            changed = path in self._changed
+        if known == digest and not changed:
+            return True
+        local_dir = self.local_dir
+        if local_dir is None or not (changed or known is None):
+            return False
+        # A local workspace file is cheaper to hash than to transfer
+        workspace_path = _resolve(local_dir, path)
+        if not os.path.isfile(workspace_path) or await self._hash(workspace_path) != digest:
+            return False
+        self._synced(path, digest)
+        return True
+
+    def _synced(self, path: str, digest: str) -> None:
+        with self._lock:
+            self._manifest[path] = digest
+            self._changed.discard(path)
+
+    async def _hash(self, path: str) -> str:
+        """Hash a local file, reusing the previous hash if it has not been modified."""
+        stat = await asyncio.get_running_loop().run_in_executor(None, os.stat, path)
+        with self._lock:
+            cached = self._hashes.get(path)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        digest = await asyncio.get_running_loop().run_in_executor(None, _hash_file, path)
+        with self._lock:
+            self._hashes[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    async def _list(self, local_dir: str) -> list[tuple[str, Optional[int]]]:
+        """List workspace files with their sizes (None when only reachable over RPC)."""
+        workspace_dir = self.local_dir
+        if workspace_dir is not None:
+            return await asyncio.get_running_loop().run_in_executor(None, _scan, workspace_dir)
+        listing = await self._session.rpc.workspace.list_files()
+        return [(path, None) for path in listing.files]
+
+    async def _push(self, local_dir: str, path: str, digest: Optional[str]) -> int:
+        with self._lock:
+            self._changed.discard(path)
+        written = await self.write_chunks(
+            path, _file_chunks(os.path.join(local_dir, path), self.chunk_size)
+        )
+        if digest is not None:
+            with self._lock:
+                self._manifest[path] = digest
+        return written
+
+    async def _pull(self, local_dir: str, path: str, digest: Optional[str]) -> int:
+        with self._lock:
+            self._changed.discard(path)
+        loop = asyncio.get_running_loop()
+        target = _resolve(local_dir, path)
+        temp_path = os.path.join(
+            os.path.dirname(target), f".{os.path.basename(target)}.{uuid.uuid4().hex}"
+        )
+        await loop.run_in_executor(None, _create_empty, temp_path)
+        sha = hashlib.sha256()
+        written = 0
+        try:
+            async for chunk in self.read_chunks(path):
+                sha.update(chunk.data)
+                await loop.run_in_executor(None, _write_range, temp_path, written, chunk.data)
+                written += len(chunk.data)
+            await loop.run_in_executor(None, os.replace, temp_path, target)
+        except BaseException:
+            await loop.run_in_executor(None, _remove_if_exists, temp_path)
+            raise
+        with self._lock:
+            self._manifest[path] = sha.hexdigest()
+        return written
+
+    async def _read_remote(self, path: str) -> bytes:
+        result = await self._session.rpc.workspace.read_file(
+            SessionWorkspaceReadFileParams(path=path)
+        )
+        return result.content.encode("utf-8")
+
+    async def _write_remote(self, path: str, data: bytes) -> None:
+        try:
+            content = data.decode("utf-8")
+        except UnicodeDecodeError as exc:
+            raise ValueError(
+                "Binary content can only be written when the workspace directory is local"
+            ) from exc
+        await self._session.rpc.workspace.create_file(
+            SessionWorkspaceCreateFileParams(content=content, path=path)
+        )
+
+
+def _resolve(local_dir: str, path: str) -> str:
+    root = os.path.realpath(local_dir)
+    full_path = os.path.realpath(os.path.join(root, path))
+    if os.path.isabs(path) or os.path.commonpath([root, full_path]) != root:
+        raise ValueError(f"Path is outside the session workspace: {path}")
+    return full_path
+
+
+def _as_bytes(chunk: Union[bytes, str]) -> bytes:
+    return chunk.encode("utf-8") if isinstance(chunk, str) else bytes(chunk)
+
+
+async def _aiter(chunks: Any) -> AsyncIterator[Any]:
+    if hasattr(chunks, "__aiter__"):
+        async for chunk in chunks:
+            yield chunk
+    else:
+        for chunk in chunks:
+            yield chunk
+
+
+def _read_range(path: str, offset: int, size: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+def _write_range(path: str, offset: int, data: bytes) -> None:
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        f.write(data)
+
+
+def _create_empty(path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb"):
+        pass
+
+
+def _scan(root: str) -> list[tuple[str, int]]:
+    """List the files under ``root`` as (relative POSIX path, size) pairs."""
+    files = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if _TEMP_FILE.match(name):
+                continue
+            full_path = os.path.join(directory, name)
+            relative = os.path.relpath(full_path, root).replace(os.sep, "/")
+            files.append((relative, os.path.getsize(full_path)))
+    return sorted(files)
+
+
+def _batches(
+    files: list[tuple[str, Optional[int], Optional[str]]], batch_bytes: int
+) -> list[list[tuple[str, Optional[int], Optional[str]]]]:
+    """
+    Group small files into batches of up to ``batch_bytes``.
+
+    Larger files, and files whose size is unknown, go alone.
+    """
+    batches: list[list[tuple[str, Optional[int], Optional[str]]]] = []
+    current: list[tuple[str, Optional[int], Optional[str]]] = []
+    current_size = 0
+    for item in files:
+        size = item[1]
+        if size is None or size >= batch_bytes:
+            batches.append([item])
+            continue
+        if current and current_size + size > batch_bytes:
+            batches.append(current)
+            current, current_size = [], 0
+        current.append(item)
+        current_size += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _hash_file(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(DEFAULT_CHUNK_SIZE), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+async def _file_chunks(path: str, chunk_size: int) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    offset = 0
+    while True:
+        data = await loop.run_in_executor(None, _read_range, path, offset, chunk_size)
+        if not data:
+            return
+        yield data
+        offset += len(data)
+
+
+def _remove_if_exists(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
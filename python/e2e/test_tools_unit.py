@@ -227,6 +227,41 @@ class TestDefineTool:
                 params_type=Params,
             )
 
+    async def test_validation_modes(self):
+        class Params(BaseModel):
+            count: int
+
+        def make(mode):
+            return define_tool(
+                "count",
+                description="Count",
+                handler=lambda params, inv: repr(params.count),
+                params_type=Params,
+                validate=mode,
+            )
+
+        def invoke(tool, count):
+            return tool.handler(
+                {
+                    "session_id": "s",
+                    "tool_call_id": "c",
+                    "tool_name": "count",
+                    "arguments": {"count": count},
+                }
+            )
+
+        assert (await invoke(make("fast"), "3"))["textResultForLlm"] == "3"
+        assert (await invoke(make("strict"), "3"))["resultType"] == "failure"
+        assert (await invoke(make("strict"), 3))["textResultForLlm"] == "3"
+        assert (await invoke(make("none"), "3"))["textResultForLlm"] == "'3'"
+
+    def test_rejects_unknown_validation_mode(self):
+        with pytest.raises(ValueError, match="validation mode"):
+
+            @define_tool(description="Tool", validate="loose")  # type: ignore[arg-type]
+            def tool() -> str:
+                return ""
+
 
 class TestNormalizeResult:
     def test_none_returns_empty_success(self):
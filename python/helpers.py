@@ -0,0 +1,82 @@
+"""
+Shared Unit Test Helpers
+
+Event factories and a fake JSON-RPC connection used across the unit tests.
+Request-specific fake behavior stays in the individual test files, usually as
+a ``FakeConnection`` subclass overriding ``respond``.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Optional, Union
+from uuid import uuid4
+
+from copilot import CopilotClient
+from copilot.generated.session_events import session_event_from_dict
+
+
+def make_event_dict(
+    event_type: str = "user.message",
+    ephemeral: Optional[bool] = None,
+    timestamp: Optional[datetime] = None,
+    **data,
+) -> dict[str, Any]:
+    """Build the wire form of a session event."""
+    event = {
+        "id": str(uuid4()),
+        "timestamp": (timestamp or datetime.now()).isoformat(),
+        "parentId": None,
+        "type": event_type,
+        "data": data,
+    }
+    if ephemeral is not None:
+        event["ephemeral"] = ephemeral
+    return event
+
+
+def make_event(event_type: str = "user.message", **kwargs):
+    """Build a parsed session event."""
+    return session_event_from_dict(make_event_dict(event_type, **kwargs))
+
+
+Response = Union[dict[str, Any], Callable[[dict[str, Any]], dict[str, Any]]]
+
+
+class FakeConnection:
+    """
+    Records JSON-RPC requests and answers them from a response table.
+
+    Entries in ``responses`` are either a result dict or a callable taking the
+    request params. Session creation and resumption echo the session ID by
+    default; any other unlisted method returns an empty result.
+    """
+
+    def __init__(self, responses: Optional[dict[str, Response]] = None, delay: float = 0.0):
+        self.requests: list[tuple[str, dict[str, Any]]] = []
+        self.responses = dict(responses or {})
+        self.delay = delay
+
+    async def request(self, method: str, params: dict[str, Any]):
+        self.requests.append((method, params))
+        response = self.respond(method, params)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return response
+
+    def respond(self, method: str, params: dict[str, Any]):
+        if method in self.responses:
+            response = self.responses[method]
+            return response(params) if callable(response) else response
+        if method in ("session.create", "session.resume"):
+            return {"sessionId": params.get("sessionId", f"s{len(self.requests)}")}
+        return {}
+
+    def methods(self) -> list[str]:
+        return [method for method, _ in self.requests]
+
+
+def make_client(connection: Optional[Any] = None, **options) -> CopilotClient:
+    """Build a client wired to ``connection`` instead of a CLI server."""
+    client = CopilotClient({"cli_url": "localhost:9999", "auto_start": False, **options})
+    client._client = connection if connection is not None else FakeConnection()
+    return client
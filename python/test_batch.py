@@ -0,0 +1,72 @@
+"""
+Bulk Session Operation Unit Tests
+"""
+
+import asyncio
+
+from copilot import SessionTemplate
+from helpers import FakeConnection, make_client
+
+
+class BatchConnection(FakeConnection):
+    """Answers after a short delay, tracking how many requests overlap."""
+
+    def __init__(self, failing=()):
+        super().__init__({"session.delete": {"success": True}}, delay=0.02)
+        self.failing = set(failing)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self, method, params):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().request(method, params)
+        finally:
+            self.in_flight -= 1
+
+    def respond(self, method, params):
+        session_id = params.get("sessionId")
+        if session_id in self.failing:
+            raise RuntimeError(f"{session_id} failed")
+        return super().respond(method, params)
+
+
+class TestBulkSessions:
+    async def test_create_sessions_pipelines_requests(self):
+        client = make_client(BatchConnection())
+        template = SessionTemplate({"model": "gpt-5"})
+
+        started = asyncio.get_running_loop().time()
+        results = await client.create_sessions([template] * 20 + [{"session_id": "named"}])
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert elapsed < 0.2  # About one round trip, not 21
+        assert client._client.max_in_flight == 21
+        assert [r.index for r in results] == list(range(21))
+        assert all(r.ok and r.session is client._sessions[r.session_id] for r in results)
+        assert results[-1].session_id == "named"
+
+    async def test_resume_sessions_reports_errors_per_item(self):
+        client = make_client(BatchConnection(failing={"b"}))
+
+        results = await client.resume_sessions(["a", "b", "c"], {"model": "gpt-5"}, concurrency=2)
+
+        assert [(r.session_id, r.ok) for r in results] == [("a", True), ("b", False), ("c", True)]
+        assert str(results[1].error) == "b failed"
+        assert client._client.max_in_flight == 2
+        assert sorted(client._sessions) == ["a", "c"]
+        assert all(params["model"] == "gpt-5" for _, params in client._client.requests)
+
+    async def test_delete_sessions(self):
+        client = make_client(BatchConnection(failing={"y"}))
+        await client.create_sessions([{"session_id": "x"}, {"session_id": "z"}])
+
+        results = await client.delete_sessions(["x", "y", "z"])
+
+        assert [(r.session_id, r.ok, r.session) for r in results] == [
+            ("x", True, None),
+            ("y", False, None),
+            ("z", True, None),
+        ]
+        assert client._sessions == {}
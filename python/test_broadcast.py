@@ -0,0 +1,127 @@
+"""
+Prompt Map Unit Tests
+"""
+
+import asyncio
+
+from copilot import CopilotSession
+from helpers import FakeConnection, make_client, make_event
+
+
+class PromptConnection(FakeConnection):
+    """Answers each prompt after a per-session delay, echoing the session ID."""
+
+    def __init__(self, delays=None, errors=()):
+        super().__init__()
+        self.client = None
+        self.delays = delays or {}
+        self.errors = set(errors)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def respond(self, method, params):
+        if method == "session.send":
+            asyncio.ensure_future(self._answer(params["sessionId"]))
+            return {"messageId": "m1"}
+        return super().respond(method, params)
+
+    async def _answer(self, session_id):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delays.get(session_id, 0.01))
+        self.in_flight -= 1
+        session = self.client._sessions[session_id]
+        if session_id in self.errors:
+            session._dispatch_event(make_event("session.error", errorType="x", message="boom"))
+            return
+        session._dispatch_event(
+            make_event("assistant.message", messageId="m1", content=f"answer from {session_id}")
+        )
+        session._dispatch_event(make_event("session.idle"))
+
+
+def prompt_client(**kwargs):
+    connection = PromptConnection(**kwargs)
+    connection.client = make_client(connection)
+    return connection.client
+
+
+def add_session(client, session_id):
+    session = CopilotSession(session_id, client._client)
+    client._sessions[session_id] = session
+    return session
+
+
+class TestMapPrompt:
+    async def test_streams_answers_with_bounded_concurrency(self):
+        client = prompt_client(delays={"s0": 0.05})
+        sessions = [add_session(client, f"s{i}") for i in range(6)]
+
+        prompts = client.map_prompt(sessions, "Hello", concurrency=2)
+        results = [result async for result in prompts]
+
+        assert results[0].index != 0  # The slow session answers last in its slot
+        assert sorted(r.index for r in results) == list(range(6))
+        assert all(r.ok and r.content == f"answer from s{r.index}" for r in results)
+        assert client._client.max_in_flight == 2
+        stats = prompts.stats()
+        assert (stats.items, stats.completed, stats.failed) == (6, 6, 0)
+        assert stats.latency.count == 6
+        assert stats.throughput > 0
+        assert not any(s._event_handlers for s in sessions)
+
+    async def test_reports_errors_and_timeouts_per_item(self):
+        client = prompt_client(delays={"slow": 1}, errors={"bad"})
+        sessions = [add_session(client, name) for name in ("ok", "bad", "slow")]
+
+        prompts = client.map_prompt(sessions, "Hello", item_timeout=0.1)
+        results = await prompts.collect()
+
+        assert [r.ok for r in results] == [True, False, False]
+        assert "boom" in str(results[1].error)
+        assert results[2].timed_out
+        assert ("session.abort", {"sessionId": "slow"}) in client._client.requests
+        stats = prompts.stats()
+        assert (stats.completed, stats.failed, stats.timed_out) == (1, 1, 1)
+
+    async def test_deadline_keeps_partial_results(self):
+        client = prompt_client(delays={"s1": 1})
+        sessions = [add_session(client, f"s{i}") for i in range(3)]
+
+        results = await client.map_prompt(sessions, "Hello", concurrency=2, deadline=0.1).collect()
+
+        assert [(r.ok, r.timed_out) for r in results] == [
+            (True, False),
+            (False, True),
+            (True, False),
+        ]
+
+    async def test_rejects_busy_sessions_and_survives_unexpected_errors(self):
+        client = prompt_client()
+        busy, idle, broken = (add_session(client, name) for name in ("busy", "idle", "broken"))
+        busy._busy = True
+
+        def fail(handler):
+            raise RuntimeError("no handlers")
+
+        broken.on = fail
+
+        results = await asyncio.wait_for(
+            client.map_prompt([busy, idle, broken], "Hello", concurrency=1).collect(), 1
+        )
+
+        assert [r.ok for r in results] == [False, True, False]
+        assert "already processing" in str(results[0].error)
+        assert "no handlers" in str(results[2].error)
+        assert all(params["sessionId"] != "busy" for _, params in client._client.requests)
+
+    async def test_creates_and_destroys_sessions_for_configs(self):
+        client = prompt_client()
+
+        results = await client.map_prompt([{"model": "gpt-5"}, {"model": "gpt-5"}], "Hi").collect()
+
+        methods = client._client.methods()
+        assert methods.count("session.create") == 2
+        assert methods.count("session.destroy") == 2
+        assert all(r.ok for r in results)
+        assert client._sessions == {}
@@ -0,0 +1,129 @@
+"""
+Session Eviction Unit Tests
+"""
+
+import asyncio
+import time
+
+from helpers import FakeConnection, make_client, make_event
+
+RESPONSES = {
+    "session.send": {"messageId": "m1"},
+    "session.getMessages": {"events": []},
+    "session.mode.get": {"mode": "interactive"},
+}
+
+
+class TestSessionEviction:
+    async def test_evicts_idle_sessions_and_rehydrates_on_send(self):
+        client = make_client(FakeConnection(RESPONSES), destroy_evicted=True)
+        idle = await client.create_session({"model": "gpt-5", "session_id": "idle"})
+        active = await client.create_session({"session_id": "active"})
+        idle._last_active = time.monotonic() - 120
+
+        evicted = client.evict_idle_sessions(idle_for=60)
+        await idle._evicting
+
+        assert evicted == ["idle"]
+        assert list(client._sessions) == ["active"]
+        assert ("session.destroy", {"sessionId": "idle"}) in client._client.requests
+
+        await idle.send({"prompt": "Hello again"})
+
+        assert client._sessions["idle"] is idle
+        method, payload = client._client.requests[-2]
+        assert method == "session.resume"
+        assert payload["sessionId"] == "idle"
+        assert payload["model"] == "gpt-5"
+        assert payload["disableResume"] is True
+        gauges = client.get_session_gauges()
+        assert (gauges.live, gauges.evicted, gauges.rehydrated) == (2, 1, 1)
+        assert gauges.estimated_bytes > 0
+        assert active._evicted is None
+
+    async def test_busy_sessions_are_not_evicted(self):
+        client = make_client(FakeConnection(RESPONSES))
+        session = await client.create_session()
+        await session.send({"prompt": "Long task"})
+        session._last_active = time.monotonic() - 120
+
+        assert client.evict_idle_sessions(idle_for=60) == []
+
+        session._dispatch_event(make_event("session.idle"))
+        session._last_active = time.monotonic() - 120
+        assert client.evict_idle_sessions(idle_for=60) == [session.session_id]
+
+    async def test_max_sessions_evicts_least_recently_active(self):
+        client = make_client(FakeConnection(RESPONSES), max_sessions=2)
+        first = await client.create_session({"session_id": "first"})
+        second = await client.create_session({"session_id": "second"})
+        first._dispatch_event(make_event("session.idle"))
+
+        await client.create_session({"session_id": "third"})
+
+        assert sorted(client._sessions) == ["first", "third"]
+        assert second._evicted == "detached"
+        assert "session.destroy" not in client._client.methods()
+
+    async def test_detached_session_reattaches_on_incoming_request(self):
+        client = make_client(FakeConnection(RESPONSES))
+        session = await client.create_session({"session_id": "s1"})
+        client.evict_idle_sessions(idle_for=0)
+
+        assert client._lookup_session("s1") is session
+        assert client._sessions["s1"] is session
+        assert "session.resume" not in client._client.methods()
+
+    async def test_every_session_request_rehydrates_destroyed_session(self):
+        client = make_client(FakeConnection(RESPONSES), destroy_evicted=True)
+        session = await client.create_session({"session_id": "s1"})
+
+        calls = [
+            session.abort,
+            lambda: session.get_messages(),
+            lambda: session.rpc.mode.get(),
+        ]
+        for call in calls:
+            client.evict_idle_sessions(idle_for=0)
+            await session._evicting
+            client._client.requests.clear()
+
+            await call()
+
+            assert client._client.methods()[0] == "session.resume"
+            assert client._sessions["s1"] is session
+
+    async def test_concurrent_uses_resume_once(self):
+        client = make_client(FakeConnection(RESPONSES), destroy_evicted=True)
+        client._client.delay = 0.01
+        session = await client.create_session({"session_id": "s1"})
+        client.evict_idle_sessions(idle_for=0)
+
+        await asyncio.gather(
+            session.send({"prompt": "Hello"}), session.rpc.mode.get(), session.get_messages()
+        )
+
+        assert client._client.methods().count("session.resume") == 1
+        assert client.get_session_gauges().rehydrated == 1
+
+    async def test_destroying_evicted_session_does_not_resume_it(self):
+        for destroy_evicted in (True, False):
+            client = make_client(FakeConnection(RESPONSES), destroy_evicted=destroy_evicted)
+            session = await client.create_session({"session_id": "s1"})
+            client.evict_idle_sessions(idle_for=0)
+
+            await session.destroy()
+
+            assert client._client.methods()[1:] == ["session.destroy"]
+            assert "s1" not in client._sessions
+            assert "s1" not in client._evicted_sessions
+
+    async def test_sweeper_evicts_after_ttl(self):
+        client = make_client(FakeConnection(RESPONSES), session_idle_ttl=0.05)
+        session = await client.create_session()
+
+        await asyncio.sleep(0.2)
+
+        assert client._sessions == {}
+        assert session._evicted == "detached"
+        await client.force_stop()
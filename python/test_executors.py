@@ -0,0 +1,126 @@
+"""
+Tool Executor Unit Tests
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pydantic import BaseModel
+
+from copilot import CopilotSession, define_tool
+from copilot.executors import ToolExecutors
+from helpers import make_client
+
+
+class PidParams(BaseModel):
+    tag: str
+
+
+@define_tool(description="Report the worker process", executor="process")
+def report_pid(params: PidParams) -> str:
+    return f"{params.tag}:{os.getpid()}"
+
+
+async def call(client, tool, arguments=None):
+    return await client._execute_tool_call(
+        "s1", "call-1", tool.name, arguments or {}, tool.handler, tool.executor
+    )
+
+
+class TestToolExecutors:
+    async def test_sync_tools_run_off_the_event_loop_by_default(self):
+        client = make_client()
+        loop_thread = threading.current_thread()
+
+        @define_tool(description="Thread name")
+        def which_thread() -> str:
+            return threading.current_thread().name
+
+        result = await call(client, which_thread)
+
+        assert result["resultType"] == "success"
+        assert result["textResultForLlm"] != loop_thread.name
+        assert result["textResultForLlm"].startswith("copilot-tool")
+        await client.force_stop()
+
+    async def test_inline_executor_runs_on_the_event_loop(self):
+        client = make_client(tool_executor="inline")
+
+        @define_tool(description="Thread name")
+        def which_thread() -> str:
+            return threading.current_thread().name
+
+        result = await call(client, which_thread)
+
+        assert result["textResultForLlm"] == threading.current_thread().name
+
+    async def test_tool_executor_overrides_client_default(self):
+        client = make_client(tool_executor="inline")
+        custom = ThreadPoolExecutor(thread_name_prefix="custom")
+
+        @define_tool(description="Thread name", executor=custom)
+        def which_thread() -> str:
+            return threading.current_thread().name
+
+        result = await call(client, which_thread)
+
+        assert result["textResultForLlm"].startswith("custom")
+        custom.shutdown()
+
+    async def test_raw_sync_handlers_are_offloaded(self):
+        client = make_client()
+
+        def handler(invocation):
+            return {
+                "textResultForLlm": threading.current_thread().name,
+                "resultType": "success",
+            }
+
+        result = await client._execute_tool_call("s1", "call-1", "raw", {}, handler)
+
+        assert result["textResultForLlm"].startswith("copilot-tool")
+        await client.force_stop()
+
+    async def test_process_executor_runs_decorated_function(self):
+        client = make_client()
+
+        result = await call(client, report_pid, {"tag": "x"})
+
+        assert result["resultType"] == "success"
+        tag, pid = result["textResultForLlm"].split(":")
+        assert tag == "x"
+        assert int(pid) != os.getpid()
+        await client.force_stop()
+
+    async def test_records_queue_and_run_time_per_tool(self):
+        client = make_client()
+
+        @define_tool(description="Fails")
+        def broken() -> str:
+            raise RuntimeError("boom")
+
+        @define_tool(description="Works")
+        def works() -> str:
+            return "ok"
+
+        session = CopilotSession("s1", None)
+        session._register_tools([works, broken])
+        client._sessions["s1"] = session
+        for name in ("works", "works", "broken"):
+            await client._handle_tool_call_request(
+                {"sessionId": "s1", "toolCallId": "c1", "toolName": name, "arguments": {}}
+            )
+
+        stats = client.get_tool_stats()
+        assert stats["works"].calls == 2
+        assert stats["works"].failures == 0
+        assert stats["broken"].failures == 1
+        assert stats["works"].run_time_total >= 0
+        assert stats["works"].queue_time_avg >= 0
+        await client.force_stop()
+
+    def test_rejects_unknown_executor(self):
+        with pytest.raises(ValueError):
+            ToolExecutors("fiber")  # type: ignore[arg-type]
@@ -0,0 +1,127 @@
+"""
+Fleet Run Unit Tests
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from copilot import CopilotSession
+from helpers import FakeConnection, make_event
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def event_at(event_type, seconds=0, **data):
+    return make_event(event_type, timestamp=T0 + timedelta(seconds=seconds), **data)
+
+
+def fleet_connection(started=True):
+    return FakeConnection({"session.fleet.start": {"started": started}})
+
+
+def started(call_id, name, seconds=0):
+    return event_at(
+        "subagent.started",
+        seconds,
+        toolCallId=call_id,
+        agentName=name,
+        agentDisplayName=name.title(),
+        agentDescription="",
+    )
+
+
+class TestFleetRun:
+    async def test_tracks_subagents_and_counts(self):
+        connection = fleet_connection()
+        session = CopilotSession("s1", connection)
+        fleet = await session.start_fleet("Fix the tests")
+
+        session._dispatch_event(started("c1", "tester"))
+        session._dispatch_event(started("c2", "linter", 1))
+        session._dispatch_event(
+            event_at("subagent.completed", 5, toolCallId="c1", agentName="tester")
+        )
+        session._dispatch_event(
+            event_at("subagent.failed", 3, toolCallId="c2", agentName="linter", error="boom")
+        )
+        session._dispatch_event(event_at("session.idle", 6))
+        subagents = await fleet.wait(timeout=1)
+
+        assert connection.requests == [
+            ("session.fleet.start", {"prompt": "Fix the tests", "sessionId": "s1"})
+        ]
+        assert [(s.tool_call_id, s.status, s.duration) for s in subagents] == [
+            ("c1", "completed", 5.0),
+            ("c2", "failed", 2.0),
+        ]
+        assert fleet.get("c2").error == "boom"
+        counts = fleet.counts()
+        assert (counts.started, counts.running, counts.completed, counts.failed) == (2, 0, 1, 1)
+        fleet.close()
+
+    async def test_wait_requires_idle_and_no_running_subagents(self):
+        session = CopilotSession("s1", fleet_connection())
+        fleet = await session.start_fleet()
+
+        session._dispatch_event(started("c1", "tester"))
+        session._dispatch_event(event_at("session.idle"))
+        assert not fleet.done
+        with pytest.raises(asyncio.TimeoutError):
+            await fleet.wait(timeout=0.01)
+
+        session._dispatch_event(event_at("subagent.completed", toolCallId="c1"))
+        assert fleet.done
+        fleet.close()
+
+    async def test_streams_events_per_subagent(self):
+        session = CopilotSession("s1", fleet_connection())
+        fleet = await session.start_fleet(stream_events=True)
+
+        session._dispatch_event(started("c1", "tester"))
+        session._dispatch_event(started("c2", "linter"))
+        session._dispatch_event(
+            event_at("tool.execution_start", toolCallId="t1", parentToolCallId="c1")
+        )
+        session._dispatch_event(
+            event_at("tool.execution_start", toolCallId="t2", parentToolCallId="c2")
+        )
+        session._dispatch_event(event_at("subagent.completed", toolCallId="c1"))
+
+        events = [event async for event in fleet.stream("c1")]
+
+        assert [(e.type.value, e.data.tool_call_id) for e in events] == [
+            ("tool.execution_start", "t1"),
+            ("subagent.completed", "c1"),
+        ]
+        fleet.close()
+        assert [e.data.tool_call_id async for e in fleet.stream("c2")] == ["t2"]
+
+    async def test_bounds_and_releases_stream_buffers(self):
+        session = CopilotSession("s1", fleet_connection())
+        fleet = await session.start_fleet(stream_events=True, max_buffered_events=2)
+
+        session._dispatch_event(started("c1", "tester"))
+        for call_id in ("t1", "t2", "t3"):
+            session._dispatch_event(
+                event_at("tool.execution_start", toolCallId=call_id, parentToolCallId="c1")
+            )
+        session._dispatch_event(event_at("subagent.completed", toolCallId="c1"))
+
+        assert fleet.dropped_events == 3
+        assert [e.type.value async for e in fleet.stream("c1")] == ["subagent.completed"]
+
+        session._dispatch_event(started("c2", "linter"))
+        session._dispatch_event(event_at("subagent.completed", toolCallId="c2"))
+        session._dispatch_event(event_at("session.idle"))
+
+        assert fleet._streams == {}
+
+    async def test_raises_when_fleet_does_not_start(self):
+        session = CopilotSession("s1", fleet_connection(started=False))
+
+        with pytest.raises(RuntimeError, match="could not be started"):
+            await session.start_fleet()
+
+        assert not session._event_handlers
@@ -0,0 +1,131 @@
+"""
+EventJournal Unit Tests
+"""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from copilot import CopilotSession
+from copilot.journal import EventJournal
+from helpers import FakeConnection, make_client, make_event
+
+
+class TestEventJournal:
+    def test_round_trips_events_across_reopen(self, tmp_path):
+        events = [make_event(content=str(i)) for i in range(3)]
+        journal = EventJournal(str(tmp_path))
+        for event in events:
+            assert journal.append(event)
+        assert not journal.append(events[0])
+        journal.close()
+
+        reopened = EventJournal(str(tmp_path))
+        try:
+            assert len(reopened) == 3
+            assert reopened.tail_event_id == str(events[-1].id)
+            assert reopened.read() == events
+            assert reopened.read(after_event_id=str(events[0].id)) == events[1:]
+            assert reopened.get(str(events[1].id)) == events[1]
+        finally:
+            reopened.close()
+
+    def test_indexes_by_type_across_segments(self, tmp_path):
+        journal = EventJournal(str(tmp_path), segment_max_bytes=300)
+        try:
+            for i in range(6):
+                journal.append(make_event(content=str(i)))
+                journal.append(make_event("assistant.message", content=f"reply {i}"))
+
+            replies = journal.read(event_type="assistant.message")
+            assert [e.data.content for e in replies] == [f"reply {i}" for i in range(6)]
+            assert len(os.listdir(tmp_path)) > 1
+        finally:
+            journal.close()
+
+    def test_discards_torn_trailing_record(self, tmp_path):
+        journal = EventJournal(str(tmp_path))
+        event = make_event()
+        journal.append(event)
+        journal.close()
+        segment = os.path.join(tmp_path, os.listdir(tmp_path)[0])
+        with open(segment, "ab") as f:
+            f.write(b'{"id": "partial')
+
+        reopened = EventJournal(str(tmp_path))
+        try:
+            assert reopened.read() == [event]
+            second = make_event()
+            reopened.append(second)
+            assert reopened.read() == [event, second]
+        finally:
+            reopened.close()
+
+    def test_rejects_appends_after_close(self, tmp_path):
+        journal = EventJournal(str(tmp_path))
+        journal.close()
+        with pytest.raises(RuntimeError):
+            journal.append(make_event())
+
+
+class TestSessionJournal:
+    async def test_history_comes_from_server_and_catches_up_journal(self, tmp_path):
+        events = [make_event(content="a"), make_event(content="b")]
+        journal = EventJournal(str(tmp_path))
+        for event in events:
+            journal.append(event)
+        # Recorded by the server while no client was attached
+        offline = make_event(content="offline")
+
+        history = {"events": [event.to_dict() for event in events + [offline]]}
+        session = CopilotSession("s1", FakeConnection({"session.getMessages": history}))
+        session._enable_history_cache()
+        session._attach_journal(journal)
+
+        history = await session.get_messages()
+        live = make_event(content="c")
+        session._dispatch_event(live)
+
+        assert [str(e.id) for e in history] == [str(e.id) for e in events + [offline]]
+        assert [e.data.content for e in await session.get_messages()] == [
+            "a",
+            "b",
+            "offline",
+            "c",
+        ]
+        assert [e.data.content for e in journal.read()] == ["a", "b", "offline", "c"]
+        await session._close_journal()
+
+    async def test_journals_share_one_flusher_thread(self, tmp_path):
+        before = threading.active_count()
+        journals = [EventJournal(str(tmp_path / str(i))) for i in range(20)]
+        for journal in journals:
+            journal.append(make_event())
+
+        assert threading.active_count() <= before + 1
+        await asyncio.gather(*(journal.aclose() for journal in journals))
+        reopened = EventJournal(str(tmp_path / "0"))
+        assert len(reopened) == 1
+        reopened.close()
+
+    async def test_client_opens_journals_off_the_event_loop(self, tmp_path, monkeypatch):
+        scans = []
+        list_segments = EventJournal._list_segments
+
+        def record_scan(journal):
+            scans.append(threading.current_thread() is threading.main_thread())
+            return list_segments(journal)
+
+        monkeypatch.setattr(EventJournal, "_list_segments", record_scan)
+        client = make_client(journal_dir=str(tmp_path))
+
+        session = await client.create_session()
+        client.evict_idle_sessions(idle_for=0)
+        assert client._lookup_session("s1") is session  # Re-attached by an incoming event
+        await session._journal_opening
+
+        assert scans == [False, False]
+        assert session.journal is not None
+        await session.destroy()
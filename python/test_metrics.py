@@ -0,0 +1,179 @@
+"""
+Tool Metrics Unit Tests
+"""
+
+import asyncio
+
+from copilot import (
+    CopilotSession,
+    ToolCachePolicy,
+    ToolCallSample,
+    ToolMetrics,
+    define_tool,
+)
+from copilot.metrics import TIME_BUCKETS, Histogram, OpenTelemetrySink
+from helpers import make_client
+
+
+def sample(tool="grep", session="s1", run_time=0.01, outcome="success", size=100):
+    return ToolCallSample(tool, session, 0.0, run_time, size, outcome)
+
+
+class FakeInstrument:
+    def __init__(self):
+        self.values = []
+
+    def record(self, value, attributes):
+        self.values.append((value, attributes))
+
+
+class FakeMeter:
+    def __init__(self):
+        self.instruments = {}
+
+    def create_histogram(self, name, unit, description):
+        return self.instruments.setdefault(name, FakeInstrument())
+
+
+class TestHistogram:
+    def test_buckets_and_quantiles(self):
+        histogram = Histogram(TIME_BUCKETS)
+        for value in [0.001] * 90 + [1.0] * 10:
+            histogram.observe(value)
+
+        assert histogram.count == 100
+        assert histogram.quantile(0.5) == 0.001
+        assert 1.0 <= histogram.quantile(0.99) < 2.1
+        assert abs(histogram.mean - 0.1009) < 1e-9
+
+    def test_values_above_the_last_bound(self):
+        histogram = Histogram((1.0, 2.0))
+        histogram.observe(10.0)
+
+        assert histogram.counts == [0, 0, 1]
+        assert histogram.quantile(0.5) == 2.0
+
+
+class TestToolMetrics:
+    def test_records_per_tool_and_session(self):
+        metrics = ToolMetrics()
+        metrics.record_tool_call(sample(session="s1"))
+        metrics.record_tool_call(sample(session="s2", outcome="error"))
+
+        tool = metrics.snapshot()["grep"]
+        assert tool.calls == 2
+        assert tool.outcomes == {"success": 1, "error": 1}
+        assert metrics.snapshot("s2")["grep"].outcomes == {"error": 1}
+
+        metrics.drop_session("s2")
+        assert metrics.snapshot("s2") == {}
+
+    def test_bounds_per_session_figures(self):
+        metrics = ToolMetrics(max_sessions=2)
+        for session in ("a", "b", "a", "c"):
+            metrics.record_tool_call(sample(session=session))
+
+        assert metrics.snapshot("b") == {}
+        assert metrics.snapshot("a")["grep"].calls == 2
+        assert metrics.snapshot()["grep"].calls == 4
+
+    def test_prometheus_text(self):
+        metrics = ToolMetrics()
+        metrics.record_tool_call(sample(run_time=0.0007))
+        metrics.record_tool_call(sample(outcome="timeout"))
+
+        text = metrics.to_prometheus()
+
+        assert "# TYPE copilot_tool_run_seconds histogram" in text
+        assert 'copilot_tool_run_seconds_bucket{tool="grep",le="0.0005"} 0' in text
+        assert 'copilot_tool_run_seconds_bucket{tool="grep",le="0.001"} 1' in text
+        assert 'copilot_tool_run_seconds_bucket{tool="grep",le="+Inf"} 2' in text
+        assert 'copilot_tool_result_bytes_count{tool="grep"} 2' in text
+        assert 'copilot_tool_calls_total{tool="grep",outcome="timeout"} 1' in text
+
+    def test_open_telemetry_sink(self):
+        meter = FakeMeter()
+        sink = OpenTelemetrySink(meter)
+
+        sink.record_tool_call(sample())
+
+        values = meter.instruments["copilot.tool.run_time"].values
+        assert values == [(0.01, {"tool": "grep", "outcome": "success"})]
+
+
+class TestClientToolMetrics:
+    async def test_client_records_outcomes_and_forwards_samples(self):
+        received = []
+
+        class ListSink:
+            def record_tool_call(self, s):
+                received.append(s)
+
+        client = make_client(tool_metrics_sinks=[ListSink()])
+
+        @define_tool(description="Works")
+        async def works() -> str:
+            await asyncio.sleep(0)
+            return "x" * 10
+
+        @define_tool(description="Breaks")
+        def breaks() -> str:
+            raise RuntimeError("boom")
+
+        session = CopilotSession("s1", None)
+        session._register_tools([works, breaks])
+        client._sessions["s1"] = session
+        for name in ("works", "breaks"):
+            await client._handle_tool_call_request(
+                {"sessionId": "s1", "toolCallId": "c1", "toolName": name, "arguments": {}}
+            )
+        await client.force_stop()
+
+        assert [(s.tool_name, s.outcome, s.result_bytes) for s in received] == [
+            ("works", "success", 10),
+            ("breaks", "failure", 76),
+        ]
+        snapshot = client.tool_metrics.snapshot("s1")
+        assert snapshot["works"].result_bytes.sum == 10
+
+    async def test_samples_cover_slot_waits_rejections_and_cache_hits(self):
+        client = make_client()
+        gate = asyncio.Event()
+
+        @define_tool(description="Slow", max_concurrency=1, max_queue=1)
+        async def slow() -> str:
+            await gate.wait()
+            return "done"
+
+        @define_tool(description="Lookup", cache=ToolCachePolicy(ttl=60))
+        async def lookup() -> str:
+            return "value"
+
+        session = CopilotSession("s1", None)
+        session._register_tools([slow, lookup])
+        client._sessions["s1"] = session
+
+        def request(name, call_id):
+            return client._handle_tool_call_request(
+                {"sessionId": "s1", "toolCallId": call_id, "toolName": name, "arguments": {}}
+            )
+
+        first = asyncio.ensure_future(request("slow", "c1"))
+        second = asyncio.ensure_future(request("slow", "c2"))
+        await asyncio.sleep(0.01)
+        rejected = await request("slow", "c3")
+        await asyncio.sleep(0.05)
+        gate.set()
+        await asyncio.gather(first, second)
+        await request("lookup", "c4")
+        await request("lookup", "c5")
+
+        assert rejected["result"]["resultType"] == "rejected"
+        slow_stats = client.get_tool_stats()["slow"]
+        assert (slow_stats.calls, slow_stats.rejected) == (3, 1)
+        # The second call waited for the first one's concurrency slot
+        assert slow_stats.queue_time_max >= 0.05
+        lookup_stats = client.get_tool_stats()["lookup"]
+        assert (lookup_stats.calls, lookup_stats.cache_hits) == (2, 1)
+        outcomes = client.tool_metrics.snapshot()["lookup"].outcomes
+        assert outcomes == {"success": 1, "cached": 1}
@@ -0,0 +1,90 @@
+"""
+SessionPool Unit Tests
+"""
+
+import asyncio
+
+import pytest
+
+from copilot import SessionPool
+
+
+class FakeSession:
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.destroyed = False
+
+    async def destroy(self):
+        self.destroyed = True
+
+
+class FakeClient:
+    def __init__(self):
+        self.created = []
+        self.forgotten = []
+
+    async def create_session(self, config=None):
+        await asyncio.sleep(0)
+        session = FakeSession(f"s{len(self.created)}")
+        self.created.append(session)
+        return session
+
+    def _forget_session(self, session_id):
+        self.forgotten.append(session_id)
+
+
+class TestSessionPool:
+    async def test_serves_pre_created_sessions_and_refills(self):
+        client = FakeClient()
+        pool = SessionPool(client, {"model": "gpt-5"}, size=2)
+        await pool.start()
+        assert pool.idle_count == 2
+
+        session = await pool.acquire()
+        assert session in client.created
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert pool.idle_count == 2
+
+        stats = pool.stats()
+        assert stats.hits == 1
+        assert stats.misses == 0
+        assert stats.refills == 3
+        assert stats.hit_rate == 1.0
+        await pool.close()
+
+    async def test_misses_create_on_demand(self):
+        client = FakeClient()
+        pool = SessionPool(client, size=0)
+        await pool.start()
+
+        await pool.acquire()
+
+        assert pool.stats().misses == 1
+        assert len(client.created) == 1
+        await pool.close()
+
+    async def test_isolated_release_destroys_session(self):
+        client = FakeClient()
+        async with SessionPool(client, size=1) as pool:
+            async with pool.session() as session:
+                pass
+            await asyncio.sleep(0)
+            assert session.destroyed
+            assert session.session_id in client.forgotten
+
+    async def test_shared_release_returns_session_to_pool(self):
+        client = FakeClient()
+        pool = SessionPool(client, size=1, isolate=False)
+        await pool.start()
+        session = await pool.acquire()
+        await pool.release(session)
+        await asyncio.sleep(0)
+
+        assert not session.destroyed
+        await pool.close()
+        assert session.destroyed
+
+    def test_rejects_fixed_session_id(self):
+        with pytest.raises(ValueError):
+            SessionPool(FakeClient(), {"session_id": "fixed"})
@@ -0,0 +1,96 @@
+"""
+Session RPC Cache Unit Tests
+"""
+
+from copilot import CachedSessionRpc, CopilotSession
+from copilot.generated.rpc import Mode, SessionModeSetParams, SessionPlanUpdateParams
+from helpers import FakeConnection, make_event
+
+RESPONSES = {
+    "session.model.getCurrent": {"modelId": "gpt-5"},
+    "session.mode.get": {"mode": "interactive"},
+    "session.plan.read": {"exists": True, "content": "# Plan"},
+    "session.workspace.listFiles": {"files": ["a.txt"]},
+    "session.mode.set": {"mode": "plan"},
+}
+
+
+def cached_session():
+    connection = FakeConnection(RESPONSES)
+    session = CopilotSession("s1", connection)
+    session._enable_rpc_cache()
+    return session, connection
+
+
+class TestRpcCache:
+    async def test_serves_repeated_reads_from_memory(self):
+        session, connection = cached_session()
+        assert isinstance(session.rpc, CachedSessionRpc)
+
+        for _ in range(3):
+            assert (await session.rpc.model.get_current()).model_id == "gpt-5"
+            assert (await session.rpc.mode.get()).mode == Mode.INTERACTIVE
+            assert (await session.rpc.plan.read()).content == "# Plan"
+            files = await session.rpc.workspace.list_files()
+            files.files.append("modified by caller")
+
+        assert files.files == ["a.txt", "modified by caller"]
+        assert len(connection.requests) == 4
+        stats = session.rpc.cache_stats()
+        assert (stats.hits, stats.misses) == (8, 4)
+        assert stats.hit_rate == 8 / 12
+
+    async def test_events_patch_or_invalidate_entries(self):
+        session, connection = cached_session()
+        for read in (
+            session.rpc.model.get_current,
+            session.rpc.mode.get,
+            session.rpc.plan.read,
+            session.rpc.workspace.list_files,
+        ):
+            await read()
+        connection.requests.clear()
+
+        session._dispatch_event(make_event("session.model_change", newModel="claude-sonnet-4.5"))
+        session._dispatch_event(make_event("session.mode_changed", newMode="autopilot"))
+        session._dispatch_event(
+            make_event("session.workspace_file_changed", path="b.txt", operation="create")
+        )
+        session._dispatch_event(
+            make_event("session.workspace_file_changed", path="a.txt", operation="update")
+        )
+        session._dispatch_event(make_event("session.plan_changed", operation="update"))
+
+        assert (await session.rpc.model.get_current()).model_id == "claude-sonnet-4.5"
+        assert (await session.rpc.mode.get()).mode == Mode.AUTOPILOT
+        assert (await session.rpc.workspace.list_files()).files == ["a.txt", "b.txt"]
+        assert connection.methods() == []
+        await session.rpc.plan.read()
+        assert connection.methods() == ["session.plan.read"]
+        stats = session.rpc.cache_stats()
+        assert (stats.updates, stats.invalidations) == (3, 1)
+
+    async def test_writes_update_the_cache(self):
+        session, connection = cached_session()
+
+        await session.rpc.mode.set(SessionModeSetParams(Mode.PLAN))
+        await session.rpc.plan.update(SessionPlanUpdateParams("# New plan"))
+        connection.requests.clear()
+
+        assert (await session.rpc.mode.get()).mode == Mode.PLAN
+        assert (await session.rpc.plan.read()).content == "# New plan"
+        assert connection.methods() == []
+
+    async def test_invalidate_refetches(self):
+        session, connection = cached_session()
+        await session.rpc.mode.get()
+
+        session.rpc.invalidate()
+        await session.rpc.mode.get()
+
+        assert connection.methods() == ["session.mode.get", "session.mode.get"]
+
+    def test_disabled_by_default(self):
+        session = CopilotSession("s1", FakeConnection(RESPONSES))
+
+        assert not isinstance(session.rpc, CachedSessionRpc)
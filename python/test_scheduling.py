@@ -0,0 +1,161 @@
+"""
+Tool Concurrency Limit Unit Tests
+"""
+
+import asyncio
+
+import pytest
+
+from copilot import CopilotSession, define_tool
+from copilot.scheduling import ToolQueueFullError, ToolScheduler
+from copilot.types import Tool
+from helpers import make_client
+
+
+def make_tool(**limits):
+    return Tool(name="build", description="Build", handler=lambda inv: None, **limits)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestToolScheduler:
+    async def test_unlimited_tools_are_not_tracked(self):
+        scheduler = ToolScheduler()
+        async with scheduler.slot(make_tool(), "s1"):
+            pass
+        assert scheduler.stats() == {}
+
+    async def test_limits_concurrency_across_sessions(self):
+        scheduler = ToolScheduler()
+        tool = make_tool(max_concurrency=2)
+        running = 0
+        peak = 0
+        release = asyncio.Event()
+
+        async def call(session_id):
+            nonlocal running, peak
+            async with scheduler.slot(tool, session_id):
+                running += 1
+                peak = max(peak, running)
+                await release.wait()
+                running -= 1
+
+        tasks = [asyncio.create_task(call(f"s{i}")) for i in range(5)]
+        await settle()
+        assert running == 2
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert peak == 2
+        stats = scheduler.stats()["build"]
+        assert stats.admitted == 5
+        assert stats.queued == 3
+        assert stats.max_queue_depth == 3
+
+    async def test_serves_sessions_round_robin(self):
+        scheduler = ToolScheduler()
+        tool = make_tool(max_concurrency=1)
+        order = []
+        gate = asyncio.Event()
+
+        async def call(session_id, wait=False):
+            async with scheduler.slot(tool, session_id):
+                order.append(session_id)
+                if wait:
+                    await gate.wait()
+
+        first = asyncio.create_task(call("busy", wait=True))
+        await settle()
+        tasks = [asyncio.create_task(call("busy")) for _ in range(3)]
+        await settle()
+        tasks += [asyncio.create_task(call("quiet")) for _ in range(2)]
+        await settle()
+        gate.set()
+        await asyncio.gather(first, *tasks)
+
+        assert order == ["busy", "busy", "quiet", "busy", "quiet", "busy"]
+
+    async def test_per_session_limit_does_not_block_other_sessions(self):
+        scheduler = ToolScheduler()
+        tool = make_tool(per_session_max=1)
+        gate = asyncio.Event()
+        started = []
+
+        async def call(session_id):
+            async with scheduler.slot(tool, session_id):
+                started.append(session_id)
+                await gate.wait()
+
+        tasks = [asyncio.create_task(call(s)) for s in ("a", "a", "b")]
+        await settle()
+        assert sorted(started) == ["a", "b"]
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert len(started) == 3
+
+    async def test_rejects_when_queue_is_full(self):
+        scheduler = ToolScheduler()
+        tool = make_tool(max_concurrency=1, max_queue=1)
+        gate = asyncio.Event()
+
+        async def call():
+            async with scheduler.slot(tool, "s1"):
+                await gate.wait()
+
+        tasks = [asyncio.create_task(call()) for _ in range(2)]
+        await settle()
+        with pytest.raises(ToolQueueFullError):
+            async with scheduler.slot(tool, "s1"):
+                pass
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert scheduler.stats()["build"].rejected == 1
+
+    async def test_cancelled_waiters_free_their_place(self):
+        scheduler = ToolScheduler()
+        tool = make_tool(max_concurrency=1)
+        gate = asyncio.Event()
+
+        async def call():
+            async with scheduler.slot(tool, "s1"):
+                await gate.wait()
+
+        holder = asyncio.create_task(call())
+        waiter = asyncio.create_task(call())
+        await settle()
+        waiter.cancel()
+        await settle()
+        gate.set()
+        await holder
+
+        async with scheduler.slot(tool, "s1"):
+            pass
+
+
+class TestClientToolLimits:
+    async def test_full_queue_returns_rejected_result(self):
+        client = make_client()
+        gate = asyncio.Event()
+
+        @define_tool(description="Slow", max_concurrency=1, max_queue=0)
+        async def slow() -> str:
+            await gate.wait()
+            return "done"
+
+        session = CopilotSession("s1", None)
+        session._register_tools([slow])
+        client._sessions["s1"] = session
+        params = {"sessionId": "s1", "toolCallId": "c1", "toolName": "slow", "arguments": {}}
+
+        first = asyncio.create_task(client._handle_tool_call_request(params))
+        await settle()
+        rejected = await client._handle_tool_call_request({**params, "toolCallId": "c2"})
+        gate.set()
+        accepted = await first
+
+        assert rejected["result"]["resultType"] == "rejected"
+        assert accepted["result"]["textResultForLlm"] == "done"
+        assert client.get_tool_queue_stats()["slow"].rejected == 1
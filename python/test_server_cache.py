@@ -0,0 +1,183 @@
+"""
+Server Read Cache Unit Tests
+"""
+
+import asyncio
+import os
+from collections import Counter
+
+from copilot import CopilotClient
+from helpers import FakeConnection, make_client
+
+
+class ServerConnection(FakeConnection):
+    """Serves the cached server reads, tagged with a settable build version."""
+
+    def __init__(self):
+        super().__init__()
+        self.version = 1
+
+    @property
+    def calls(self):
+        return Counter(self.methods())
+
+    def respond(self, method, params):
+        if method == "models.list":
+            return {
+                "models": [
+                    {
+                        "id": f"model-{self.version}",
+                        "name": "Model",
+                        "capabilities": {
+                            "supports": {"vision": False},
+                            "limits": {"max_context_window_tokens": 128000},
+                        },
+                    }
+                ]
+            }
+        if method == "status.get":
+            return {"version": f"1.0.{self.version}", "protocolVersion": 2}
+        if method == "account.getQuota":
+            return {"quotaSnapshots": {}}
+        raise AssertionError(f"Unexpected request {method}")
+
+
+def cached_client(server_cache=None):
+    return make_client(ServerConnection(), server_cache=server_cache)
+
+
+class TestServerCache:
+    async def test_defaults_cache_models_only(self):
+        client = cached_client()
+
+        await asyncio.gather(client.list_models(), client.list_models())
+        models = await client.list_models()
+        await client.get_status()
+        await client.get_status()
+
+        assert models[0].id == "model-1"
+        assert client._client.calls == {"models.list": 1, "status.get": 2}
+        stats = client.get_server_cache_stats()
+        assert (stats.hits, stats.misses) == (2, 1)
+
+    async def test_expired_entries_are_fetched_again(self):
+        client = cached_client({"status_ttl": 0.05, "quota_ttl": 60})
+
+        await client.get_status()
+        await client.get_status()
+        await client.get_quota()
+        await client.get_quota()
+        await asyncio.sleep(0.06)
+        client._client.version = 2
+        status = await client.get_status()
+
+        assert status.version == "1.0.2"
+        assert client._client.calls == {"status.get": 2, "account.getQuota": 1}
+
+    async def test_stale_entries_are_served_while_refreshed(self):
+        client = cached_client({"models_ttl": 0.05, "stale_ttl": 60})
+
+        await client.list_models()
+        await asyncio.sleep(0.06)
+        client._client.version = 2
+        stale = await client.list_models()
+        await asyncio.sleep(0.01)  # Let the background refresh run
+        fresh = await client.list_models()
+
+        assert stale[0].id == "model-1"
+        assert fresh[0].id == "model-2"
+        stats = client.get_server_cache_stats()
+        assert (stats.hits, stats.stale_hits, stats.misses, stats.refreshes) == (1, 1, 1, 1)
+
+    async def test_disk_cache_is_shared_by_identity(self, tmp_path):
+        options = {
+            "models_ttl": 3600,
+            "status_ttl": 60,
+            "disk_dir": str(tmp_path),
+            "identity": "worker-pool",
+        }
+        first = cached_client(options)
+        await first.list_models()
+        await first.get_status()
+
+        second = cached_client(options)
+        models = await second.list_models()
+        await second.get_status()
+
+        assert models[0].id == "model-1"
+        assert second._client.calls == {}
+        assert second.get_server_cache_stats().disk_loads == 2
+        assert len(os.listdir(tmp_path)) == 2  # One file per method
+
+        other = cached_client({**options, "identity": "another-pool"})
+        await other.list_models()
+        assert other._client.calls == {"models.list": 1}
+
+    async def test_concurrent_writers_keep_each_others_entries(self, tmp_path):
+        options = {
+            "models_ttl": 3600,
+            "status_ttl": 60,
+            "disk_dir": str(tmp_path),
+            "identity": "worker-pool",
+        }
+        await asyncio.gather(
+            cached_client(options).list_models(), cached_client(options).get_status()
+        )
+
+        client = cached_client(options)
+        await client.list_models()
+        await client.get_status()
+
+        assert client._client.calls == {}
+
+    async def test_disk_cache_needs_a_known_identity(self, tmp_path):
+        # An external server's login is unknown without a request
+        options = {"models_ttl": 3600, "disk_dir": str(tmp_path)}
+        await cached_client(options).list_models()
+
+        client = cached_client(options)
+        await client.list_models()
+
+        assert client._client.calls == {"models.list": 1}
+        assert os.listdir(tmp_path) == []
+
+    async def test_disk_cache_requires_finite_ttl(self, tmp_path):
+        options = {"disk_dir": str(tmp_path), "identity": "worker-pool"}
+        await cached_client(options).list_models()
+
+        client = cached_client(options)
+        await client.list_models()
+
+        assert client._client.calls == {"models.list": 1}
+        assert os.listdir(tmp_path) == []
+
+    async def test_disk_cache_is_keyed_by_cli_build(self, tmp_path):
+        cli_path = tmp_path / "copilot"
+        cli_path.write_text("v1")
+        options = {
+            "cli_path": str(cli_path),
+            "github_token": "gho_secret",
+            "auto_start": False,
+            "server_cache": {"models_ttl": 3600, "disk_dir": str(tmp_path / "cache")},
+        }
+
+        def start():
+            client = CopilotClient(options)
+            client._client = ServerConnection()
+            return client
+
+        await start().list_models()
+        cached = start()
+        await cached.list_models()
+        cli_path.write_text("v2, a different build")
+        upgraded = start()
+        await upgraded.list_models()
+
+        assert cached._client.calls == {}
+        assert upgraded._client.calls == {"models.list": 1}
+        identity, _ = upgraded._server_cache_keys()
+        assert "gho_secret" not in identity
+
+        # A stored login may change without the client noticing
+        logged_in = CopilotClient({"cli_path": str(cli_path), "env": {"PATH": "/usr/bin"}})
+        assert logged_in._server_cache_keys()[0] is None
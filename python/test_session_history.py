@@ -0,0 +1,70 @@
+"""
+CopilotSession history paging and cache Unit Tests
+"""
+
+from uuid import uuid4
+
+import pytest
+
+from copilot import CopilotSession
+from helpers import FakeConnection, make_event, make_event_dict
+
+
+def history_connection(events):
+    return FakeConnection({"session.getMessages": lambda params: {"events": list(events)}})
+
+
+class TestGetMessagesPaging:
+    async def test_after_event_id_and_limit(self):
+        events = [make_event_dict(content=str(i)) for i in range(5)]
+        session = CopilotSession("s1", history_connection(events))
+
+        page = await session.get_messages(after_event_id=events[1]["id"], limit=2)
+
+        assert [e.data.content for e in page] == ["2", "3"]
+
+    async def test_unknown_after_event_id_raises(self):
+        session = CopilotSession("s1", history_connection([make_event_dict()]))
+        with pytest.raises(ValueError):
+            await session.get_messages(after_event_id=str(uuid4()))
+
+    async def test_iter_messages_pages_single_fetch(self):
+        events = [make_event_dict(content=str(i)) for i in range(7)]
+        connection = history_connection(events)
+        session = CopilotSession("s1", connection)
+
+        contents = [e.data.content async for e in session.iter_messages(page_size=3)]
+
+        assert contents == [str(i) for i in range(7)]
+        assert len(connection.requests) == 1
+
+
+class TestHistoryCache:
+    async def test_serves_repeated_reads_from_cache(self):
+        events = [make_event_dict(content="a"), make_event_dict(content="b")]
+        connection = history_connection(events)
+        session = CopilotSession("s1", connection)
+        session._enable_history_cache()
+
+        first = await session.get_messages()
+        session._dispatch_event(make_event(content="c"))
+        session._dispatch_event(make_event("assistant.message_delta", ephemeral=True))
+        newer = await session.get_messages(after_event_id=str(first[-1].id))
+
+        assert [e.data.content for e in newer] == ["c"]
+        assert len(connection.requests) == 1
+
+        pages = [e.data.content async for e in session.iter_messages(page_size=2)]
+        assert pages == ["a", "b", "c"]
+        assert len(connection.requests) == 1
+
+    async def test_invalidated_by_truncation(self):
+        connection = history_connection([make_event_dict()])
+        session = CopilotSession("s1", connection)
+        session._enable_history_cache()
+
+        await session.get_messages()
+        session._dispatch_event(make_event("session.truncation"))
+        await session.get_messages()
+
+        assert len(connection.requests) == 2
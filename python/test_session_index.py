@@ -0,0 +1,177 @@
+"""
+Session Index Unit Tests
+"""
+
+import asyncio
+
+from copilot import SessionListFilter
+from copilot.types import SessionLifecycleEvent
+from helpers import FakeConnection, make_client
+
+
+def metadata(session_id, repository=None, branch=None, cwd="/src", modified="2026-01-01T00:00:00Z"):
+    context = {"cwd": cwd}
+    if repository:
+        context["repository"] = repository
+        context["gitRoot"] = cwd
+    if branch:
+        context["branch"] = branch
+    return {
+        "sessionId": session_id,
+        "startTime": "2026-01-01T00:00:00Z",
+        "modifiedTime": modified,
+        "isRemote": False,
+        "context": context,
+    }
+
+
+class ListConnection(FakeConnection):
+    """Lists the stored sessions, applying the request's context filter."""
+
+    def __init__(self, sessions):
+        super().__init__()
+        self.sessions = list(sessions)
+
+    def respond(self, method, params):
+        assert method == "session.list"
+        criteria = params.get("filter", {})
+        return {
+            "sessions": [
+                s
+                for s in self.sessions
+                if all(s["context"].get(field) == value for field, value in criteria.items())
+            ]
+        }
+
+
+async def indexed_client(sessions, **kwargs):
+    client = make_client(ListConnection(sessions))
+    index = await client.enable_session_index(**kwargs)
+    return client, index
+
+
+def lifecycle(event_type, session_id, modified="2026-01-02T00:00:00Z", summary=None):
+    return SessionLifecycleEvent.from_dict(
+        {
+            "type": event_type,
+            "sessionId": session_id,
+            "metadata": {"startTime": modified, "modifiedTime": modified, "summary": summary},
+        }
+    )
+
+
+class TestSessionIndex:
+    async def test_serves_filtered_listings_from_memory(self):
+        client, index = await indexed_client(
+            [
+                metadata("a", "owner/api", "main", "/src/api"),
+                metadata("b", "owner/api", "dev", "/src/api", modified="2026-01-03T00:00:00Z"),
+                metadata("c", "owner/web", "main", "/src/web"),
+            ],
+            reconcile_interval=None,
+        )
+
+        api = await client.list_sessions(SessionListFilter(repository="owner/api"))
+        main = await client.list_sessions(SessionListFilter(repository="owner/api", branch="main"))
+        everything = await client.list_sessions()
+
+        assert [s.sessionId for s in api] == ["b", "a"]
+        assert [s.sessionId for s in main] == ["a"]
+        assert len(everything) == 3
+        assert await client.list_sessions(SessionListFilter(cwd="/nowhere")) == []
+        assert len(client._client.requests) == 1
+        index.close()
+
+    async def test_applies_lifecycle_events(self):
+        client, index = await indexed_client(
+            [metadata("a", "owner/api", "main")], reconcile_interval=None, refresh_interval=0
+        )
+        index._refresh_delay = 0
+
+        client._dispatch_lifecycle_event(lifecycle("session.updated", "a", summary="Fix bug"))
+        client._dispatch_lifecycle_event(lifecycle("session.deleted", "missing"))
+        assert index.get("a").summary == "Fix bug"
+        assert index.get("a").modifiedTime == "2026-01-02T00:00:00Z"
+
+        client._client.sessions.append(metadata("n", "owner/api", "main"))
+        client._dispatch_lifecycle_event(lifecycle("session.created", "n"))
+        assert "n" in index
+        assert index.stats().pending == 1
+        assert [s.sessionId for s in index.list(SessionListFilter(branch="main"))] == ["a"]
+
+        await asyncio.sleep(0.05)  # The context of the new session is fetched
+        assert index.stats().pending == 0
+        assert {s.sessionId for s in index.list(SessionListFilter(branch="main"))} == {"a", "n"}
+
+        client._dispatch_lifecycle_event(lifecycle("session.deleted", "a"))
+        assert index.get("a") is None
+        assert [s.sessionId for s in index.list(SessionListFilter(repository="owner/api"))] == ["n"]
+        assert index.stats().events_applied == 3
+        index.close()
+
+    async def test_refreshes_for_new_sessions_are_rate_limited(self):
+        client, index = await indexed_client([], reconcile_interval=None, refresh_interval=0.2)
+        index._refresh_delay = 0
+
+        for burst in range(3):
+            session_id = f"n{burst}"
+            client._client.sessions.append(metadata(session_id, "owner/api"))
+            client._dispatch_lifecycle_event(lifecycle("session.created", session_id))
+            await asyncio.sleep(0.02)
+
+        assert len(client._client.requests) == 1  # Only the seeding request so far
+        assert index.stats().pending == 3
+        await asyncio.sleep(0.25)
+        assert len(client._client.requests) == 2
+        assert index.stats().pending == 0
+        index.close()
+
+    async def test_filtered_listings_go_to_server_while_stale(self):
+        client, index = await indexed_client(
+            [metadata("a", "owner/api", "main")], reconcile_interval=None, refresh_interval=60
+        )
+        client._client.sessions = [
+            metadata("a", "owner/api", "dev", modified="2026-01-02T00:00:00Z"),
+            metadata("n", "owner/api", "main"),
+        ]
+        client._dispatch_lifecycle_event(lifecycle("session.updated", "a"))
+        client._dispatch_lifecycle_event(lifecycle("session.created", "n"))
+
+        main = await client.list_sessions(SessionListFilter(branch="main"))
+
+        assert [s.sessionId for s in main] == ["n"]
+        assert len(client._client.requests) == 2
+        assert index.stats().server_queries == 1
+        assert index.get("n").context is not None  # Filled in from the server's answer
+
+        await index.reconcile()
+        dev = await client.list_sessions(SessionListFilter(branch="dev"))
+        assert [s.sessionId for s in dev] == ["a"]
+        assert len(client._client.requests) == 3  # Answered from memory again
+        index.close()
+
+    async def test_max_staleness_serves_filtered_listings_from_memory(self):
+        client, index = await indexed_client(
+            [metadata("a", "owner/api", "main")], reconcile_interval=None, max_staleness=60
+        )
+        client._dispatch_lifecycle_event(lifecycle("session.created", "n"))
+
+        main = await client.list_sessions(SessionListFilter(branch="main"))
+
+        assert [s.sessionId for s in main] == ["a"]
+        assert len(client._client.requests) == 1
+        index.close()
+
+    async def test_reconcile_corrects_drift(self):
+        client, index = await indexed_client(
+            [metadata("a", "owner/api"), metadata("b", "owner/api")], reconcile_interval=None
+        )
+        client._client.sessions = [metadata("b", "owner/web"), metadata("c", "owner/api")]
+
+        drift = await index.reconcile()
+
+        assert drift == 3  # a removed, b changed, c added
+        assert [s.sessionId for s in index.list(SessionListFilter(repository="owner/api"))] == ["c"]
+        stats = index.stats()
+        assert (stats.sessions, stats.reconciliations, stats.drift) == (2, 2, 3)
+        index.close()
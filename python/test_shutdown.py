@@ -0,0 +1,81 @@
+"""
+Client Shutdown Unit Tests
+"""
+
+import asyncio
+
+from copilot import CopilotSession
+from helpers import FakeConnection, make_client
+
+
+class DestroyConnection(FakeConnection):
+    """Destroys sessions after a delay, tracking how many requests overlap."""
+
+    def __init__(self, destroy_delay=0.05, failing=()):
+        super().__init__(delay=destroy_delay)
+        self.failing = set(failing)
+        self.destroyed = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.stopped = False
+
+    async def request(self, method, params):
+        assert method == "session.destroy"
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await super().request(method, params)
+        finally:
+            self.in_flight -= 1
+        if params["sessionId"] in self.failing:
+            raise RuntimeError("gone")
+        self.destroyed.append(params["sessionId"])
+        return {}
+
+    async def stop(self):
+        self.stopped = True
+
+
+def client_with_sessions(count, **kwargs):
+    connection = DestroyConnection(**kwargs)
+    client = make_client(connection)
+    for i in range(count):
+        client._sessions[f"s{i}"] = CopilotSession(f"s{i}", connection)
+    return client, connection
+
+
+class TestStop:
+    async def test_destroys_sessions_concurrently(self):
+        client, connection = client_with_sessions(20, failing={"s3"})
+
+        started = asyncio.get_running_loop().time()
+        errors = await client.stop(concurrency=10)
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert connection.max_in_flight == 10
+        assert elapsed < 0.5
+        assert len(connection.destroyed) == 19
+        assert [e.message for e in errors] == ["Failed to destroy session s3: gone"]
+        assert connection.stopped
+        assert client.get_state() == "disconnected"
+
+    async def test_deadline_falls_back_to_force_stop(self):
+        client, connection = client_with_sessions(4, destroy_delay=10)
+
+        errors = await asyncio.wait_for(client.stop(timeout=0.1), 1)
+
+        messages = [e.message for e in errors]
+        assert sum(m.startswith("Timed out destroying session") for m in messages) == 4
+        assert messages[-1] == "Shutdown did not finish within 0.1s"
+        assert client._client is None
+        assert client._sessions == {}
+
+    async def test_can_skip_session_destroy(self):
+        client, connection = client_with_sessions(3)
+
+        errors = await client.stop(destroy_sessions=False)
+
+        assert errors == []
+        assert connection.destroyed == []
+        assert connection.stopped
+        assert client._sessions == {}
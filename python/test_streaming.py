@@ -0,0 +1,97 @@
+"""
+MessageAssembler Unit Tests
+"""
+
+import pytest
+
+from copilot import MessageAssembler
+from helpers import make_event
+
+
+def delta(message_id: str, text: str):
+    return make_event("assistant.message_delta", messageId=message_id, deltaContent=text)
+
+
+class TestMessageAssembler:
+    def test_assembles_deltas_per_message(self):
+        assembler = MessageAssembler()
+        assembler(delta("m1", "Hel"))
+        assembler(delta("m2", "Other"))
+        assembler(delta("m1", "lo"))
+
+        assert assembler.snapshot("m1") == "Hello"
+        assert assembler.snapshot("m2") == "Other"
+        assert assembler.snapshot("missing") is None
+        assert assembler.message_ids() == ["m1", "m2"]
+
+    def test_snapshot_collapses_chunks(self):
+        assembler = MessageAssembler()
+        for part in ["a", "b", "c"]:
+            assembler(delta("m1", part))
+        assert assembler.chunks("m1") == ("a", "b", "c")
+
+        assert assembler.snapshot("m1") == "abc"
+        assert assembler.chunks("m1") == ("abc",)
+
+        assembler(delta("m1", "d"))
+        assert assembler.snapshot("m1") == "abcd"
+
+    def test_read_returns_text_after_offset(self):
+        assembler = MessageAssembler()
+        assembler(delta("m1", "Hello"))
+        assembler(delta("m1", ", wor"))
+        assert assembler.read("m1") == "Hello, wor"
+        assert assembler.read("m1", 7) == "wor"
+
+        assembler.snapshot("m1")  # Collapsed chunks are sliced at the offset
+        assembler(delta("m1", "ld"))
+        assert assembler.read("m1", 10) == "ld"
+        assert assembler.read("m1", 3) == "lo, world"
+        assert assembler.read("m1", 12) == ""
+
+        assembler(make_event("assistant.message", messageId="m1", content="Hello, world!"))
+        assert assembler.read("m1", 12) == "!"
+        assert assembler.read("missing") is None
+
+    def test_final_message_is_authoritative(self):
+        received = []
+        assembler = MessageAssembler(on_message=lambda mid, text: received.append((mid, text)))
+        assembler(delta("m1", "partial"))
+        assembler(make_event("assistant.message", messageId="m1", content="complete answer"))
+
+        assert assembler.is_complete("m1")
+        assert assembler.snapshot("m1") == "complete answer"
+        assert received == [("m1", "complete answer")]
+
+        # Late deltas do not alter a finalized message
+        assembler(delta("m1", "late"))
+        assert assembler.snapshot("m1") == "complete answer"
+
+    def test_caps_buffered_characters(self):
+        assembler = MessageAssembler(max_chars_per_message=5)
+        assembler(delta("m1", "abc"))
+        assembler(delta("m1", "defgh"))
+
+        assert assembler.snapshot("m1") == "abcde"
+        assert assembler.is_truncated("m1")
+
+        assembler(make_event("assistant.message", messageId="m1", content="abcdefgh"))
+        assert assembler.snapshot("m1") == "abcdefgh"
+        assert not assembler.is_truncated("m1")
+
+    def test_releases_buffers_on_turn_end(self):
+        assembler = MessageAssembler()
+        assembler(make_event("assistant.turn_start", turnId="t1"))
+        assembler(delta("m1", "one"))
+        assembler(make_event("assistant.message", messageId="m1", content="one"))
+        assembler(make_event("assistant.turn_end", turnId="t1"))
+        assembler(make_event("assistant.turn_start", turnId="t2"))
+        assembler(delta("m2", "two"))
+
+        assert assembler.message_ids() == ["m2"]
+        assembler(make_event("assistant.turn_end", turnId="t2"))
+        assert assembler.message_ids() == []
+
+    def test_rejects_non_positive_cap(self):
+        with pytest.raises(ValueError):
+            MessageAssembler(max_chars_per_message=0)
@@ -0,0 +1,93 @@
+"""
+SessionTemplate Unit Tests
+"""
+
+from copilot import SessionTemplate
+from copilot.types import Tool
+from helpers import make_client
+
+
+def echo(invocation):
+    return invocation["arguments"]
+
+
+class TestSessionTemplate:
+    def test_compiles_wire_payload(self):
+        template = SessionTemplate(
+            {
+                "model": "gpt-5",
+                "tools": [Tool(name="echo", description="Echo", handler=echo)],
+                "provider": {"type": "openai", "base_url": "http://localhost", "api_key": "k"},
+                "custom_agents": [{"name": "reviewer", "prompt": "Review", "display_name": "R"}],
+                "infinite_sessions": {"enabled": True, "background_compaction_threshold": 0.8},
+                "disable_resume": True,
+            }
+        )
+
+        payload = template._create_payload()
+        assert payload["model"] == "gpt-5"
+        assert payload["tools"] == [{"name": "echo", "description": "Echo"}]
+        assert payload["provider"] == {
+            "type": "openai",
+            "baseUrl": "http://localhost",
+            "apiKey": "k",
+        }
+        assert payload["customAgents"] == [
+            {"name": "reviewer", "prompt": "Review", "displayName": "R"}
+        ]
+        assert payload["infiniteSessions"] == {
+            "enabled": True,
+            "backgroundCompactionThreshold": 0.8,
+        }
+        assert "disableResume" not in payload
+        assert template._resume_payload("s1")["disableResume"] is True
+        assert template._tools_by_name["echo"].handler is echo
+
+    def test_overrides_share_compiled_payload(self):
+        template = SessionTemplate({"model": "gpt-5", "working_directory": "/a"})
+        derived = template.with_overrides(session_id="s1", working_directory="/b")
+
+        assert derived._payload is template._payload
+        assert derived._create_payload()["sessionId"] == "s1"
+        assert derived._create_payload()["workingDirectory"] == "/b"
+        assert template._create_payload()["workingDirectory"] == "/a"
+        assert derived.config["working_directory"] == "/b"
+        assert derived.session_id == "s1"
+        assert template.session_id is None
+
+    def test_resume_uses_given_session_id(self):
+        template = SessionTemplate({"session_id": "ignored"}).with_overrides(session_id="other")
+        assert template._resume_payload("s1")["sessionId"] == "s1"
+
+
+class TestClientWithTemplate:
+    async def test_create_and_resume_from_template(self):
+        client = make_client()
+        template = SessionTemplate({"tools": [Tool(name="echo", description="Echo", handler=echo)]})
+
+        session = await client.create_session(template.with_overrides(session_id="s1"))
+        resumed = await client.resume_session("s2", template)
+
+        requests = client._client.requests
+        assert requests[0] == (
+            "session.create",
+            template.with_overrides(session_id="s1")._create_payload(),
+        )
+        assert requests[1][0] == "session.resume"
+        assert requests[1][1]["sessionId"] == "s2"
+        assert session._get_tool_handler("echo") is echo
+        assert resumed._get_tool_handler("echo") is echo
+
+        session._register_tools(None)
+        assert resumed._get_tool_handler("echo") is echo
+        assert template._tools_by_name["echo"].handler is echo
+
+    async def test_plain_config_matches_template(self):
+        client = make_client()
+        config = {"model": "gpt-5", "streaming": True}
+
+        await client.create_session(config)
+        await client.create_session(SessionTemplate(config))
+
+        first, second = client._client.requests
+        assert first == second
@@ -0,0 +1,174 @@
+"""
+Tool Result Cache Unit Tests
+"""
+
+import asyncio
+
+from copilot import CopilotSession, ToolCachePolicy, define_tool
+from copilot.tool_cache import ToolResultCache
+from copilot.types import Tool
+from helpers import make_client
+
+
+def make_tool(**policy):
+    return Tool(
+        name="lookup",
+        description="Lookup",
+        handler=lambda inv: None,
+        cache=ToolCachePolicy(**policy),
+    )
+
+
+def success(text):
+    return {"textResultForLlm": text, "resultType": "success"}
+
+
+class Counter:
+    def __init__(self, result=None):
+        self.calls = 0
+        self.result = result
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.result or success(f"call {self.calls}")
+
+
+class TestToolResultCache:
+    async def test_reuses_results_for_equal_arguments(self):
+        cache = ToolResultCache()
+        tool = make_tool()
+        call = Counter()
+
+        first = await cache.get_or_call(tool, "s1", {"a": 1, "b": [1, 2]}, call)
+        second = await cache.get_or_call(tool, "s2", {"b": [1, 2], "a": 1}, call)
+        other = await cache.get_or_call(tool, "s1", {"a": 2}, call)
+
+        assert first == second == success("call 1")
+        assert other == success("call 2")
+        stats = cache.stats()["lookup"]
+        assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
+
+    async def test_per_session_scope(self):
+        cache = ToolResultCache()
+        tool = make_tool(per_session=True)
+        call = Counter()
+
+        await cache.get_or_call(tool, "s1", {}, call)
+        await cache.get_or_call(tool, "s2", {}, call)
+        await cache.get_or_call(tool, "s1", {}, call)
+
+        assert call.calls == 2
+
+    async def test_expires_entries_after_ttl(self):
+        cache = ToolResultCache()
+        tool = make_tool(ttl=0.01)
+        call = Counter()
+
+        await cache.get_or_call(tool, "s1", {}, call)
+        await asyncio.sleep(0.02)
+        await cache.get_or_call(tool, "s1", {}, call)
+
+        assert call.calls == 2
+        assert cache.stats()["lookup"].expirations == 1
+
+    async def test_evicts_least_recently_used(self):
+        cache = ToolResultCache()
+        tool = make_tool(max_entries=2)
+        call = Counter()
+
+        await cache.get_or_call(tool, "s1", {"k": 1}, call)
+        await cache.get_or_call(tool, "s1", {"k": 2}, call)
+        await cache.get_or_call(tool, "s1", {"k": 1}, call)  # refresh k=1
+        await cache.get_or_call(tool, "s1", {"k": 3}, call)  # evicts k=2
+        await cache.get_or_call(tool, "s1", {"k": 1}, call)
+
+        assert call.calls == 3
+        assert cache.stats()["lookup"].evictions == 1
+
+    async def test_respects_byte_limit(self):
+        cache = ToolResultCache()
+        tool = make_tool(max_bytes=10)
+
+        await cache.get_or_call(tool, "s1", {}, Counter(success("x" * 11)))
+        await cache.get_or_call(tool, "s1", {"k": 1}, Counter(success("x" * 6)))
+        await cache.get_or_call(tool, "s1", {"k": 2}, Counter(success("x" * 6)))
+
+        stats = cache.stats()["lookup"]
+        assert stats.entries == 1
+        assert stats.bytes == 6
+
+    async def test_does_not_cache_failures(self):
+        cache = ToolResultCache()
+        tool = make_tool()
+        call = Counter({"textResultForLlm": "no", "resultType": "failure"})
+
+        await cache.get_or_call(tool, "s1", {}, call)
+        await cache.get_or_call(tool, "s1", {}, call)
+
+        assert call.calls == 2
+
+    async def test_collapses_concurrent_identical_calls(self):
+        cache = ToolResultCache()
+        tool = make_tool()
+        gate = asyncio.Event()
+        calls = 0
+
+        async def slow():
+            nonlocal calls
+            calls += 1
+            await gate.wait()
+            return success("done")
+
+        tasks = [asyncio.create_task(cache.get_or_call(tool, "s1", {}, slow)) for _ in range(5)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert all(r == success("done") for r in results)
+        assert cache.stats()["lookup"].collapsed == 4
+
+    async def test_followers_run_when_leader_fails(self):
+        cache = ToolResultCache()
+        tool = make_tool()
+        gate = asyncio.Event()
+
+        async def broken():
+            await gate.wait()
+            raise RuntimeError("boom")
+
+        leader = asyncio.create_task(cache.get_or_call(tool, "s1", {}, broken))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.get_or_call(tool, "s1", {}, Counter()))
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert await follower == success("call 1")
+        assert isinstance((await asyncio.gather(leader, return_exceptions=True))[0], RuntimeError)
+
+
+class TestClientToolCache:
+    async def test_cached_tool_skips_handler(self):
+        client = make_client()
+        calls = 0
+
+        @define_tool(description="Lookup", cache=ToolCachePolicy(ttl=60))
+        async def lookup() -> str:
+            nonlocal calls
+            calls += 1
+            return "value"
+
+        session = CopilotSession("s1", None)
+        session._register_tools([lookup])
+        client._sessions["s1"] = session
+        params = {"sessionId": "s1", "toolCallId": "c1", "toolName": "lookup", "arguments": {}}
+
+        first = await client._handle_tool_call_request(params)
+        second = await client._handle_tool_call_request({**params, "toolCallId": "c2"})
+
+        assert first == second
+        assert calls == 1
+        assert client.get_tool_cache_stats()["lookup"].hits == 1
+        client.clear_tool_cache()
+        assert client.get_tool_cache_stats()["lookup"].entries == 0
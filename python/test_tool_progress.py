@@ -0,0 +1,103 @@
+"""
+Tool Progress Reporting Unit Tests
+"""
+
+import pickle
+
+from pydantic import BaseModel
+
+from copilot import CopilotSession, ToolProgress, define_tool
+from copilot.generated.session_events import SessionEventType
+from helpers import make_client
+
+
+class CountParams(BaseModel):
+    n: int
+
+
+def make_client_with_session(*tools):
+    client = make_client()
+    session = CopilotSession("s1", None)
+    session._register_tools(list(tools))
+    client._sessions["s1"] = session
+    events = []
+    session.on(events.append)
+    return client, events
+
+
+async def call(client, tool_name, arguments=None):
+    response = await client._handle_tool_call_request(
+        {"sessionId": "s1", "toolCallId": "c1", "toolName": tool_name, "arguments": arguments}
+    )
+    return response["result"]
+
+
+class TestToolProgress:
+    async def test_progress_parameter_publishes_ephemeral_events(self):
+        @define_tool(description="Count")
+        async def count(params: CountParams, progress: ToolProgress) -> str:
+            for i in range(params.n):
+                progress.report(f"step {i + 1}/{params.n}")
+            return "done"
+
+        client, events = make_client_with_session(count)
+        result = await call(client, "count", {"n": 2})
+
+        assert result["textResultForLlm"] == "done"
+        assert [e.data.progress_message for e in events] == ["step 1/2", "step 2/2"]
+        assert all(e.type == SessionEventType.TOOL_EXECUTION_PROGRESS for e in events)
+        assert all(e.ephemeral and e.data.tool_call_id == "c1" for e in events)
+
+    async def test_reports_from_worker_threads_reach_the_loop(self):
+        @define_tool(description="Count", executor="thread")
+        def count(params: CountParams, progress: ToolProgress) -> str:
+            progress.report("working")
+            return "done"
+
+        client, events = make_client_with_session(count)
+        await call(client, "count", {"n": 1})
+        await client.force_stop()
+
+        assert [e.data.progress_message for e in events] == ["working"]
+
+    async def test_async_generator_streams_partial_output(self):
+        @define_tool(description="Stream")
+        async def stream(params: CountParams):
+            for i in range(params.n):
+                yield f"line {i}\n"
+            yield {"total": params.n}
+
+        client, events = make_client_with_session(stream)
+        result = await call(client, "stream", {"n": 2})
+
+        assert result["resultType"] == "success"
+        assert result["textResultForLlm"] == 'line 0\nline 1\n{"total": 2}'
+        assert [e.type for e in events] == [SessionEventType.TOOL_EXECUTION_PARTIAL_RESULT] * 3
+        assert events[0].data.partial_output == "line 0\n"
+
+    async def test_raw_async_generator_handler(self):
+        from copilot.types import Tool
+
+        async def handler(invocation):
+            invocation["progress"].report("starting")
+            yield "a"
+            yield "b"
+
+        client, events = make_client_with_session(Tool("raw", "Raw", handler))
+        result = await call(client, "raw")
+
+        assert result["textResultForLlm"] == "ab"
+        assert [e.type.value for e in events] == [
+            "tool.execution_progress",
+            "tool.execution_partial_result",
+            "tool.execution_partial_result",
+        ]
+
+    def test_pickled_reporter_is_detached(self):
+        delivered = []
+        progress = pickle.loads(pickle.dumps(ToolProgress("c1", delivered.append)))
+
+        progress.report("ignored")
+
+        assert progress.tool_call_id == "c1"
+        assert delivered == []
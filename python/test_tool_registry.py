@@ -0,0 +1,109 @@
+"""
+Tool Registry Unit Tests
+"""
+
+import pytest
+
+from copilot import SessionTemplate, ToolRegistry, define_tool
+from copilot.types import Tool
+from helpers import make_client
+
+
+def make_tool(name, result="shared"):
+    return Tool(
+        name=name,
+        description=f"{name} tool",
+        handler=lambda inv: {"textResultForLlm": result, "resultType": "success"},
+    )
+
+
+class TestToolRegistry:
+    def test_compiles_definitions_once(self):
+        registry = ToolRegistry()
+        tool_set = registry.register("repo", [make_tool("read"), make_tool("search")])
+
+        definitions, handlers = registry._resolve(("repo",))
+
+        assert [d["name"] for d in tool_set.definitions] == ["read", "search"]
+        assert definitions == list(tool_set.definitions)
+        assert handlers is tool_set.handlers
+        assert registry._resolve(("repo",))[0] is definitions
+
+    def test_combines_sets(self):
+        registry = ToolRegistry()
+        registry.register("a", [make_tool("one")])
+        registry.register("b", [make_tool("two")])
+
+        definitions, handlers = registry._resolve(("a", "b"))
+
+        assert [d["name"] for d in definitions] == ["one", "two"]
+        assert set(handlers) == {"one", "two"}
+
+    def test_rejects_unknown_and_conflicting_sets(self):
+        registry = ToolRegistry()
+        registry.register("a", [make_tool("one")])
+        registry.register("b", [make_tool("one")])
+
+        with pytest.raises(ValueError, match="Unknown tool set"):
+            registry._resolve(("missing",))
+        with pytest.raises(ValueError, match="several tool sets"):
+            registry._resolve(("a", "b"))
+        with pytest.raises(ValueError, match="Duplicate tool"):
+            registry.register("c", [make_tool("x"), make_tool("x")])
+
+    def test_unregister_invalidates_resolved_sets(self):
+        registry = ToolRegistry()
+        registry.register("a", [make_tool("one")])
+        registry._resolve(("a",))
+
+        assert registry.unregister("a")
+        assert "a" not in registry
+        with pytest.raises(ValueError):
+            registry._resolve(("a",))
+
+
+class TestClientToolSets:
+    async def test_sessions_share_tool_set_handlers(self):
+        client = make_client()
+        client.tool_registry.register("repo", [make_tool("read"), make_tool("search")])
+
+        first = await client.create_session({"tool_sets": ["repo"]})
+        second = await client.create_session({"tool_sets": ["repo"]})
+
+        payload = client._client.requests[0][1]
+        assert [d["name"] for d in payload["tools"]] == ["read", "search"]
+        assert first._shared_tools is second._shared_tools
+        assert first._get_tool("read").name == "read"
+
+    async def test_session_tools_take_precedence(self):
+        client = make_client()
+        client.tool_registry.register("repo", [make_tool("read"), make_tool("search")])
+
+        @define_tool(description="Own read")
+        def read() -> str:
+            return "own"
+
+        session = await client.create_session({"tools": [read], "tool_sets": ["repo"]})
+
+        payload = client._client.requests[0][1]
+        assert [d["name"] for d in payload["tools"]] == ["read", "search"]
+        assert payload["tools"][0]["description"] == "Own read"
+        assert session._get_tool("read") is read
+        assert session._get_tool("search").description == "search tool"
+
+    async def test_resume_with_template_tool_sets(self):
+        client = make_client()
+        client.tool_registry.register("repo", [make_tool("read")])
+        template = SessionTemplate({"tool_sets": ["repo"]})
+
+        session = await client.resume_session("s1", template.with_overrides(model="gpt-5"))
+
+        method, payload = client._client.requests[0]
+        assert method == "session.resume"
+        assert [d["name"] for d in payload["tools"]] == ["read"]
+        assert "tool_sets" not in payload and "toolSets" not in payload
+        response = await client._handle_tool_call_request(
+            {"sessionId": "s1", "toolCallId": "c1", "toolName": "read", "arguments": {}}
+        )
+        assert response["result"]["textResultForLlm"] == "shared"
+        assert session._get_tool("missing") is None
@@ -0,0 +1,187 @@
+"""
+Tool Result Size Policy Unit Tests
+"""
+
+from copilot import CopilotSession, ToolCachePolicy, ToolResultPolicy, define_tool
+from copilot.tool_results import _StreamedText, apply_result_policy, truncate_text
+from helpers import FakeConnection, make_client
+
+
+class FakeWorkspace:
+    def __init__(self, fail=False):
+        self.files = {}
+        self.fail = fail
+
+    async def create_file(self, params):
+        if self.fail:
+            raise RuntimeError("disk full")
+        self.files[params.path] = params.content
+        return None
+
+
+def success(text):
+    return {"textResultForLlm": text, "resultType": "success", "toolTelemetry": {}}
+
+
+class TestApplyResultPolicy:
+    async def test_small_results_are_untouched(self):
+        result = success("short")
+        policy = ToolResultPolicy(max_bytes=10)
+
+        assert await apply_result_policy(result, policy, "t", "c1") == (result, None)
+
+    async def test_truncate_keeps_head_and_tail(self):
+        text = "a" * 500 + "b" * 500
+        policy = ToolResultPolicy(max_bytes=200, head_fraction=0.5)
+
+        result, action = await apply_result_policy(success(text), policy, "t", "c1")
+
+        kept = result["textResultForLlm"]
+        assert action == "truncated"
+        assert len(kept.encode()) <= 200
+        assert kept.startswith("a") and kept.endswith("b")
+        assert "bytes omitted ...]" in kept
+        assert result["toolTelemetry"] == {"resultBytes": 1000, "truncated": True}
+
+    def test_truncate_does_not_split_characters(self):
+        kept = truncate_text("é" * 1000, ToolResultPolicy(max_bytes=101))
+
+        assert len(kept.encode()) <= 101
+        assert "�" not in kept
+
+    async def test_fail_replaces_result(self):
+        policy = ToolResultPolicy(max_bytes=10, strategy="fail")
+
+        result, action = await apply_result_policy(success("x" * 11), policy, "t", "c1")
+
+        assert action == "failed"
+        assert result["resultType"] == "failure"
+        assert result["toolTelemetry"] == {"resultBytes": 11}
+
+    async def test_offload_writes_workspace_file(self):
+        workspace = FakeWorkspace()
+        text = "line\n" * 1000
+        policy = ToolResultPolicy(max_bytes=300, strategy="offload")
+
+        result, action = await apply_result_policy(
+            success(text), policy, "grep/all", "call 1", workspace
+        )
+
+        path = "tool-results/grep_all-call_1.txt"
+        assert action == "offloaded"
+        assert workspace.files == {path: text}
+        assert path in result["textResultForLlm"]
+        assert len(result["textResultForLlm"].encode()) <= 300
+        assert result["toolTelemetry"]["offloadedTo"] == path
+
+    async def test_offload_falls_back_to_truncation(self):
+        policy = ToolResultPolicy(max_bytes=100, strategy="offload")
+
+        _, action = await apply_result_policy(
+            success("x" * 500), policy, "t", "c1", FakeWorkspace(fail=True)
+        )
+
+        assert action == "truncated"
+
+
+class TestClientResultPolicy:
+    async def test_tool_policy_overrides_client_default(self):
+        client = make_client(tool_result_policy=ToolResultPolicy(max_bytes=10, strategy="fail"))
+
+        @define_tool(description="Dump", result_policy=ToolResultPolicy(max_bytes=100))
+        async def dump() -> str:
+            return "x" * 50
+
+        session = CopilotSession("s1", None)
+        session._register_tools([dump])
+        client._sessions["s1"] = session
+
+        response = await client._handle_tool_call_request(
+            {"sessionId": "s1", "toolCallId": "c1", "toolName": "dump", "arguments": {}}
+        )
+
+        assert response["result"]["textResultForLlm"] == "x" * 50
+
+    async def test_client_default_policy_and_stats(self):
+        client = make_client(tool_result_policy=ToolResultPolicy(max_bytes=100, strategy="offload"))
+        connection = FakeConnection()
+
+        @define_tool(description="Dump")
+        async def dump() -> str:
+            return "x" * 1000
+
+        session = CopilotSession("s1", connection)
+        session._register_tools([dump])
+        client._sessions["s1"] = session
+
+        response = await client._handle_tool_call_request(
+            {"sessionId": "s1", "toolCallId": "c1", "toolName": "dump", "arguments": {}}
+        )
+
+        assert response["result"]["toolTelemetry"]["offloadedTo"] == "tool-results/dump-c1.txt"
+        method, params = connection.requests[0]
+        assert method == "session.workspace.createFile"
+        assert params["sessionId"] == "s1" and len(params["content"]) == 1000
+        stats = client.get_tool_stats()["dump"]
+        assert (stats.results, stats.result_bytes_max, stats.oversized, stats.offloaded) == (
+            1,
+            1000,
+            1,
+            1,
+        )
+
+    async def test_cached_tool_stores_reduced_result(self):
+        client = make_client()
+        connection = FakeConnection()
+
+        @define_tool(
+            description="Dump",
+            cache=ToolCachePolicy(),
+            result_policy=ToolResultPolicy(max_bytes=100, strategy="offload"),
+        )
+        async def dump() -> str:
+            return "x" * 1000
+
+        session = CopilotSession("s1", connection)
+        session._register_tools([dump])
+        client._sessions["s1"] = session
+
+        for call_id in ("c1", "c2"):
+            response = await client._handle_tool_call_request(
+                {"sessionId": "s1", "toolCallId": call_id, "toolName": "dump", "arguments": {}}
+            )
+            assert response["result"]["toolTelemetry"]["offloadedTo"] == "tool-results/dump-c1.txt"
+
+        assert [method for method, _ in connection.requests] == ["session.workspace.createFile"]
+        (entry,) = client._tool_cache._stores["dump"].entries.values()
+        assert len(entry.result["textResultForLlm"]) < 1000
+
+    async def test_streamed_output_is_bounded_while_collected(self):
+        policy = ToolResultPolicy(max_bytes=100)
+        chunks = [f"{i:04d}" * 25 for i in range(1000)]
+        text = _StreamedText(policy)
+        for chunk in chunks:
+            text.add(chunk)
+            assert len(text._head) + text._tail_size <= 2 * 100 + 100
+
+        assert text.value() == truncate_text("".join(chunks), policy)
+
+        client = make_client(tool_result_policy=policy)
+
+        @define_tool(description="Dump")
+        async def dump():
+            for chunk in chunks:
+                yield chunk
+
+        session = CopilotSession("s1", FakeConnection())
+        session._register_tools([dump])
+        client._sessions["s1"] = session
+
+        response = await client._handle_tool_call_request(
+            {"sessionId": "s1", "toolCallId": "c1", "toolName": "dump", "arguments": {}}
+        )
+
+        assert response["result"]["textResultForLlm"] == truncate_text("".join(chunks), policy)
+        assert response["result"]["toolTelemetry"]["resultBytes"] == 100_000
+        stats = client.get_tool_stats()["dump"]
+        assert (stats.result_bytes_max, stats.oversized) == (100_000, 1)
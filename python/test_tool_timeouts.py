@@ -0,0 +1,120 @@
+"""
+Tool Timeout Unit Tests
+"""
+
+import asyncio
+import pickle
+import threading
+
+import pytest
+
+from copilot import (
+    CopilotSession,
+    ToolCancellationToken,
+    ToolCancelledError,
+    define_tool,
+)
+from copilot.types import Tool
+from helpers import make_client
+
+
+def make_client_with_session(*tools, **options):
+    client = make_client(**options)
+    session = CopilotSession("s1", None)
+    session._register_tools(list(tools))
+    client._sessions["s1"] = session
+    return client
+
+
+async def call(client, tool_name, arguments=None):
+    response = await client._handle_tool_call_request(
+        {"sessionId": "s1", "toolCallId": "c1", "toolName": tool_name, "arguments": arguments}
+    )
+    return response["result"]
+
+
+class TestToolCancellationToken:
+    def test_cancel_and_raise(self):
+        token = ToolCancellationToken()
+        token.raise_if_cancelled()
+        assert token.wait(0) is False
+
+        token.cancel()
+
+        assert token.cancelled
+        assert token.wait(0) is True
+        with pytest.raises(ToolCancelledError):
+            token.raise_if_cancelled()
+
+    def test_pickled_token_is_detached(self):
+        token = ToolCancellationToken()
+        token.cancel()
+
+        assert pickle.loads(pickle.dumps(token)).cancelled is False
+
+
+class TestToolTimeouts:
+    async def test_async_handler_is_cancelled_on_timeout(self):
+        cancelled = asyncio.Event()
+
+        @define_tool(description="Hang", timeout=0.05)
+        async def hang() -> str:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "done"
+
+        client = make_client_with_session(hang)
+        result = await call(client, "hang")
+
+        assert result["resultType"] == "failure"
+        assert result["toolTelemetry"]["timedOut"] is True
+        assert result["toolTelemetry"]["timeoutMs"] == 50
+        assert result["toolTelemetry"]["durationMs"] >= 50
+        assert cancelled.is_set()
+        stats = client.get_tool_stats()["hang"]
+        assert (stats.calls, stats.failures, stats.timeouts) == (1, 1, 1)
+
+    async def test_thread_handler_observes_cancellation_token(self):
+        stopped = threading.Event()
+
+        @define_tool(description="Spin", executor="thread")
+        def spin(cancellation: ToolCancellationToken) -> str:
+            cancellation.wait(10)
+            stopped.set()
+            return "stopped"
+
+        client = make_client_with_session(spin, tool_timeout=0.05)
+        result = await call(client, "spin")
+
+        assert result["toolTelemetry"]["timedOut"] is True
+        assert await asyncio.get_running_loop().run_in_executor(None, stopped.wait, 5)
+        await client.force_stop()
+
+    async def test_tool_timeout_overrides_client_default(self):
+        @define_tool(description="Slow", timeout=5)
+        async def slow() -> str:
+            await asyncio.sleep(0.1)
+            return "done"
+
+        client = make_client_with_session(slow, tool_timeout=0.01)
+        result = await call(client, "slow")
+
+        assert result["textResultForLlm"] == "done"
+        assert "timedOut" not in result.get("toolTelemetry", {})
+
+    async def test_raw_handler_receives_token(self):
+        tokens = []
+
+        def handler(invocation):
+            tokens.append(invocation["cancellation"])
+            return "ok"
+
+        client = make_client_with_session(Tool("raw", "Raw", handler))
+        await call(client, "raw")
+        await client.force_stop()
+
+        assert isinstance(tokens[0], ToolCancellationToken)
+        assert not tokens[0].cancelled
@@ -0,0 +1,143 @@
+"""
+Isolated Worker Pool Unit Tests
+"""
+
+import os
+import sys
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from copilot import ToolCancellationToken, define_tool
+from copilot.workers import WorkerCrashedError, WorkerPool, WorkerTimeoutError
+from helpers import make_client
+
+
+class ParseParams(BaseModel):
+    text: str
+
+
+@define_tool(description="Parse in isolation", isolated=True)
+def parse(params: ParseParams, cancellation: ToolCancellationToken) -> str:
+    return f"{params.text.upper()}:{os.getpid()}"
+
+
+def get_pid():
+    return os.getpid()
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def crash():
+    os._exit(3)
+
+
+def allocate(size):
+    return len(bytearray(size))
+
+
+def fail():
+    raise KeyError("missing")
+
+
+def loaded_modules():
+    return "json" in sys.modules
+
+
+@pytest.fixture
+def pool_factory():
+    pools = []
+
+    def make(**options):
+        pool = WorkerPool(**{"workers": 1, **options})
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+class TestWorkerPool:
+    def test_runs_calls_in_a_reused_worker(self, pool_factory):
+        pool = pool_factory()
+
+        first = pool.submit(get_pid).result()
+        second = pool.submit(get_pid).result()
+
+        assert first == second != os.getpid()
+        assert pool.stats().calls == 2
+
+    def test_reraises_handler_errors(self, pool_factory):
+        pool = pool_factory()
+
+        with pytest.raises(KeyError):
+            pool.submit(fail).result()
+        assert pool.submit(get_pid).result() != os.getpid()
+
+    def test_recycles_workers_after_max_calls(self, pool_factory):
+        pool = pool_factory(max_calls=2)
+
+        pids = [pool.submit(get_pid).result() for _ in range(3)]
+
+        assert pids[0] == pids[1] != pids[2]
+        assert pool.stats().recycled == 1
+
+    def test_kills_calls_over_the_time_limit(self, pool_factory):
+        pool = pool_factory(time_limit=0.5)
+
+        with pytest.raises(WorkerTimeoutError):
+            pool.submit(sleep, 30).result()
+
+        assert pool.submit(sleep, 0).result() == 0
+        assert pool.stats().timed_out == 1
+
+    def test_replaces_crashed_workers(self, pool_factory):
+        pool = pool_factory()
+
+        with pytest.raises(WorkerCrashedError):
+            pool.submit(crash).result()
+
+        assert pool.submit(get_pid).result() != os.getpid()
+        assert pool.stats().crashed == 1
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="memory limits need the resource module")
+    def test_enforces_memory_limit(self, pool_factory):
+        pool = pool_factory(memory_limit=1024 * 2**20)
+
+        with pytest.raises(MemoryError):
+            pool.submit(allocate, 4096 * 2**20).result()
+
+        assert pool.submit(allocate, 10).result() == 10
+        assert pool.stats().recycled == 1
+
+    def test_preloads_modules(self, pool_factory):
+        pool = pool_factory(preload=["json"])
+
+        assert pool.submit(loaded_modules).result()
+
+
+class TestIsolatedTools:
+    async def test_define_tool_isolated_flag(self):
+        client = make_client(tool_worker_pool={"workers": 1})
+
+        result = await client._execute_tool_call(
+            "s1", "c1", parse.name, {"text": "abc"}, parse.handler, parse.executor
+        )
+        await client.force_stop()
+
+        assert parse.executor == "isolated"
+        text, pid = result["textResultForLlm"].split(":")
+        assert text == "ABC"
+        assert int(pid) != os.getpid()
+
+    def test_async_handlers_cannot_be_isolated(self):
+        async def handler() -> str:
+            return "x"
+
+        with pytest.raises(ValueError):
+            define_tool("t", description="", handler=handler, isolated=True)
@@ -0,0 +1,210 @@
+"""
+Session Workspace Transfer Unit Tests
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from copilot import CopilotSession
+from helpers import FakeConnection, make_event
+
+
+class WorkspaceConnection(FakeConnection):
+    """Serves the remote workspace from an in-memory file table."""
+
+    def __init__(self, files=None):
+        super().__init__()
+        self.files = dict(files or {})
+
+    def respond(self, method, params):
+        if method == "session.workspace.readFile":
+            return {"content": self.files[params["path"]]}
+        if method == "session.workspace.listFiles":
+            return {"files": list(self.files)}
+        if method == "session.workspace.createFile":
+            self.files[params["path"]] = params["content"]
+            return {}
+        raise AssertionError(method)
+
+
+@pytest.fixture
+def local_session(tmp_path):
+    session = CopilotSession("s1", WorkspaceConnection(), str(tmp_path))
+    session.workspace.chunk_size = 4
+    return session, tmp_path / "files"
+
+
+def file_changed(path):
+    return make_event("session.workspace_file_changed", path=path, operation="update")
+
+
+async def chunks_of(*parts):
+    for part in parts:
+        yield part
+
+
+class TestLocalWorkspace:
+    async def test_reads_byte_ranges_in_chunks(self, local_session):
+        session, files = local_session
+        files.mkdir()
+        (files / "data.bin").write_bytes(bytes(range(10)))
+
+        chunks = [c async for c in session.workspace.read_chunks("data.bin", prefetch=2)]
+        part = await session.workspace.read_bytes("data.bin", offset=3, length=5)
+
+        assert [(c.offset, c.data) for c in chunks] == [
+            (0, bytes([0, 1, 2, 3])),
+            (4, bytes([4, 5, 6, 7])),
+            (8, bytes([8, 9])),
+        ]
+        assert part == bytes([3, 4, 5, 6, 7])
+        assert session._client.methods() == []
+
+    async def test_writes_chunks_atomically(self, local_session):
+        session, files = local_session
+
+        written = await session.workspace.write_chunks(
+            "out/result.bin", chunks_of(b"\x00\xff", "é", b"tail"), max_in_flight=2
+        )
+
+        assert written == 8
+        assert (files / "out" / "result.bin").read_bytes() == b"\x00\xff" + "é".encode() + b"tail"
+        assert os.listdir(files / "out") == ["result.bin"]
+
+    async def test_failed_write_keeps_existing_file(self, local_session):
+        session, files = local_session
+        await session.workspace.write_bytes("keep.txt", "original content")
+
+        async def broken():
+            yield b"partial"
+            raise RuntimeError("producer failed")
+
+        with pytest.raises(RuntimeError):
+            await session.workspace.write_chunks("keep.txt", broken())
+
+        assert (files / "keep.txt").read_text() == "original content"
+        assert os.listdir(files) == ["keep.txt"]
+
+    async def test_local_writes_update_cached_listing(self, local_session):
+        session, files = local_session
+        files.mkdir()
+        session._enable_rpc_cache()
+        session._client.files = {"existing.md": "x"}
+        assert (await session.rpc.workspace.list_files()).files == ["existing.md"]
+
+        await session.workspace.write_bytes("out/new.bin", b"\x00")
+
+        listing = await session.rpc.workspace.list_files()
+        assert listing.files == ["existing.md", "out/new.bin"]
+        assert session._client.methods() == ["session.workspace.listFiles"]
+
+    async def test_rejects_paths_outside_the_workspace(self, local_session):
+        session, _ = local_session
+
+        with pytest.raises(ValueError):
+            await session.workspace.write_bytes("../escape.txt", b"x")
+        with pytest.raises(ValueError):
+            await session.workspace.read_bytes("/etc/passwd")
+
+
+class TestRemoteWorkspace:
+    async def test_falls_back_to_rpc(self):
+        connection = WorkspaceConnection({"plan.md": "héllo world"})
+        session = CopilotSession("s1", connection, "/nonexistent/workspace")
+        session.workspace.chunk_size = 5
+
+        chunks = [c.data async for c in session.workspace.read_chunks("plan.md")]
+        await session.workspace.write_chunks("notes.md", ["a", b"b"])
+
+        assert b"".join(chunks) == "héllo world".encode()
+        assert chunks[0] == "héll".encode()
+        assert connection.files["notes.md"] == "ab"
+
+    async def test_rejects_binary_over_rpc(self):
+        session = CopilotSession("s1", WorkspaceConnection(), None)
+
+        with pytest.raises(ValueError, match="Binary content"):
+            await session.workspace.write_bytes("image.png", b"\x89PNG\xff")
+
+
+class TestWorkspaceSync:
+    async def test_push_transfers_only_changed_files(self, tmp_path):
+        local = tmp_path / "project"
+        (local / "src").mkdir(parents=True)
+        (local / "a.txt").write_text("alpha")
+        (local / "src" / "b.py").write_text("print(1)")
+        connection = WorkspaceConnection()
+        session = CopilotSession("s1", connection, None)
+
+        first = await session.workspace.sync(str(local), "push", batch_bytes=4)
+        (local / "a.txt").write_text("alpha 2")
+        second = await session.workspace.sync(str(local), "push")
+
+        assert sorted(first.transferred) == ["a.txt", "src/b.py"]
+        assert first.bytes_transferred == 13
+        assert connection.files == {"a.txt": "alpha 2", "src/b.py": "print(1)"}
+        assert second.transferred == ["a.txt"]
+        assert second.skipped == 1
+
+    async def test_pull_uses_change_events_instead_of_rescanning(self, tmp_path):
+        local = tmp_path / "project"
+        connection = WorkspaceConnection({"plan.md": "v1", "notes.md": "n"})
+        session = CopilotSession("s1", connection, None)
+
+        await session.workspace.sync(str(local), "pull")
+        connection.requests.clear()
+        connection.files["plan.md"] = "v2"
+        session._dispatch_event(file_changed("plan.md"))
+        result = await session.workspace.sync(str(local), "pull")
+
+        assert result.transferred == ["plan.md"]
+        assert result.skipped == 1
+        assert (local / "plan.md").read_text() == "v2"
+        assert (local / "notes.md").read_text() == "n"
+        assert connection.methods().count("session.workspace.readFile") == 1
+
+    async def test_remote_pull_runs_transfers_concurrently(self, tmp_path):
+        class SlowConnection(WorkspaceConnection):
+            active = peak = 0
+
+            async def request(self, method, params):
+                if method != "session.workspace.readFile":
+                    return await super().request(method, params)
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                await asyncio.sleep(0.01)
+                self.active -= 1
+                return await super().request(method, params)
+
+        connection = SlowConnection({f"f{i}.txt": str(i) for i in range(6)})
+        session = CopilotSession("s1", connection, None)
+
+        result = await session.workspace.sync(str(tmp_path / "out"), "pull", concurrency=3)
+
+        assert len(result.transferred) == 6
+        assert connection.peak == 3
+
+    async def test_local_workspace_compares_content(self, local_session, tmp_path):
+        session, files = local_session
+        files.mkdir()
+        (files / "same.bin").write_bytes(b"\x00\x01")
+        (files / "old.bin").write_bytes(b"old")
+        local = tmp_path / "project"
+        local.mkdir()
+        (local / "same.bin").write_bytes(b"\x00\x01")
+        (local / "old.bin").write_bytes(b"new content")
+
+        result = await session.workspace.sync(str(local), "push")
+
+        assert result.transferred == ["old.bin"]
+        assert result.skipped == 1
+        assert (files / "old.bin").read_bytes() == b"new content"
+        assert session._client.methods() == []
+
+    async def test_rejects_unknown_direction(self, tmp_path):
+        session = CopilotSession("s1", WorkspaceConnection(), None)
+
+        with pytest.raises(ValueError, match="direction"):
+            await session.workspace.sync(str(tmp_path), "both")